@@ -0,0 +1,515 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Incremental versions of the aggregation functions.
+
+The functions in pypond.functions are handed a complete list of values.
+The accumulators here produce the same results, but are fed one value
+at a time with add() and only hold the running state needed to produce
+a result. Accumulators of the same kind can also be combined with
+merge(), so partial results can be calculated separately.
+
+These are not generally used directly - the factories in the
+Functions class tag the functions they return with an accumulator
+factory (func.accumulator) when an incremental version exists and
+the Aggregator processor will use that when it can.
+"""
+
+from math import sqrt
+
+from .bases import PypondBase
+from .exceptions import CollectionException
+from .range import TimeRange
+from .sketch import QuantileSketch
+from .util import is_valid
+
+# how missing/invalid values are handled - these are the names
+# of the static methods in pypond.functions.Filters
+
+KEEP = 'keep_missing'
+IGNORE = 'ignore_missing'
+ZERO = 'zero_missing'
+PROPAGATE = 'propagate_missing'
+NONE_IF_EMPTY = 'none_if_empty'
+
+FILTER_MODES = (KEEP, IGNORE, ZERO, PROPAGATE, NONE_IF_EMPTY)
+
+
+class Accumulator(object):
+    """
+    Base class for the accumulators. Handles applying the filter
+    semantics to the incoming values.
+
+    Parameters
+    ----------
+    mode : str, optional
+        Name of the pypond.functions.Filters method used to handle
+        missing values.
+    """
+    __slots__ = ('_mode', '_count', '_missing')
+
+    def __init__(self, mode=KEEP):
+        """Base accumulator."""
+        self._mode = mode
+        # number of values that have made it through the filter.
+        self._count = 0
+        # an invalid value was seen when using propagate_missing
+        self._missing = False
+
+    def add(self, value):
+        """Add a value to the accumulator.
+
+        Parameters
+        ----------
+        value : various
+            The value to add.
+        """
+        if self._mode not in (KEEP, NONE_IF_EMPTY) and not is_valid(value):
+            if self._mode == ZERO:
+                value = 0
+            elif self._mode == PROPAGATE:
+                self._missing = True
+                return
+            else:
+                return
+
+        self._count += 1
+        self._add(value)
+
+    def merge(self, other):
+        """Combine the state of another accumulator of the same kind with
+        this one. The other accumulator is assumed to have been fed the
+        values that came after the values fed to this one.
+
+        Parameters
+        ----------
+        other : Accumulator
+            Another accumulator of the same type.
+
+        Returns
+        -------
+        Accumulator
+            This accumulator.
+        """
+        self._count += other._count  # pylint: disable=protected-access
+        self._missing = self._missing or other._missing  # pylint: disable=protected-access
+        return self
+
+    def result(self):
+        """Return the current result.
+
+        Returns
+        -------
+        various
+            The result of the aggregation of the values added so far.
+        """
+        if self._missing:
+            return None
+
+        if self._mode == NONE_IF_EMPTY and not self._count:
+            return None
+
+        return self._result()
+
+    def _add(self, value):
+        """Update the state with a filtered value."""
+        raise NotImplementedError
+
+    def _result(self):
+        """Return the result from the current state."""
+        raise NotImplementedError
+
+
+class Sum(Accumulator):
+    """Incremental Functions.sum()"""
+    __slots__ = ('_sum',)
+
+    def __init__(self, mode=KEEP):
+        super(Sum, self).__init__(mode)
+        self._sum = 0
+
+    def _add(self, value):
+        self._sum = self._sum + value
+
+    def merge(self, other):
+        self._sum = self._sum + other._sum  # pylint: disable=protected-access
+        return super(Sum, self).merge(other)
+
+    def _result(self):
+        return self._sum
+
+
+class Avg(Sum):
+    """Incremental Functions.avg()"""
+    __slots__ = ()
+
+    def _result(self):
+        if not self._count:
+            return 0
+
+        return float(self._sum) / self._count
+
+
+class Count(Accumulator):
+    """Incremental Functions.count()"""
+    __slots__ = ()
+
+    def _add(self, value):
+        pass
+
+    def _result(self):
+        return self._count
+
+
+class Max(Accumulator):
+    """Incremental Functions.max()"""
+    __slots__ = ('_value',)
+
+    def __init__(self, mode=KEEP):
+        super(Max, self).__init__(mode)
+        self._value = None
+
+    def _better(self, value):
+        """Same comparison that the builtin max() uses."""
+        return value > self._value
+
+    def _add(self, value):
+        if self._count == 1 or self._better(value):
+            self._value = value
+
+    def merge(self, other):
+        # pylint: disable=protected-access
+        if other._count and (not self._count or self._better(other._value)):
+            self._value = other._value
+        return super(Max, self).merge(other)
+
+    def _result(self):
+        if not self._count:
+            # same as the builtin on an empty list
+            raise ValueError('{0}() arg is an empty sequence'.format(
+                self.__class__.__name__.lower()))
+
+        return self._value
+
+
+class Min(Max):
+    """Incremental Functions.min()"""
+    __slots__ = ()
+
+    def _better(self, value):
+        """Same comparison that the builtin min() uses."""
+        return value < self._value
+
+
+class Difference(Accumulator):
+    """Incremental Functions.difference()"""
+    __slots__ = ('_max', '_min')
+
+    def __init__(self, mode=KEEP):
+        super(Difference, self).__init__(mode)
+        self._max = Max()
+        self._min = Min()
+
+    def _add(self, value):
+        self._max.add(value)
+        self._min.add(value)
+
+    def merge(self, other):
+        # pylint: disable=protected-access
+        self._max.merge(other._max)
+        self._min.merge(other._min)
+        return super(Difference, self).merge(other)
+
+    def _result(self):
+        return self._max.result() - self._min.result()
+
+
+class First(Accumulator):
+    """Incremental Functions.first()"""
+    __slots__ = ('_value',)
+
+    def __init__(self, mode=KEEP):
+        super(First, self).__init__(mode)
+        self._value = None
+
+    def _add(self, value):
+        if self._count == 1:
+            self._value = value
+
+    def merge(self, other):
+        if not self._count:
+            self._value = other._value  # pylint: disable=protected-access
+        return super(First, self).merge(other)
+
+    def _result(self):
+        return self._value
+
+
+class Last(First):
+    """Incremental Functions.last()"""
+    __slots__ = ()
+
+    def _add(self, value):
+        self._value = value
+
+    def merge(self, other):
+        if other._count:  # pylint: disable=protected-access
+            self._value = other._value  # pylint: disable=protected-access
+        return super(First, self).merge(other)  # pylint: disable=bad-super-call
+
+
+class Keep(First):
+    """Incremental Functions.keep() - the first value if all the
+    other (not None) values are the same as it, otherwise None."""
+    __slots__ = ('_differs',)
+
+    def __init__(self, mode=KEEP):
+        super(Keep, self).__init__(mode)
+        self._differs = False
+
+    def _add(self, value):
+        super(Keep, self)._add(value)
+        if value is not None and value != self._value:
+            self._differs = True
+
+    def merge(self, other):
+        # pylint: disable=protected-access
+        differs = self._differs or other._differs
+        if self._count and other._count and \
+                other._value is not None and other._value != self._value:
+            differs = True
+        super(Keep, self).merge(other)
+        self._differs = differs
+        return self
+
+    def _result(self):
+        if self._differs:
+            return None
+
+        return self._value
+
+
+class StdDev(Accumulator):
+    """Incremental Functions.stddev() using Welford's online algorithm
+    for the running variance and Chan's method to merge."""
+    __slots__ = ('_mean', '_m2')
+
+    def __init__(self, mode=KEEP):
+        super(StdDev, self).__init__(mode)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def _add(self, value):
+        delta = value - self._mean
+        self._mean += float(delta) / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def merge(self, other):
+        # pylint: disable=protected-access
+        count = self._count + other._count
+
+        if count:
+            delta = other._mean - self._mean
+            self._mean += delta * other._count / count
+            self._m2 += other._m2 + delta * delta * self._count * other._count / count
+
+        return super(StdDev, self).merge(other)
+
+    def _result(self):
+        if not self._count:
+            return 0.0
+
+        return sqrt(self._m2 / self._count)
+
+
+class ApproxPercentile(Accumulator):
+    """Incremental Functions.approx_percentile() - the values are
+    fed into a QuantileSketch so memory use is bounded. The sketch is
+    seeded so the result is reproducible."""
+    __slots__ = ('_perc', '_method', '_sketch')
+
+    def __init__(self, mode=KEEP, perc=50, method='linear', k=200, seed=0):
+        super(ApproxPercentile, self).__init__(mode)
+        self._perc = perc
+        self._method = method
+        self._sketch = QuantileSketch(k, seed)
+
+    def _add(self, value):
+        self._sketch.add(value)
+
+    def merge(self, other):
+        self._sketch.merge(other._sketch)  # pylint: disable=protected-access
+        return super(ApproxPercentile, self).merge(other)
+
+    def _result(self):
+        return self._sketch.percentile(self._perc, self._method)
+
+
+class WindowAccumulator(PypondBase):
+    """
+    A stand-in for the Collection the Collector normally fills for
+    each window. Rather than holding on to the events in the window,
+    each event is fed to a set of accumulators - one for each of the
+    field/function pairs in the Aggregator field mapping.
+
+    Supports the subset of the Collection API that the Collector and
+    Aggregator use: add_event(), aggregate() and range().
+
+    Parameters
+    ----------
+    fields : dict
+        The Aggregator field mapping. All of the functions must have
+        an accumulator factory attached to them.
+
+    Raises
+    ------
+    CollectionException
+        Raised if one of the functions does not have an accumulator.
+    """
+
+    def __init__(self, fields):
+        """Create the accumulators."""
+        super(WindowAccumulator, self).__init__()
+
+        self._accumulators = dict()
+        self._size = 0
+        self._begin = None
+        self._end = None
+
+        for field_map in list(fields.values()):
+            for field_path, func in list(field_map.items()):
+                if not is_incremental(func):
+                    msg = 'function {0} does not support incremental aggregation'.format(func)
+                    raise CollectionException(msg)
+
+                self._accumulators[self._key(func, field_path)] = func.accumulator()
+
+    def _key(self, func, field_path):
+        """Key for the accumulator for a given function and field path."""
+        return (func, tuple(self._field_path_to_array(field_path)))
+
+    def add_event(self, event):
+        """Feed an event to the accumulators.
+
+        Parameters
+        ----------
+        event : Event
+            An event.
+
+        Returns
+        -------
+        WindowAccumulator
+            This object, unlike a Collection this is not immutable.
+        """
+        for (_, field_path), acc in list(self._accumulators.items()):
+            acc.add(event.get(list(field_path)))
+
+        if self._begin is None or event.begin() < self._begin:
+            self._begin = event.begin()
+
+        if self._end is None or event.end() > self._end:
+            self._end = event.end()
+
+        self._size += 1
+
+        return self
+
+    def merge(self, other):
+        """Combine another WindowAccumulator (created from the same field
+        mapping) with this one.
+
+        Parameters
+        ----------
+        other : WindowAccumulator
+            Another window of accumulators.
+
+        Returns
+        -------
+        WindowAccumulator
+            This object.
+        """
+        # pylint: disable=protected-access
+
+        for key, acc in list(self._accumulators.items()):
+            acc.merge(other._accumulators[key])
+
+        if other._size:
+            if self._begin is None or other._begin < self._begin:
+                self._begin = other._begin
+
+            if self._end is None or other._end > self._end:
+                self._end = other._end
+
+        self._size += other._size
+
+        return self
+
+    def size(self):
+        """Number of events that have been added.
+
+        Returns
+        -------
+        int
+            Number of events.
+        """
+        return self._size
+
+    def aggregate(self, func, field_path=None):
+        """Return the current result of the accumulator for the function
+        and field_path.
+
+        Parameters
+        ----------
+        func : function
+            One of the functions from the field mapping.
+        field_path : str, list, tuple, None, optional
+            The field path it was paired with.
+
+        Returns
+        -------
+        various
+            The aggregated value.
+
+        Raises
+        ------
+        CollectionException
+            Raised if there is no such function/field_path pair.
+        """
+        try:
+            return self._accumulators[self._key(func, field_path)].result()
+        except KeyError:
+            msg = 'no accumulator for {0} on {1}'.format(func, field_path)
+            raise CollectionException(msg)
+
+    def range(self):
+        """The extents of the events that have been added.
+
+        Returns
+        -------
+        TimeRange
+            Extents as time range.
+        """
+        if self._begin is not None and self._end is not None:
+            return TimeRange(self._begin, self._end)
+
+
+def is_incremental(func):
+    """Test if an aggregation function has an incremental version.
+
+    Parameters
+    ----------
+    func : function
+        A function produced by one of the Functions factories.
+
+    Returns
+    -------
+    bool
+        True if func.accumulator is a factory for an Accumulator.
+    """
+    return getattr(func, 'accumulator', None) is not None
@@ -131,6 +131,18 @@ class Observable(PypondBase):
         for i in self._observers:
             i.add_event(event)
 
+    def emit_events(self, events):
+        """add a batch of events to observers, as a batch if the
+        observer has an add_events() method."""
+        for i in self._observers:
+            add_events = getattr(i, 'add_events', None)
+
+            if add_events is not None:
+                add_events(events)
+            else:
+                for event in events:
+                    i.add_event(event)
+
     def flush(self):
         """flush observers."""
         self._log('Observable.flush')
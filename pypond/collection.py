@@ -10,6 +10,7 @@
 Implementation of Pond Collection class.
 """
 
+import bisect
 import copy
 import datetime
 import json
@@ -26,6 +27,7 @@ from .io.input import Bounded
 from .range import TimeRange
 from .util import (
     _check_dt,
+    EPOCH,
     is_function,
     is_pvector,
     ms_from_dt,
@@ -71,8 +73,11 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         super(Collection, self).__init__()
 
         self._id = unique_id('collection-')
-        self._event_list = None
+        self._events = None
+        self._view = None
+        self._materialized = None
         self._type = None
+        self._bisect_cache = None
 
         if instance_or_list is None:
             self._event_list = pvector(list())
@@ -80,7 +85,15 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
             other = instance_or_list
             if copy_events:
                 # pylint: disable=protected-access
-                self._event_list = other._event_list
+                if is_pvector(other._events):
+                    # share the events (and view) of the other collection
+                    self._events = other._events
+                    self._view = other._view
+                    self._materialized = other._materialized
+                    self._bisect_cache = other._bisect_cache
+                else:
+                    # some other kind of storage, like a ColumnarCollection
+                    self._event_list = other._event_list
                 self._type = other._type
             else:
                 self._event_list = pvector(list())
@@ -102,6 +115,32 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
 
             self._event_list = pvector(list())
 
+    @property
+    def _event_list(self):
+        """
+        The immutable list of events in this collection.
+
+        A collection produced by slice() is a view (begin and end index)
+        over the event list of the collection it was sliced from. The
+        list of events in the view is only generated (and cached) when
+        something needs the raw event list. Setting the event list
+        discards the view.
+        """
+        if self._view is None:
+            return self._events
+
+        if self._materialized is None:
+            self._materialized = self._events[self._view[0]:self._view[1]]
+
+        return self._materialized
+
+    @_event_list.setter
+    def _event_list(self, events):
+        """Set the event list, no longer a view."""
+        self._events = events
+        self._view = None
+        self._materialized = None
+
     def to_json(self):
         """
         Returns the collection as json object.
@@ -152,7 +191,10 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         int
             Number of items in collection
         """
-        return len(self._event_list)
+        if self._view is not None:
+            return self._view[1] - self._view[0]
+
+        return len(self._events)
 
     def size_valid(self, field_path=None):
         """
@@ -207,7 +249,16 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
             Raised if there is an index error.
         """
         try:
-            return self._type(self._event_list[pos])
+            if self._view is not None:
+                # translate the position to the underlying event list
+                size = self.size()
+                if pos < 0:
+                    pos += size
+                if pos < 0 or pos >= size:
+                    raise IndexError
+                pos += self._view[0]
+
+            return self._type(self._events[pos])
         except IndexError:
             raise CollectionException('invalid index given to at()')
 
@@ -305,6 +356,10 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         Returns index that is the greatest but still below t - see docstring
         for at_time()
 
+        If the events are in chronological order, this is a binary
+        search over a cached list of the event timestamps, otherwise
+        the events are scanned.
+
         Parameters
         ----------
         dtime : datetime.datetime
@@ -324,7 +379,6 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
             Raised if given a naive or non-UTC dtime
         """
 
-        i = copy.copy(b)  # paranoia
         size = self.size()
 
         if not size:
@@ -336,16 +390,72 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
             msg = 'at_time() and bisect() must be called with aware UTC datetime objects'
             raise CollectionException(msg)
 
-        while i < size:
-            ts_tmp = self.at(i).timestamp()
-            if ts_tmp > dtime:
-                return i - 1 if i - 1 >= 0 else 0
-            elif ts_tmp == dtime:
-                return i
+        keys, chronological = self._bisect_keys()
+
+        if not chronological:
+            # binary search is meaningless on an unordered bag of events,
+            # so just walk it.
+            i = copy.copy(b)  # paranoia
+
+            while i < size:
+                ts_tmp = self.at(i).timestamp()
+                if ts_tmp > dtime:
+                    return i - 1 if i - 1 >= 0 else 0
+                elif ts_tmp == dtime:
+                    return i
+
+                i += 1
+
+            return i - 1
+
+        dtime_ms, sub_ms = _bisect_ms(dtime)
+
+        # keys cover the whole underlying event list, so searches
+        # in a view are offset and bounded by the view.
+        offset, end = self._view if self._view is not None else (0, size)
+
+        if sub_ms:
+            # dtime falls between two ms values so it can never be
+            # an exact match - find the first key that is later.
+            i = bisect.bisect_right(keys, dtime_ms, offset + b, end) - offset
+        else:
+            i = bisect.bisect_left(keys, dtime_ms, offset + b, end) - offset
+
+        # bisect() returns lo when it is past hi
+        i = max(i, b)
+
+        if i >= size:
+            return i - 1
+        elif keys[i + offset] == dtime_ms and not sub_ms:
+            return i
+        else:
+            return i - 1 if i - 1 >= 0 else 0
 
-            i += 1
+    def _bisect_keys(self):
+        """
+        Returns a list of the epoch ms timestamps of the underlying events
+        (not just the ones in a view) and a flag indicating that the
+        events are in chronological order. This is generated once and cached
+        until the event list changes, and is shared with copies
+        and slices of this collection, so it is also used by
+        is_chronological().
+
+        Returns
+        -------
+        tuple
+            list of epoch ms, bool
+        """
+        if self._bisect_cache is None or self._bisect_cache[0] is not self._events:
+            if self._type is Event:
+                keys = [i.timestamp_ms() for i in self._events]
+                chronological = all(keys[i] <= keys[i + 1] for i in range(len(keys) - 1))
+            else:
+                keys = [_bisect_ms(i.timestamp())[0] for i in self._events]
+                # the ms keys can not see sub-ms differences
+                chronological = _in_order(self._events, self._type)
+            self._bisect_cache = (self._events, keys, chronological)
 
-        return i - 1
+        return self._bisect_cache[1], self._bisect_cache[2]
 
     def events(self):
         """
@@ -361,6 +471,9 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         iterator
             An iterator to loop over the events.
         """
+        if self._view is not None and self._materialized is None:
+            return (self._events[i] for i in range(*self._view))
+
         return iter(self._event_list)
 
     def set_events(self, events):
@@ -454,7 +567,7 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
             A copy of this collection with the events chronologically
             sorted.
         """
-        ordered = sorted(self._event_list, key=lambda x: x.ts)
+        ordered = sorted(self._event_list, key=_time_key(self._type))
         return self.set_events(ordered)
 
     def sort(self, field_path):
@@ -488,18 +601,16 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         bool
             True if events are in chronologcal order.
         """
-        ret = True
-        current_ts = None
+        if self._view is None:
+            return self._bisect_keys()[1]
 
-        for i in self._event_list:
-            if current_ts is None:
-                current_ts = i.timestamp()
-            else:
-                if i.timestamp() < current_ts:
-                    ret = False
-                current_ts = i.timestamp()
+        valid = self._bisect_cache is not None and self._bisect_cache[0] is self._events
 
-        return ret
+        if valid and self._bisect_cache[2]:
+            # a view onto events that are in order is in order.
+            return True
+
+        return _in_order(self._event_list, self._type)
 
     # Series range
 
@@ -513,6 +624,10 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         TimeRange
             Extents as time range.
         """
+        if self._type is Event:
+            times = [i.timestamp_ms() for i in self.events()]
+            return TimeRange(min(times), max(times)) if times else None
+
         min_val = None
         max_val = None
 
@@ -555,6 +670,10 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         Collection representing a portion of this TimeSeries from begin up to
         but not including end. Uses typical python [slice:syntax].
 
+        The new collection is a view onto the events of this one, so
+        no events are copied until the event list of the new
+        collection is accessed or modified.
+
         Parameters
         ----------
         begin : int
@@ -567,8 +686,16 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         Collection
             New collection with sliced payload.
         """
-        sliced = Collection(self._event_list[begin:end])
-        sliced._type = self._type  # pylint: disable=protected-access
+        # pylint: disable=protected-access
+
+        sliced = Collection(self)
+        sliced._materialized = None
+
+        offset = self._view[0] if self._view is not None else 0
+        begin, end, _ = slice(begin, end).indices(self.size())
+
+        sliced._view = (offset + begin, offset + max(begin, end))
+
         return sliced
 
     def filter(self, func):
@@ -755,7 +882,7 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
             msg = 'Collection.aggregate() takes a string/list/tuple field_path'
             raise CollectionException(msg)
 
-        result = Event.map_reduce(self.event_list(), fpath, func)
+        result = Event.map_reduce(self.events(), fpath, func)
 
         return result.get(fpath)
 
@@ -1120,7 +1247,8 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
         # pylint: disable=protected-access
         return bool(
             coll1._type is coll2._type and
-            coll1._event_list is coll2._event_list
+            coll1._events is coll2._events and
+            coll1._view == coll2._view
         )
 
     @staticmethod
@@ -1145,3 +1273,73 @@ class Collection(Bounded):  # pylint: disable=too-many-public-methods
             coll1._type == coll2._type and
             coll1._event_list == coll2._event_list
         )
+
+
+def _time_key(event_type):
+    """
+    Function to get a sortable timestamp from events of the given
+    type. Events store their time as epoch ms so that is used rather
+    than creating datetime objects.
+
+    Parameters
+    ----------
+    event_type : class
+        The type of the events in a collection.
+
+    Returns
+    -------
+    function
+        Takes an event and returns its timestamp.
+    """
+    if event_type is Event:
+        return Event.timestamp_ms
+
+    return lambda x: x.ts
+
+
+def _in_order(events, event_type):
+    """
+    Checks that events of the given type are in chronological order.
+
+    Parameters
+    ----------
+    events : list or pyrsistent.pvector
+        The events.
+    event_type : class
+        The type of the events.
+
+    Returns
+    -------
+    bool
+        True if events are in chronologcal order.
+    """
+    time_key = _time_key(event_type)
+    current_ts = None
+
+    for i in events:
+        if current_ts is not None and time_key(i) < current_ts:
+            return False
+        current_ts = time_key(i)
+
+    return True
+
+
+def _bisect_ms(dtime):
+    """
+    Exact integer epoch ms for a datetime plus the sub-ms remainder
+    in microseconds. This avoids the float math in util.ms_from_dt()
+    since bisect() needs to be able to detect exact matches.
+
+    Parameters
+    ----------
+    dtime : datetime.datetime
+        Aware UTC datetime.
+
+    Returns
+    -------
+    tuple
+        epoch ms, remaining microseconds
+    """
+    diff = dtime - EPOCH
+    return (diff.days * 86400 + diff.seconds) * 1000 + diff.microseconds // 1000, \
+        diff.microseconds % 1000
@@ -0,0 +1,656 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Implementation of a column oriented Collection.
+
+Rather than holding a pvector of Event objects, the ColumnarCollection
+holds the timestamps (as epoch ms) in a single typed array and the
+values of each top-level data column in their own array. Event objects
+are only created when a caller asks for one.
+"""
+
+import array
+import itertools
+
+from collections import OrderedDict
+
+from pyrsistent import freeze, pmap, pvector
+
+import six
+
+from .collection import Collection
+from .compact_event import CompactEvent, EventSchema
+from .event import Event
+from .exceptions import CollectionException
+from .range import TimeRange
+from .util import is_function, is_pvector
+
+
+class _Missing(object):  # pylint: disable=too-few-public-methods
+    """Placeholder for a column that is absent from a given event. This
+    is distinct from None since an event might legitimately have a
+    column that is set to None."""
+
+    def __repr__(self):
+        return '<missing>'
+
+MISSING = _Missing()
+
+
+def is_typed_column(col):
+    """Test if a column is stored as fixed width numbers rather than
+    a list - either an array.array or a memoryview (ie: of a memory
+    mapped file).
+
+    Parameters
+    ----------
+    col : array.array, memoryview or list
+        The column.
+
+    Returns
+    -------
+    bool
+        True if it is a typed column.
+    """
+    return isinstance(col, (array.array, memoryview))
+
+
+def column_from_values(values):
+    """Pick the most compact storage for a list of column values.
+
+    Columns that are entirely integers are stored in an int64 array,
+    columns that are entirely floats are stored in a double array and
+    everything else (strings, None, missing values, nested data) is
+    kept in a plain python list.
+
+    Parameters
+    ----------
+    values : list
+        The column values.
+
+    Returns
+    -------
+    array.array or list
+        Typed array or a list.
+    """
+    if isinstance(values, memoryview) and values.format in ('q', 'd'):
+        return values
+
+    if not isinstance(values, list):
+        values = list(values)
+
+    if values and all(type(i) in six.integer_types for i in values):
+        try:
+            return array.array('q', values)
+        except OverflowError:
+            return values
+
+    if values and all(type(i) is float for i in values):
+        return array.array('d', values)
+
+    return values
+
+
+def _append_value(col, value):
+    """A copy of a column with a value appended - the same kind of typed
+    column if the value fits, otherwise a list.
+
+    Parameters
+    ----------
+    col : array.array, memoryview or list
+        The column.
+    value : various
+        The value to append, or MISSING.
+
+    Returns
+    -------
+    array.array or list
+        The new column.
+    """
+    if is_typed_column(col):
+        typecode = col.format if isinstance(col, memoryview) else col.typecode
+
+        if typecode == 'q' and type(value) in six.integer_types or \
+                typecode == 'd' and type(value) is float:
+            new_col = array.array(typecode, col)
+
+            try:
+                new_col.append(value)
+                return new_col
+            except OverflowError:
+                pass
+
+    if not col:
+        # the first value of a new column picks the type.
+        return column_from_values([value if value is MISSING else freeze(value)])
+
+    new_col = list(col)
+    new_col.append(value if value is MISSING else freeze(value))
+
+    return new_col
+
+
+class ColumnarCollection(Collection):  # pylint: disable=too-many-public-methods
+    """
+    A Collection of Event objects stored as columns. This presents the
+    same API as the Collection class, but the underlying storage is an
+    int64 array of epoch ms timestamps and one array per data column.
+
+    This is primarily for large series of flat, numeric data points
+    where holding individual Event objects is expensive. Only Events
+    (not IndexedEvents or TimeRangeEvents) can be stored. Nested data
+    is supported, but only the top-level columns are stored
+    as columns, the nested portion is stored as-is.
+
+    Events are generated on demand by at(), events() and friends. If
+    the raw pvector of events is requested with event_list(), it will
+    be generated once and cached.
+
+    instance_or_list arg can be:
+
+    * a Collection or ColumnarCollection object (copy ctor)
+    * a python list of Events
+    * a pyrsistent.pvector of Events
+
+    Parameters
+    ----------
+    instance_or_list : list, Collection, pyrsistent.pvector
+        A collection object to copy or a list of Event objects
+    copy_events : bool, optional
+        Copy event list when using copy constructor, otherwise the
+        new object has an emtpy event list.
+
+    Raises
+    ------
+    CollectionException
+        Raised if given events that are not Event objects.
+    """
+
+    def __init__(self, instance_or_list=None, copy_events=True):
+        """
+        Create a columnar collection object.
+        """
+        # pylint: disable=bad-super-call
+        # deliberately skipping Collection.__init__() since that
+        # sets up a pvector of events.
+        super(Collection, self).__init__()
+
+        self._id = None
+        self._type = Event
+        self._times = array.array('q')
+        self._columns = OrderedDict()
+        self._materialized = None
+        self._bisect_cache = None
+        self._view = None
+        self._schema = None
+
+        if instance_or_list is None:
+            pass
+        elif isinstance(instance_or_list, ColumnarCollection):
+            if copy_events:
+                # pylint: disable=protected-access
+                self._times = instance_or_list._times
+                self._columns = instance_or_list._columns
+        elif isinstance(instance_or_list, Collection):
+            if copy_events:
+                self._load_events(instance_or_list.events())
+        elif isinstance(instance_or_list, list) or is_pvector(instance_or_list):
+            self._load_events(instance_or_list)
+        else:
+            msg = 'Arg was not a Collection, list or pvector'
+            raise CollectionException(msg)
+
+    @classmethod
+    def from_columns(cls, times, columns):
+        """Create a new ColumnarCollection directly from columns of data.
+
+        Parameters
+        ----------
+        times : list, array.array or memoryview
+            Epoch ms timestamps. An int64 array or memoryview is used
+            as-is rather than copied.
+        columns : dict
+            Dict (or OrderedDict to preserve column ordering) of column
+            name to a list of values. Values may be MISSING if a given
+            event does not have that column.
+
+        Returns
+        -------
+        ColumnarCollection
+            New collection.
+
+        Raises
+        ------
+        CollectionException
+            Raised if the columns are not the same length as the times.
+        """
+        coll = cls()
+
+        # pylint: disable=protected-access
+
+        if isinstance(times, array.array) and times.typecode == 'q' or \
+                isinstance(times, memoryview) and times.format == 'q':
+            coll._times = times
+        else:
+            coll._times = array.array('q', times)
+
+        for name, values in list(columns.items()):
+            if len(values) != len(coll._times):
+                msg = 'column {0} has {1} values, expected {2}'.format(
+                    name, len(values), len(coll._times))
+                raise CollectionException(msg)
+
+            col = column_from_values(values)
+
+            if isinstance(col, list):
+                col = [i if i is MISSING else freeze(i) for i in col]
+
+            coll._columns[name] = col
+
+        return coll
+
+    def _load_events(self, events):
+        """Transpose a list of events into columns."""
+        times = list()
+        columns = OrderedDict()
+
+        for idx, event in enumerate(events):
+            if not isinstance(event, Event) or event.type() is not Event:
+                msg = 'ColumnarCollection can only hold Event objects, got {0}'.format(event)
+                raise CollectionException(msg)
+
+            times.append(event.key())
+
+            for name, value in list(event.data().items()):
+                if name not in columns:
+                    columns[name] = [MISSING] * idx
+                columns[name].append(value)
+
+            for values in list(columns.values()):
+                if len(values) == idx:
+                    values.append(MISSING)
+
+        self._times = array.array('q', times)
+
+        for name, values in list(columns.items()):
+            self._columns[name] = column_from_values(values)
+
+    def _row_schema(self):
+        """Shared schema for CompactEvent rows. Rows can only be compact
+        when every column is numeric (and so never missing or nested),
+        False otherwise."""
+        if self._schema is None:
+            if all(is_typed_column(i) for i in self._columns.values()):
+                self._schema = EventSchema.get(list(self._columns.keys()))
+            else:
+                self._schema = False
+
+        return self._schema
+
+    def _row(self, pos):
+        """Generate an Event for the given index position."""
+        schema = self._row_schema()
+
+        if schema:
+            return CompactEvent.from_values(
+                self._times[pos], [i[pos] for i in self._columns.values()], schema)
+
+        data = dict()
+
+        for name, col in list(self._columns.items()):
+            val = col[pos]
+            if val is not MISSING:
+                data[name] = val
+
+        return Event(pmap(dict(time=self._times[pos], data=pmap(data))))
+
+    def _reorder(self, order):
+        """Return a new collection with the rows arranged according to
+        the list of index positions in order."""
+        times = [self._times[i] for i in order]
+        columns = OrderedDict()
+
+        for name, col in list(self._columns.items()):
+            columns[name] = [col[i] for i in order]
+
+        return ColumnarCollection.from_columns(times, columns)
+
+    @property
+    def _event_list(self):
+        """The pvector of events is generated and cached the first
+        time it is needed by something that requires the raw events."""
+        if self._materialized is None:
+            self._materialized = pvector(self.events())
+
+        return self._materialized
+
+    @property
+    def _events(self):
+        """The timestamp array stands in for the underlying event list
+        when checking if two collections are the same instance."""
+        return self._times
+
+    def _bisect_keys(self):
+        """
+        The timestamp array is already epoch ms so it is used as-is.
+
+        Returns
+        -------
+        tuple
+            array of epoch ms, bool
+        """
+        if self._bisect_cache is None or self._bisect_cache[0] is not self._times:
+            self._bisect_cache = (self._times, self._times, self.is_chronological())
+
+        return self._bisect_cache[1], self._bisect_cache[2]
+
+    def to_json(self):
+        """
+        Returns the collection as json object.
+
+        Returns
+        -------
+        list
+            A list of Event objects.
+        """
+        return list(self.events())
+
+    def size(self):
+        """Number of items in collection.
+
+        Returns
+        -------
+        int
+            Number of items in collection
+        """
+        return len(self._times)
+
+    def at(self, pos):  # pylint: disable=invalid-name
+        """Returns an item in the collection by its index position.
+
+        Creates a new Event object from the columns.
+
+        Parameters
+        ----------
+        pos : int
+            Index of the event to be retrieved.
+
+        Returns
+        -------
+        Event
+            A new Event object of the event at index pos
+
+        Raises
+        ------
+        CollectionException
+            Raised if there is an index error.
+        """
+        try:
+            return self._row(pos)
+        except IndexError:
+            raise CollectionException('invalid index given to at()')
+
+    def events(self):
+        """
+        Generator to allow for..of loops over series.events()
+
+        Returns
+        -------
+        iterator
+            An iterator to loop over the events.
+        """
+        return (self._row(i) for i in range(self.size()))
+
+    def timestamps(self):
+        """The epoch ms timestamps of the events.
+
+        Returns
+        -------
+        array.array
+            Array of epoch ms.
+        """
+        return self._times
+
+    def columns(self):
+        """List of the top-level data columns.
+
+        Returns
+        -------
+        list
+            List of column names.
+        """
+        return list(self._columns.keys())
+
+    def column(self, name):
+        """Return the values of a single top-level column as a list.
+        Events that do not have the column will have a None value.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column.
+
+        Returns
+        -------
+        list
+            List of column values.
+        """
+        col = self._columns.get(name)
+
+        if col is None:
+            return [None] * self.size()
+        elif is_typed_column(col):
+            return col.tolist()
+        else:
+            return [None if i is MISSING else i for i in col]
+
+    def set_events(self, events):
+        """Create a new ColumnarCollection from the list of events.
+
+        Parameters
+        ----------
+        events : list or pyrsistent.pvector
+            A list of events
+
+        Returns
+        -------
+        ColumnarCollection
+            Returns a new collection with the event list set to the
+            events arg
+
+        Raises
+        ------
+        CollectionException
+            Raised if wrong arg type.
+        """
+        if not isinstance(events, list) and not is_pvector(events):
+            msg = 'arg must be a list or pvector'
+            raise CollectionException(msg)
+
+        return ColumnarCollection(events)
+
+    def sort_by_time(self):
+        """Return a new instance of this collection after making sure
+        that all of the events are sorted by timestamp.
+
+        Returns
+        -------
+        ColumnarCollection
+            A copy of this collection with the events chronologically
+            sorted.
+        """
+        order = sorted(range(self.size()), key=self._times.__getitem__)
+        return self._reorder(order)
+
+    def sort(self, field_path):
+        """Sorts the Collection using the value referenced by field_path.
+
+        Parameters
+        ----------
+        field_path : str, list, tuple, None, optional
+            Name of a single value to look up. If None, defaults to ['value'].
+
+        Returns
+        -------
+        ColumnarCollection
+            New collection of sorted values.
+        """
+        fpath = self._field_path_to_array(field_path)
+
+        if len(fpath) == 1 and fpath[0] in self._columns:
+            values = self.column(fpath[0])
+            order = sorted(range(self.size()), key=values.__getitem__)
+            return self._reorder(order)
+
+        return super(ColumnarCollection, self).sort(field_path)
+
+    def is_chronological(self):
+        """Checks that the events in this collection are in chronological
+        order.
+
+        Returns
+        -------
+        bool
+            True if events are in chronologcal order.
+        """
+        if self._bisect_cache is not None and self._bisect_cache[0] is self._times:
+            return self._bisect_cache[2]
+
+        times = self._times
+        return all(i <= ii for i, ii in six.moves.zip(times, itertools.islice(times, 1, None)))
+
+    def range(self):
+        """
+        Return the extents of the Collection as a TimeRange.
+
+        Returns
+        -------
+        TimeRange
+            Extents as time range.
+        """
+        if not self.size():
+            return None
+
+        if self.is_chronological():
+            return TimeRange(self._times[0], self._times[-1])
+
+        return TimeRange(min(self._times), max(self._times))
+
+    def add_event(self, event):
+        """
+        Add an event to the payload and return a new ColumnarCollection
+        object.
+
+        The columns are copied (typed columns with a single C level copy)
+        so this is O(n) - building a collection an event at a time is
+        O(n^2). Create it from a list of events, or with from_columns(),
+        instead.
+
+        Parameters
+        ----------
+        event : Event
+            Event object to add to collection.
+
+        Returns
+        -------
+        ColumnarCollection
+            New collection with the event added to it.
+
+        Raises
+        ------
+        CollectionException
+            Raised if the event is not an Event.
+        """
+        if not isinstance(event, Event) or event.type() is not Event:
+            msg = 'ColumnarCollection can only hold Event objects, got {0}'.format(event)
+            raise CollectionException(msg)
+
+        size = self.size()
+        data = event.data()
+
+        coll = ColumnarCollection()
+
+        # pylint: disable=protected-access
+
+        coll._times = array.array('q', self._times)
+        coll._times.append(event.key())
+
+        for name, col in list(self._columns.items()):
+            coll._columns[name] = _append_value(col, data.get(name, MISSING))
+
+        for name, value in list(data.items()):
+            if name not in coll._columns:
+                coll._columns[name] = _append_value([MISSING] * size, value)
+
+        return coll
+
+    def slice(self, begin, end):
+        """
+        Perform a slice of events within the Collection, returns a new
+        ColumnarCollection representing a portion of this one from begin up
+        to but not including end.
+
+        Parameters
+        ----------
+        begin : int
+            Slice begin.
+        end : int
+            Slice end.
+
+        Returns
+        -------
+        ColumnarCollection
+            New collection with sliced payload.
+        """
+        coll = ColumnarCollection()
+
+        # pylint: disable=protected-access
+        coll._times = self._times[begin:end]
+
+        for name, col in list(self._columns.items()):
+            coll._columns[name] = col[begin:end]
+
+        return coll
+
+    def aggregate(self, func, field_path=None):
+        """
+        Aggregates the events down using a user defined function to
+        do the reduction. When the field_path refers to a top-level column,
+        the column values are handed to the function directly without
+        generating any events.
+
+        Parameters
+        ----------
+        func : function
+            Function to pass to map reduce to aggregate.
+        field_path : str, list, tuple, None, optional
+            Name of a single value to look up. If None, defaults to ['value'].
+            "Deep" syntax either ['deep', 'value'], ('deep', 'value',)
+            or 'deep.value.'
+
+        Returns
+        -------
+        various
+            Returns the aggregated value, so it depends on what kind
+            of data are being handled/aggregation being done.
+        """
+        if not is_function(func):
+            msg = 'First arg to aggregate() must be a function'
+            raise CollectionException(msg)
+
+        fpath = self._field_path_to_array(field_path)
+
+        if not isinstance(fpath, list) or len(fpath) != 1:
+            return super(ColumnarCollection, self).aggregate(func, field_path)
+
+        if not self.size():
+            # map() on an empty collection produces no column at all.
+            return None
+
+        return func(self.column(fpath[0]))
@@ -0,0 +1,339 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Compact Event with a flat payload.
+"""
+
+from pyrsistent import pmap, PMap, PVector
+
+import six
+
+from .event import Event, EventBase
+from .exceptions import EventException
+from .util import dt_from_ms
+
+_CONTAINERS = (dict, list, tuple, set, PMap, PVector)
+
+
+class EventSchema(object):
+    """
+    The ordered column names of a flat payload. Schemas are shared by
+    all of the CompactEvents with the same columns so use EventSchema.get()
+    rather than the constructor.
+
+    Parameters
+    ----------
+    columns : tuple
+        The column names.
+    """
+    __slots__ = ('_columns', '_positions')
+
+    _cache = dict()
+
+    def __init__(self, columns):
+        """Create a schema."""
+        self._columns = tuple(columns)
+        self._positions = dict((v, i) for i, v in enumerate(self._columns))
+
+    @classmethod
+    def get(cls, columns):
+        """Get the shared schema for a set of columns.
+
+        Parameters
+        ----------
+        columns : list or tuple
+            The column names, in order.
+
+        Returns
+        -------
+        EventSchema
+            The schema.
+        """
+        columns = tuple(columns)
+        schema = cls._cache.get(columns)
+
+        if schema is None:
+            schema = cls._cache.setdefault(columns, cls(columns))
+
+        return schema
+
+    def columns(self):
+        """The column names.
+
+        Returns
+        -------
+        tuple
+            The column names.
+        """
+        return self._columns
+
+    def position(self, column):
+        """Position of a column in the values.
+
+        Parameters
+        ----------
+        column : str
+            Column name
+
+        Returns
+        -------
+        int
+            The position, or None if there is no such column.
+        """
+        return self._positions.get(column)
+
+
+def is_flat(data):
+    """Test if a data payload can be held by a CompactEvent - it is a
+    dict (or pmap) where none of the values are containers.
+
+    Parameters
+    ----------
+    data : dict or pyrsistent.pmap
+        Data payload.
+
+    Returns
+    -------
+    bool
+        True if the payload is flat.
+    """
+    if not isinstance(data, (dict, PMap)):
+        return False
+
+    return not any(isinstance(i, _CONTAINERS) for i in six.itervalues(data))
+
+
+class CompactEvent(Event):
+    """
+    An Event with a flat payload (ie: {'in': 1, 'out': 2}) that is stored
+    as a tuple of values and a reference to an EventSchema holding the column
+    names, rather than as persistent maps. The schema is shared between
+    events with the same columns so each event only costs a small
+    object and a tuple.
+
+    This is a drop in replacement for an Event - the type() is Event,
+    and the immutable pmap payload returned by data() is created
+    on demand.
+
+    ::
+
+        event = CompactEvent(1458768183949, {'in': 1, 'out': 2})
+
+        schema = EventSchema.get(['in', 'out'])
+        events = [CompactEvent.from_values(t, (i, o), schema) for t, i, o in rows]
+
+    Parameters
+    ----------
+    instance_or_time : Event, int, datetime.datetime
+        An event to copy (it must have a flat payload), or an int (epoch ms)
+        or a datetime.datetime object to create a timestamp from.
+    data : dict, int, float, str, optional
+        A flat dict, or a simple value which is shorthand for {'value': v}
+
+    Raises
+    ------
+    EventException
+        Raised if the payload is not flat.
+    """
+    __slots__ = ('_time', '_values', '_schema')
+
+    def __init__(self, instance_or_time, data=None):  # pylint: disable=super-init-not-called
+        """
+        Create a compact event.
+        """
+        # pylint: disable=bad-super-call
+        # deliberately skipping EventBase.__init__() since there
+        # is no underlying pmap.
+        super(EventBase, self).__init__()
+
+        if isinstance(instance_or_time, CompactEvent):
+            # pylint: disable=protected-access
+            self._time = instance_or_time._time
+            self._values = instance_or_time._values
+            self._schema = instance_or_time._schema
+            return
+
+        if isinstance(instance_or_time, Event):
+            data = instance_or_time.data()
+            instance_or_time = instance_or_time.timestamp_ms()
+
+        if not isinstance(data, (dict, PMap)):
+            data = self.data_from_arg(data)
+
+        if not is_flat(data):
+            msg = 'CompactEvent needs a flat payload, use an Event for {0}'.format(data)
+            raise EventException(msg)
+
+        self._time = self.ms_from_arg(instance_or_time)
+        self._schema = EventSchema.get(list(data.keys()))
+        self._values = tuple(data.values())
+
+    @classmethod
+    def from_values(cls, time, values, schema):
+        """Create a CompactEvent directly from a tuple of values in
+        schema order. This does not check the values.
+
+        Parameters
+        ----------
+        time : int
+            Epoch ms.
+        values : tuple
+            The values.
+        schema : EventSchema
+            The columns of the values.
+
+        Returns
+        -------
+        CompactEvent
+            The new event.
+        """
+        # pylint: disable=protected-access, bad-super-call
+
+        event = cls.__new__(cls)
+        super(EventBase, event).__init__()
+        event._time = time
+        event._values = tuple(values)
+        event._schema = schema
+
+        return event
+
+    @property
+    def _d(self):
+        """The Event style pmap payload, for code that looks at the
+        internals of events directly."""
+        return pmap(dict(time=self._time, data=self.data()))
+
+    def schema(self):
+        """The shared schema of the payload.
+
+        Returns
+        -------
+        EventSchema
+            The schema.
+        """
+        return self._schema
+
+    def data(self):
+        """The event data as a pyrsistent.pmap, this is created
+        each time it is called.
+
+        Returns
+        -------
+        pyrsistent.pmap
+            The immutable data payload.
+        """
+        return pmap(dict(zip(self._schema.columns(), self._values)))
+
+    def _field(self, name):
+        """A single top-level value from the data."""
+        pos = self._schema.position(name)
+        return self._values[pos] if pos is not None else None
+
+    def to_json(self):
+        """
+        Returns the Event as a JSON object.
+
+        Returns
+        -------
+        dict
+            time/data keys
+        """
+        return dict(
+            time=self._time,
+            data=dict(zip(self._schema.columns(), self._values)),
+        )
+
+    def to_point(self, cols=None):
+        """
+        Returns a flat array starting with the timestamp, followed by the values.
+
+        Parameters
+        ----------
+        cols : list, optional
+            List of data columns to order the data points in.
+
+        Returns
+        -------
+        list
+            Epoch ms followed by points.
+        """
+        if isinstance(cols, list):
+            return [self._time] + [self.get(i) for i in cols]
+
+        return [self._time] + list(self._values)
+
+    def timestamp(self):
+        """The timestamp of this data
+
+        Returns
+        -------
+        datetime.datetime
+            Datetime object
+        """
+        return dt_from_ms(self._time)
+
+    def timestamp_ms(self):
+        """The timestamp of this data as ms since the epoch.
+
+        Returns
+        -------
+        int
+            Epoch ms.
+        """
+        return self._time
+
+    def key(self):
+        """Return timestamp as ms since epoch
+
+        Returns
+        -------
+        int
+            ms since epoch.
+        """
+        return self._time
+
+    def set_data(self, data):
+        """Sets the data portion of the event and returns a new event,
+        which will be an Event if the data are not flat.
+
+        Parameters
+        ----------
+        data : dict
+            New data payload for this event object.
+
+        Returns
+        -------
+        CompactEvent or Event
+            A new event object.
+        """
+        data = self.data_from_arg(data)
+
+        if is_flat(data):
+            return CompactEvent(self._time, data)
+
+        return Event(self._time, data)
+
+    def __eq__(self, other):
+        """equality operator, same as for Event.
+
+        Parameters
+        ----------
+        other : Event
+            Event object for == comparison.
+
+        Returns
+        -------
+        bool
+            True if other event has same payload.
+        """
+        # pylint: disable=protected-access
+        if isinstance(other, CompactEvent) and other._schema is self._schema:
+            return self._time == other._time and self._values == other._values
+
+        return super(CompactEvent, self).__eq__(other)
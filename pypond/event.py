@@ -44,6 +44,85 @@ from .util import (
 )
 
 
+# compiled field accessors, keyed by the field path they were built from.
+_ACCESSORS = dict()
+_ACCESSOR_CACHE_SIZE = 1024
+
+
+def _deep_field_error(fspec):
+    """Exception for a deep field path that runs into a non-pmap value."""
+    msg = 'Error retrieving deep field_path: {0}'.format(fspec)
+    msg += ' -- all path segments other than terminal one must return a pmap'
+    return EventException(msg)
+
+
+def _compile_field_path(fspec):
+    """Build an accessor function for a list of field path segments."""
+    # pylint: disable=protected-access
+
+    if len(fspec) == 1:
+        name = fspec[0]
+
+        def accessor(event):
+            """single top-level column."""
+            return event._field(name)
+
+        return accessor
+
+    head = fspec[0]
+    rest = fspec[1:]
+
+    def deep_accessor(event):
+        """walk a deep field path."""
+        try:
+            return reduce(PMap.get, rest, event._field(head))
+        except TypeError:
+            raise _deep_field_error(fspec)
+
+    return deep_accessor
+
+
+def field_accessor(field_path=None):
+    """
+    Return a function that looks up the value at field_path in an event -
+    the same as event.get(field_path). The accessor is built once and cached
+    so code that does the same lookup on a lot of events should get the
+    accessor up front rather than calling event.get() in the loop.
+
+    ::
+
+        get_in = field_accessor('traffic.in')
+
+        for i in events:
+            total += get_in(i)
+
+    Parameters
+    ----------
+    field_path : str, list, tuple, None, optional
+        Name of value to look up. If None, defaults to ['value'].
+        "Deep" syntax either ['deep', 'value'], ('deep', 'value',)
+        or 'deep.value.'
+
+    Returns
+    -------
+    function
+        Takes an event and returns the value.
+    """
+    key = tuple(field_path) if isinstance(field_path, list) else field_path
+
+    accessor = _ACCESSORS.get(key)
+
+    if accessor is None:
+        accessor = _compile_field_path(PypondBase._field_path_to_array(field_path))
+
+        if len(_ACCESSORS) >= _ACCESSOR_CACHE_SIZE:
+            _ACCESSORS.clear()
+
+        _ACCESSORS[key] = accessor
+
+    return accessor
+
+
 class EventBase(PypondBase):
     """
     Common code for the event classes.
@@ -80,6 +159,10 @@ class EventBase(PypondBase):
         """
         return self._d.get('data')
 
+    def _field(self, name):
+        """A single top-level value from the data."""
+        return self._d.get('data').get(name)
+
     def get(self, field_path=None):
         """
         Get specific data out of the Event. The data will be converted
@@ -103,15 +186,7 @@ class EventBase(PypondBase):
         various
             Type depends on underyling data
         """
-
-        fspec = self._field_path_to_array(field_path)
-
-        try:
-            return reduce(PMap.get, fspec, self.data())
-        except TypeError:
-            msg = 'Error retrieving deep field_path: {0}'.format(fspec)
-            msg += ' -- all path segments other than terminal one must return a pmap'
-            raise EventException(msg)
+        return field_accessor(field_path)(self)
 
     def value(self, field_path=None):
         """
@@ -197,6 +272,18 @@ class EventBase(PypondBase):
         """
         raise NotImplementedError  # pragma: nocover
 
+    def timestamp_ms(self):
+        """The timestamp of this event as ms since the epoch. Subclasses
+        that store the time as an int override this to avoid creating
+        a datetime.
+
+        Returns
+        -------
+        int
+            Epoch ms.
+        """
+        return ms_from_dt(self.timestamp())
+
     def begin(self):
         """abstract, override in subclass
 
@@ -263,6 +350,30 @@ class EventBase(PypondBase):
         else:
             raise EventException('Unable to get datetime from {a} - should be a datetime object or an integer in epoch ms.'.format(a=arg))  # pylint: disable=line-too-long
 
+    @staticmethod
+    def ms_from_arg(arg):
+        """extract epoch ms from a constructor arg.
+
+        Parameters
+        ----------
+        arg : int or datetime.datetime
+            Time value as passed to one of the constructors
+
+        Returns
+        -------
+        int
+            Epoch ms.
+
+        Raises
+        ------
+        EventException
+            Does not accept unaware datetime objects.
+        """
+        if isinstance(arg, six.integer_types):
+            return int(arg)
+
+        return ms_from_dt(EventBase.timestamp_from_arg(arg))
+
     @staticmethod
     def timerange_from_arg(arg):
         """create TimeRange from a constructor arg.
@@ -356,7 +467,8 @@ class Event(EventBase):  # pylint: disable=too-many-public-methods
     supplied at initialization.
 
     The timestamp may be a python date object, datetime object, or
-    ms since UNIX epoch. It is stored internally as a datetime object.
+    ms since UNIX epoch. It is stored internally as ms since the epoch
+    and a datetime object is only created when timestamp() is called.
 
     The data may be any type.
 
@@ -409,10 +521,14 @@ class Event(EventBase):  # pylint: disable=too-many-public-methods
 
         if is_pmap(instance_or_time) and 'time' in instance_or_time \
                 and 'data' in instance_or_time:
+            if not isinstance(instance_or_time.get('time'), six.integer_types):
+                instance_or_time = instance_or_time.set(
+                    'time', self.ms_from_arg(instance_or_time.get('time')))
+
             super(Event, self).__init__(instance_or_time)
             return
 
-        time = self.timestamp_from_arg(instance_or_time)
+        time = self.ms_from_arg(instance_or_time)
         data = self.data_from_arg(data)
 
         super(Event, self).__init__(pmap(dict(time=time, data=data)))
@@ -420,7 +536,7 @@ class Event(EventBase):  # pylint: disable=too-many-public-methods
     # Query/accessor methods
 
     def _get_epoch_ms(self):
-        return ms_from_dt(self.timestamp())
+        return self._d.get('time')
 
     def to_json(self):
         """
@@ -501,6 +617,17 @@ class Event(EventBase):  # pylint: disable=too-many-public-methods
         datetime.datetime
             Datetime object
         """
+        return dt_from_ms(self._d.get('time'))
+
+    def timestamp_ms(self):
+        """The timestamp of this data as ms since the epoch. Unlike
+        timestamp() this does not need to create a datetime object.
+
+        Returns
+        -------
+        int
+            Epoch ms.
+        """
         return self._d.get('time')
 
     def begin(self):
@@ -584,7 +711,7 @@ class Event(EventBase):  # pylint: disable=too-many-public-methods
         int
             ms since epoch.
         """
-        return ms_from_dt(self.timestamp())
+        return self._d.get('time')
 
     def type(self):  # pylint: disable=no-self-use
         """Return type of the event object
@@ -930,18 +1057,22 @@ class Event(EventBase):  # pylint: disable=too-many-public-methods
 
         out_events = list()
 
+        # the values are looked up as top-level columns.
+        accessors = [(i, field_accessor([i])) for i in field_names] \
+            if field_names is not None else None
+
         for key, events in list(event_map.items()):
             map_event = dict()
 
             for event in events:
 
-                if field_names is None:
-                    field_names = list(thaw(event.data()).keys())
+                if accessors is None:
+                    accessors = [(i, field_accessor([i])) for i in event.data().keys()]
 
-                for field in field_names:
+                for field, get in accessors:
                     if field not in map_event:
                         map_event[field] = list()
-                    map_event[field].append(event.data().get(field))
+                    map_event[field].append(get(event))
 
             data = dict()
             for field_name, values in list(map_event.items()):
@@ -1075,14 +1206,16 @@ class Event(EventBase):  # pylint: disable=too-many-public-methods
                 result[k] = list()
 
         if isinstance(field_spec, str):
+            get = field_accessor(field_spec)
             for evt in events:
                 key_check(field_spec)
-                result[field_spec].append(evt.get(field_spec))
+                result[field_spec].append(get(evt))
         elif isinstance(field_spec, (list, tuple)):
-            for spec in field_spec:
-                for evt in events:
+            accessors = [(spec, field_accessor(spec)) for spec in field_spec]
+            for evt in events:
+                for spec, get in accessors:
                     key_check(spec)
-                    result[spec].append(evt.get(spec))
+                    result[spec].append(get(evt))
         elif is_function(field_spec):
             for evt in events:
                 pairs = field_spec(evt)
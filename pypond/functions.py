@@ -14,9 +14,28 @@ from functools import reduce
 from math import sqrt, floor
 from operator import truediv
 
+import six
+
+from . import accumulator
 from .exceptions import FilterException, FunctionException
+from .sketch import QuantileSketch
 from .util import is_valid
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Below this many values, the overhead of creating an array outweighs
+# the savings, so the pure python versions are used.
+NUMPY_MIN_SIZE = 64
+
+# largest integer a float64 can represent exactly
+_MAX_EXACT_INT = 2 ** 53
+
+# returned by _as_array() when propagate_missing hits a bad value
+_PROPAGATE = object()
+
 
 class Filters(object):
     """Filter functions to pass to aggregation function factory
@@ -96,6 +115,132 @@ def f_check(flt):
     return flt
 
 
+def _incremental(inner, acc_class, flt, **kwargs):
+    """Attach a factory for the equivalent incremental accumulator
+    to an aggregation function if the filter is one of the ones
+    the accumulators know how to handle."""
+    inner.accumulator = None
+
+    if flt.__name__ in accumulator.FILTER_MODES and \
+            getattr(Filters, flt.__name__, None) is flt:
+        inner.accumulator = lambda: acc_class(flt.__name__, **kwargs)
+
+    return inner
+
+
+def _as_array(values, flt):
+    """Turn a list of values into a numpy array and apply the filter
+    with masks rather than in python.
+
+    Returns None if numpy is not available, there are not enough values
+    to make it worthwhile, the values are not numeric, the filter is not
+    one of the Filters or the result might differ from the pure python
+    version of a function (ie: keep_missing with invalid values), in which
+    case the caller should fall back to the pure python version.
+
+    Returns _PROPAGATE if flt is propagate_missing and there were
+    invalid values.
+    """
+    # pylint: disable=too-many-return-statements
+
+    if numpy is None or len(values) < NUMPY_MIN_SIZE or \
+            getattr(Filters, getattr(flt, '__name__', ''), None) is not flt:
+        return None
+
+    try:
+        arr = numpy.asarray(values)
+    except (ValueError, TypeError):  # pragma: no cover
+        return None
+
+    if arr.ndim != 1:
+        return None
+
+    if arr.dtype.kind == 'i':
+        # ints can not be missing values, but make sure that the
+        # sum() can not silently overflow the int64.
+        if int(abs(arr).max()) * len(arr) >= 2 ** 63:
+            return None
+        return arr
+
+    if arr.dtype.kind == 'O':
+        # None mixed in with numbers, turning those in to NaN will
+        # let the floats be masked in the same way. If it is all ints
+        # otherwise, turn it back into an int array after the filter.
+        ints = True
+
+        for i in values:
+            if i is None:
+                continue
+            elif type(i) is float:  # pylint: disable=unidiomatic-typecheck
+                if i == i:  # NaN is missing, not a float
+                    ints = False
+            elif type(i) not in six.integer_types or abs(i) > _MAX_EXACT_INT:
+                return None
+
+        arr = numpy.array(values, dtype=float)
+    elif arr.dtype.kind == 'f':
+        ints = False
+    else:
+        return None
+
+    mask = numpy.isnan(arr)
+
+    if mask.any():
+        if flt is Filters.ignore_missing:
+            arr = arr[~mask]
+        elif flt is Filters.zero_missing:
+            arr = numpy.where(mask, 0.0, arr)
+        elif flt is Filters.propagate_missing:
+            return _PROPAGATE
+        else:
+            return None
+
+    if ints:
+        arr = arr.astype(numpy.int64)
+
+    return arr
+
+
+def _percentile(sort_values, perc, method):
+    """Select the percentile from a sorted list of values."""
+
+    ret = None
+
+    size = len(sort_values)
+
+    if perc < 0 or perc > 100:
+        msg = 'percentile must be between 0 and 100'
+        raise FunctionException(msg)
+
+    i = truediv(perc, 100)
+    index = int(floor((size - 1) * i))
+
+    if size == 1 or perc == 0:
+        return sort_values[0]
+
+    if perc == 100:
+        return sort_values[size - 1]
+
+    if index < size - 1:
+        fraction = (size - 1) * i - index
+        # pylint: disable=invalid-name
+        v0 = sort_values[index]
+        v1 = sort_values[index + 1]
+
+        if method == 'lower' or fraction == 0:
+            ret = v0
+        elif method == 'linear':
+            ret = v0 + (v1 - v0) * fraction
+        elif method == 'higher':
+            ret = v1
+        elif method == 'nearest':
+            ret = v0 if fraction < .5 else v1
+        elif method == 'midpoint':
+            ret = (v0 + v1) / 2
+
+    return ret
+
+
 class Functions(object):
     """
     Utility class to contain the functions.
@@ -114,6 +259,20 @@ class Functions(object):
     factory method to control how bad values are handled::
 
         timeseries.aggregate(Functions.sum(Filters.zero_missing), 'in')
+
+    If numpy is installed, sum, avg, stddev, median, percentile
+    and difference will use it for large lists of numeric values.
+
+    approx_percentile and approx_median use a streaming quantile sketch
+    (see pypond.sketch) rather than sorting all of the values. When used
+    in a Pipeline aggregation, memory use per window is bounded by
+    the sketch size.
+
+    Functions that can be calculated incrementally (sum, avg, count,
+    min, max, first, last, keep, stddev, difference and the approx
+    functions) will have
+    an accumulator attribute - a factory that returns the equivalent
+    pypond.accumulator.Accumulator.
     """
 
     # pylint: disable=missing-docstring
@@ -138,13 +297,21 @@ class Functions(object):
 
             return result
 
-        return inner
+        return _incremental(inner, accumulator.Keep, flt)
 
     @staticmethod
     def sum(flt=Filters.keep_missing):
 
         def inner(values):
 
+            arr = _as_array(values, flt)
+
+            if arr is _PROPAGATE:
+                return None
+
+            if arr is not None:
+                return arr.sum().item()
+
             vals = flt(values)
 
             if vals is None:
@@ -152,24 +319,32 @@ class Functions(object):
 
             return reduce(lambda x, y: x + y, vals, 0)
 
-        return inner
+        return _incremental(inner, accumulator.Sum, flt)
 
     @staticmethod
     def avg(flt=Filters.keep_missing):
 
         def inner(values):
 
+            arr = _as_array(values, flt)
+
+            if arr is _PROPAGATE:
+                return None
+
+            if arr is not None and len(arr):
+                return float(arr.sum().item()) / len(arr)
+
             vals = flt(values)
 
             if vals is None:
                 return None  # pragma: no cover
 
-            if len(vals) is 0:
+            if len(vals) == 0:
                 return 0
 
             return float(Functions.sum()(vals)) / len(vals)
 
-        return inner
+        return _incremental(inner, accumulator.Avg, flt)
 
     @staticmethod
     def max(flt=Filters.keep_missing):
@@ -183,7 +358,7 @@ class Functions(object):
 
             return max(vals)
 
-        return inner
+        return _incremental(inner, accumulator.Max, flt)
 
     @staticmethod
     def min(flt=Filters.keep_missing):
@@ -197,7 +372,7 @@ class Functions(object):
 
             return min(vals)
 
-        return inner
+        return _incremental(inner, accumulator.Min, flt)
 
     @staticmethod
     def count(flt=Filters.keep_missing):
@@ -211,7 +386,7 @@ class Functions(object):
 
             return len(vals)
 
-        return inner
+        return _incremental(inner, accumulator.Count, flt)
 
     @staticmethod
     def first(flt=Filters.keep_missing):
@@ -228,7 +403,7 @@ class Functions(object):
             except IndexError:
                 return None
 
-        return inner
+        return _incremental(inner, accumulator.First, flt)
 
     @staticmethod
     def last(flt=Filters.keep_missing):
@@ -245,62 +420,72 @@ class Functions(object):
             except IndexError:
                 return None
 
-        return inner
+        return _incremental(inner, accumulator.Last, flt)
 
     @staticmethod
     def percentile(perc, method='linear', flt=Filters.keep_missing):
 
         def inner(values):
 
+            arr = _as_array(values, flt)
+
+            if arr is _PROPAGATE:
+                return None
+
+            if arr is not None and len(arr):
+                return _percentile(numpy.sort(arr).tolist(), perc, method)
+
             vals = flt(values)
 
             if vals is None:
                 return None  # pragma: no cover
 
-            ret = None
+            return _percentile(sorted(vals), perc, method)
 
-            sort_values = sorted(values)
-            size = len(sort_values)
+        return inner
+
+    @staticmethod
+    def approx_percentile(perc, method='linear', k=200, seed=0, flt=Filters.keep_missing):
 
-            if perc < 0 or perc > 100:
-                msg = 'percentile must be between 0 and 100'
-                raise FunctionException(msg)
+        if perc < 0 or perc > 100:
+            msg = 'percentile must be between 0 and 100'
+            raise FunctionException(msg)
+
+        def inner(values):
 
-            i = truediv(perc, 100)
-            index = int(floor((size - 1) * i))
+            vals = flt(values)
 
-            if size == 1 or perc == 0:
-                return sort_values[0]
+            if vals is None:
+                return None  # pragma: no cover
 
-            if perc == 100:
-                return sort_values[size - 1]
+            # seeded so the same values always give the same result
+            sketch = QuantileSketch(k, seed)
 
-            if index < size - 1:
-                fraction = (size - 1) * i - index
-                # pylint: disable=invalid-name
-                v0 = sort_values[index]
-                v1 = sort_values[index + 1]
+            for i in vals:
+                sketch.add(i)
 
-                if method == 'lower' or fraction == 0:
-                    ret = v0
-                elif method == 'linear':
-                    ret = v0 + (v1 - v0) * fraction
-                elif method == 'higher':
-                    ret = v1
-                elif method == 'nearest':
-                    ret = v0 if fraction < .5 else v1
-                elif method == 'midpoint':
-                    ret = (v0 + v1) / 2
+            return sketch.percentile(perc, method)
 
-            return ret
+        return _incremental(
+            inner, accumulator.ApproxPercentile, flt, perc=perc, method=method, k=k, seed=seed)
 
-        return inner
+    @staticmethod
+    def approx_median(k=200, seed=0, flt=Filters.keep_missing):
+        return Functions.approx_percentile(50, k=k, seed=seed, flt=flt)
 
     @staticmethod
     def stddev(flt=Filters.keep_missing):
 
         def inner(values):
 
+            arr = _as_array(values, flt)
+
+            if arr is _PROPAGATE:
+                return None
+
+            if arr is not None and len(arr):
+                return float(arr.std())
+
             vals = flt(values)
 
             if vals is None:
@@ -310,13 +495,26 @@ class Functions(object):
             variance = [(e - avg)**2 for e in vals]
             return sqrt(Functions.avg()(variance))
 
-        return inner
+        return _incremental(inner, accumulator.StdDev, flt)
 
     @staticmethod
     def median(flt=Filters.keep_missing):
 
         def inner(values):
 
+            arr = _as_array(values, flt)
+
+            if arr is _PROPAGATE:
+                return None
+
+            if arr is not None and len(arr):
+                sort = numpy.sort(arr)
+                half = len(sort) // 2
+
+                if not len(sort) % 2:
+                    return (sort[half - 1].item() + sort[half].item()) / 2.0
+                return sort[half].item()
+
             vals = flt(values)
 
             if vals is None:
@@ -337,6 +535,14 @@ class Functions(object):
 
         def inner(values):
 
+            arr = _as_array(values, flt)
+
+            if arr is _PROPAGATE:
+                return None
+
+            if arr is not None and len(arr):
+                return arr.max().item() - arr.min().item()
+
             vals = flt(values)
 
             if vals is None:
@@ -344,4 +550,4 @@ class Functions(object):
 
             return max(vals) - min(vals)
 
-        return inner
+        return _incremental(inner, accumulator.Difference, flt)
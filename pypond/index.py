@@ -16,6 +16,8 @@ import copy
 import datetime
 import re
 
+import six
+
 from .bases import PypondBase
 from .exceptions import IndexException, IndexWarning
 from .range import TimeRange
@@ -392,8 +394,8 @@ class Index(PypondBase):
         ----------
         win : str
             Prefix if the index string.
-        dtime : datetime.datetime
-            Datetime to calculate suffix from.
+        dtime : datetime.datetime or int
+            Datetime (or epoch ms) to calculate suffix from.
 
         Returns
         -------
@@ -401,7 +403,7 @@ class Index(PypondBase):
             The suffix for the index string.
         """
         duration = Index.window_duration(win)
-        ddms = ms_from_dt(sanitize_dt(dtime))
+        ddms = dtime if isinstance(dtime, six.integer_types) else ms_from_dt(sanitize_dt(dtime))
         return int(ddms / duration)
 
     @staticmethod
@@ -424,8 +426,8 @@ class Index(PypondBase):
         ----------
         win : str
             Prefix of the index string.
-        dtime : datetime.datetime
-            Datetime to generate index string from.
+        dtime : datetime.datetime or int
+            Datetime (or epoch ms) to generate index string from.
 
         Returns
         -------
@@ -0,0 +1,295 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+asyncio stream input and outputs (Python 3.5+).
+
+A Stream runs the whole pipeline on the stack of whoever calls add_event()
+so a slow output callback holds up the producer. An AsyncStream puts the
+events on a bounded queue instead and a task on the event loop runs them
+through the pipeline. The outputs here accept coroutine callbacks, which
+are awaited before the next event is processed - so a slow consumer fills
+the queue and the overflow policy of the stream decides what happens
+next::
+
+    async def send(event):
+        await websocket.send(json.dumps(event.to_json()))
+
+    stream = AsyncStream(maxsize=1000, overflow='drop_oldest')
+
+    (
+        Pipeline()
+        .from_source(stream)
+        .window_by('1m')
+        .emit_on('discard')
+        .aggregate({'in': {'in': Functions.avg()}})
+        .to(AsyncEventOut, send)
+    )
+
+    task = asyncio.ensure_future(stream.run())
+
+    await stream.put(event)  # from a coroutine
+    stream.add_event(event)  # or a plain callback, never blocks
+    ...
+    await stream.close()
+    await task
+
+Every stream has its own task so one event loop can drive any
+number of pipelines.
+"""
+
+import asyncio
+import inspect
+
+from .input import Stream
+from .output import CollectionOut, EventOut
+from ..exceptions import PipelineIOException
+from ..util import Options
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+# put on the queue by close()
+_CLOSE = object()
+
+
+class AsyncStream(Stream):
+    """
+    A Stream source for asyncio applications. Events are queued and
+    run through the pipeline by the run() coroutine.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of queued events.
+    overflow : str, optional
+        What to do with an event when the queue is full - 'block' (wait
+        for room, add_event() raises an exception), 'drop_oldest' (drop the
+        event at the head of the queue to make room) or 'drop_newest'
+        (drop the new event).
+
+    Raises
+    ------
+    PipelineIOException
+        Raised on an unknown overflow policy.
+    """
+
+    def __init__(self, maxsize=1000, overflow='block'):
+        """Create the stream."""
+        super(AsyncStream, self).__init__()
+
+        if overflow not in OVERFLOW_POLICIES:
+            msg = 'overflow must be one of {0}, not {1}'.format(OVERFLOW_POLICIES, overflow)
+            raise PipelineIOException(msg)
+
+        self._queue = asyncio.Queue(maxsize)
+        self._overflow = overflow
+        self._dropped = 0
+        self._pending = list()
+        self._closed = False
+
+    def dropped(self):
+        """Number of events dropped because the queue was full.
+
+        Returns
+        -------
+        int
+            Dropped events.
+        """
+        return self._dropped
+
+    def qsize(self):
+        """Number of events waiting to be processed.
+
+        Returns
+        -------
+        int
+            Queued events.
+        """
+        return self._queue.qsize()
+
+    def defer(self, awaitable):
+        """Have run() await something (ie: the result of a coroutine
+        output callback) before it processes the next event.
+
+        Parameters
+        ----------
+        awaitable : awaitable
+            Coroutine, task or future.
+        """
+        self._pending.append(awaitable)
+
+    def _put_nowait(self, event):
+        """Queue an event without waiting, returns False if it could
+        not be queued because the queue is full and the policy is block."""
+        if self._closed:
+            raise PipelineIOException('can not add events to a closed AsyncStream')
+
+        if not self._queue.full():
+            self._queue.put_nowait(event)
+        elif self._overflow == 'drop_newest':
+            self._dropped += 1
+        elif self._overflow == 'drop_oldest':
+            self._queue.get_nowait()
+            self._queue.put_nowait(event)
+            self._dropped += 1
+        else:
+            return False
+
+        return True
+
+    def add_event(self, event):
+        """Queue an event without waiting, for producers that are not
+        coroutines.
+
+        Parameters
+        ----------
+        event : Event
+            Some Event class
+
+        Raises
+        ------
+        PipelineIOException
+            Raised if the stream is closed, or the queue is full and the
+            overflow policy is block.
+        """
+        self._check(event)
+
+        if not self._put_nowait(event):
+            raise PipelineIOException('AsyncStream queue is full')
+
+    async def put(self, event):
+        """Queue an event, waiting for room if the queue is full and
+        the overflow policy is block.
+
+        Parameters
+        ----------
+        event : Event
+            Some Event class
+
+        Raises
+        ------
+        PipelineIOException
+            Raised if the stream is closed.
+        """
+        self._check(event)
+
+        if not self._put_nowait(event):
+            await self._queue.put(event)
+
+    async def close(self):
+        """Stop the stream once the events that have already been queued
+        have been processed, at which point the pipeline is flushed and
+        run() returns."""
+        if not self._closed:
+            self._closed = True
+            await self._queue.put(_CLOSE)
+
+    async def _await_pending(self):
+        """Wait for the deferred callbacks."""
+        while self._pending:
+            pending, self._pending = self._pending, list()
+            await asyncio.gather(*pending)
+
+    async def run(self):
+        """Process queued events until the stream is closed. Run this
+        as a task on the event loop."""
+        while True:
+            event = await self._queue.get()
+
+            if event is _CLOSE:
+                self.stop()
+                await self._await_pending()
+                return
+
+            if self.has_observers() and self._running:
+                self.emit(event)
+
+            await self._await_pending()
+
+
+def _deferred(pipeline, callback):
+    """Wrap an output callback so that the result of a coroutine function
+    is awaited by the AsyncStream feeding the pipeline (or scheduled on
+    the event loop if the source is some other stream)."""
+    if callback is None:
+        return None
+
+    def wrapper(*args):
+        """call the callback and defer the result."""
+        result = callback(*args)
+
+        if inspect.isawaitable(result):
+            source = pipeline.input()
+
+            if isinstance(source, AsyncStream):
+                source.defer(result)
+            else:
+                asyncio.ensure_future(result)
+
+    return wrapper
+
+
+class AsyncEventOut(EventOut):
+    """
+    An EventOut that accepts a coroutine function (or any function
+    returning an awaitable) as the callback.
+
+    Parameters
+    ----------
+    pipeline : Pipeline
+        The pipeline.
+    callback : function
+        Callback function, it may be a coroutine function.
+    options : Options
+        The options.
+    """
+
+    def __init__(self, pipeline, callback=None, options=Options()):
+        """Create the output."""
+        super(AsyncEventOut, self).__init__(pipeline, _deferred(pipeline, callback), options)
+
+    def on_emit(self, callback):
+        """Sets the internal callback.
+
+        Parameters
+        ----------
+        callback : function or None
+            Value to set the intenal _callback to.
+        """
+        self._callback = _deferred(self._pipeline, callback)
+
+
+class AsyncCollectionOut(CollectionOut):
+    """
+    A CollectionOut that accepts a coroutine function (or any function
+    returning an awaitable) as the callback.
+
+    Parameters
+    ----------
+    pipeline : Pipeline
+        The pipeline.
+    callback : function
+        Callback function, it may be a coroutine function.
+    options : Options
+        The options.
+    """
+
+    def __init__(self, pipeline, callback, options):
+        """Create the output."""
+        super(AsyncCollectionOut, self).__init__(
+            pipeline, _deferred(pipeline, callback), options)
+
+    def on_emit(self, callback):
+        """Sets the internal callback.
+
+        Parameters
+        ----------
+        callback : function or None
+            Value to set the intenal _callback to.
+        """
+        self._callback = _deferred(self._pipeline, callback)
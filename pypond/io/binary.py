@@ -0,0 +1,300 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Compact binary on-disk format for a TimeSeries.
+
+The layout of a file is::
+
+    magic (8 bytes)
+    header length (uint64, little endian)
+    header (utf-8 JSON, padded to a multiple of 8 bytes)
+    timestamps (int64 epoch ms, little endian)
+    columns
+
+The header holds the metadata of the series (name, index, etc), the
+number of points and, for each data column, its type and the offset of
+its data relative to the end of the header. Integer and float columns
+are stored as fixed-width int64/float64 values. Any other column (strings,
+nested data, columns with missing values) is stored as a JSON blob.
+
+Files are opened with mmap and the timestamp and numeric columns
+of the resulting ColumnarCollection are memoryviews of the mapped
+pages, so opening a file does not read (or parse) the points - at(),
+bisect(), crop() and aggregations read the pages they need on demand.
+"""
+
+import array
+import json
+import mmap
+import struct
+import sys
+
+from pyrsistent import freeze, thaw
+
+from ..columnar import ColumnarCollection, MISSING, is_typed_column
+from ..event import Event
+from ..exceptions import PipelineIOException
+from ..index import Index
+from ..series import TimeSeries
+from ..util import ObjectEncoder
+
+MAGIC = b'PYPOND\x00\x01'
+
+_LENGTH = struct.Struct('<Q')
+_PREAMBLE = len(MAGIC) + _LENGTH.size
+
+# the numeric data is stored little endian, on a big endian machine
+# the columns need to be copied and swapped.
+_NATIVE = sys.byteorder == 'little'
+
+
+def _pad(size):
+    """Number of bytes to pad size out to a multiple of 8."""
+    return -size % 8
+
+
+def _to_bytes(col):
+    """The little endian bytes of a typed column."""
+    if not _NATIVE:
+        col = array.array('q' if col.format == 'q' else 'd', col) \
+            if isinstance(col, memoryview) else array.array(col.typecode, col)
+        col.byteswap()
+
+    if isinstance(col, memoryview):
+        return col.tobytes()
+
+    return col.tobytes() if hasattr(col, 'tobytes') else col.tostring()
+
+
+def _typecode(col):
+    """array typecode of a typed column."""
+    return col.format if isinstance(col, memoryview) else col.typecode
+
+
+def encode_list_column(col):
+    """Encode a column that is not stored as fixed-width numbers
+    (strings, nested data, missing values) as utf-8 JSON.
+
+    Parameters
+    ----------
+    col : list
+        Column from a ColumnarCollection.
+
+    Returns
+    -------
+    bytes
+        The encoded column.
+    """
+    return json.dumps(dict(
+        values=[None if i is MISSING else thaw(i) for i in col],
+        missing=[i for i, v in enumerate(col) if v is MISSING],
+    ), cls=ObjectEncoder).encode('utf-8')
+
+
+def decode_list_column(blob):
+    """Decode a column encoded by encode_list_column()
+
+    Parameters
+    ----------
+    blob : bytes
+        The encoded column.
+
+    Returns
+    -------
+    list
+        Column for a ColumnarCollection.
+    """
+    blob = json.loads(bytes(blob).decode('utf-8'))
+    col = [freeze(v) for v in blob.get('values')]
+
+    for pos in blob.get('missing'):
+        col[pos] = MISSING
+
+    return col
+
+
+def dump(series, fileobj):
+    """Write a TimeSeries to a file in the binary format.
+
+    Parameters
+    ----------
+    series : TimeSeries
+        The series to write. It must contain Event objects.
+    fileobj : file
+        A file-like object opened in binary mode.
+
+    Raises
+    ------
+    PipelineIOException
+        Raised if the series does not contain Events.
+    """
+    # pylint: disable=protected-access
+
+    coll = series.collection()
+
+    if coll.type() not in (Event, None):
+        msg = 'only series of Event objects can be written, not {0}'.format(coll.type())
+        raise PipelineIOException(msg)
+
+    if not isinstance(coll, ColumnarCollection):
+        coll = ColumnarCollection(coll)
+
+    meta = series.meta()
+
+    if isinstance(meta.get('index'), Index):
+        meta['index'] = meta.get('index').to_string()
+
+    blobs = list()
+    columns = list()
+    offset = coll.size() * 8
+
+    for name, col in list(coll._columns.items()):
+        if is_typed_column(col):
+            col_type = _typecode(col)
+            blob = _to_bytes(col)
+        else:
+            col_type = 'json'
+            blob = encode_list_column(col)
+
+        columns.append(dict(name=name, type=col_type, offset=offset, length=len(blob)))
+        blobs.append(blob + b'\0' * _pad(len(blob)))
+
+        offset += len(blobs[-1])
+
+    header = json.dumps(dict(
+        meta=meta,
+        size=coll.size(),
+        chronological=coll.is_chronological(),
+        columns=columns,
+    ), cls=ObjectEncoder).encode('utf-8')
+
+    header += b' ' * _pad(len(header))
+
+    fileobj.write(MAGIC)
+    fileobj.write(_LENGTH.pack(len(header)))
+    fileobj.write(header)
+    fileobj.write(_to_bytes(coll.timestamps()))
+
+    for blob in blobs:
+        fileobj.write(blob)
+
+
+def _numeric(buf, begin, size, typecode):
+    """A typed column of the buffer, without copying if possible."""
+    view = memoryview(buf)[begin:begin + size * 8]
+
+    if _NATIVE and hasattr(view, 'cast'):
+        return view.cast('B').cast(typecode)
+
+    col = array.array(typecode)
+
+    if hasattr(col, 'frombytes'):
+        col.frombytes(view.tobytes())
+    else:
+        col.fromstring(view.tobytes())
+
+    if not _NATIVE:
+        col.byteswap()
+
+    return col
+
+
+def loads(buf):
+    """Create a TimeSeries from the binary format held in a buffer. The
+    numeric columns of the series reference buf rather than copying it.
+
+    Parameters
+    ----------
+    buf : bytes, bytearray, mmap.mmap
+        Any object supporting the buffer protocol.
+
+    Returns
+    -------
+    TimeSeries
+        The series, backed by a ColumnarCollection.
+
+    Raises
+    ------
+    PipelineIOException
+        Raised if buf is not in the binary format.
+    """
+    # pylint: disable=protected-access
+
+    if len(buf) < _PREAMBLE or bytes(buf[:len(MAGIC)]) != MAGIC:
+        raise PipelineIOException('not a pypond binary series')
+
+    header_length = _LENGTH.unpack(bytes(buf[len(MAGIC):_PREAMBLE]))[0]
+    data = _PREAMBLE + header_length
+
+    try:
+        header = json.loads(bytes(buf[_PREAMBLE:data]).decode('utf-8'))
+    except ValueError:
+        raise PipelineIOException('malformed binary series header')
+
+    size = header.get('size')
+
+    if len(buf) < data + size * 8 + sum(i.get('length') for i in header.get('columns')):
+        raise PipelineIOException('binary series is truncated')
+
+    times = _numeric(buf, data, size, 'q')
+    columns = list()
+
+    for i in header.get('columns'):
+        begin = data + i.get('offset')
+
+        if i.get('type') == 'json':
+            col = decode_list_column(buf[begin:begin + i.get('length')])
+        else:
+            col = _numeric(buf, begin, size, i.get('type'))
+
+        columns.append((i.get('name'), col))
+
+    coll = ColumnarCollection.from_columns(times, dict())
+    coll._columns.update(columns)
+    # seed the cache so opening a file does not scan the timestamps.
+    coll._bisect_cache = (coll._times, coll._times, header.get('chronological'))
+
+    meta = header.get('meta')
+    meta['collection'] = coll
+
+    return TimeSeries(meta)
+
+
+def load(path):
+    """Open a file written by dump() with mmap.
+
+    The file is mapped read-only and the numeric columns of the series
+    are views of the mapped pages, so this is fast no matter how large
+    the series is and pages are only read from disk when they
+    are accessed. The file must not be modified or overwritten while
+    the series is still in use.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+
+    Returns
+    -------
+    TimeSeries
+        The series, backed by a ColumnarCollection.
+
+    Raises
+    ------
+    PipelineIOException
+        Raised if the file is not in the binary format.
+    """
+    with open(path, 'rb') as fh:
+        try:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # can not map an empty file
+            raise PipelineIOException('not a pypond binary series')
+
+    return loads(buf)
@@ -0,0 +1,500 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Compression of series using the timestamp and value encodings from
+Facebook's Gorilla (Pelkonen et al., "Gorilla: A Fast, Scalable,
+In-Memory Time Series Database", 2015).
+
+Timestamps (and integer columns, ie: counters) are stored as the
+difference between consecutive deltas, so regularly spaced timestamps
+and steadily increasing counters cost a single bit per value. Float
+columns are stored as the XOR with the previous value, so values that
+do not change (or change slowly) cost one or a few bits. Any other
+column is stored as JSON.
+
+Compressed data can be turned back into a series all at once, or
+a CompressedSeries can be used as the source of a Pipeline in
+which case events are decoded one at a time as they are
+processed::
+
+    cold = CompressedSeries(series)
+    cold.to_bytes()  # for persistence
+
+    Pipeline().from_source(cold) ... .to(EventOut, cback)
+"""
+
+import json
+import struct
+
+from collections import OrderedDict
+
+from pyrsistent import pmap
+
+from .binary import decode_list_column, encode_list_column
+from .input import Bounded
+from ..collection import Collection
+from ..columnar import ColumnarCollection, MISSING, is_typed_column
+from ..event import Event
+from ..exceptions import PipelineIOException
+from ..index import Index
+from ..series import TimeSeries
+from ..util import ObjectEncoder
+
+MAGIC = b'PYPONDG1'
+
+_LENGTH = struct.Struct('<I')
+_PREAMBLE = len(MAGIC) + _LENGTH.size
+
+_FLOAT = struct.Struct('<d')
+_BITS = struct.Struct('<Q')
+
+# delta-of-delta buckets, (control bits, control bit count, value bits)
+# - the last bucket holds anything the difference of two int64 deltas
+# can produce.
+_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+    (0b1111, 4, 66),
+)
+
+
+class _BitWriter(object):
+    """Append values of arbitrary bit widths to a byte buffer."""
+    __slots__ = ('_buf', '_acc', '_bits')
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value, nbits):
+        """Write the low nbits of value."""
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._bits += nbits
+
+        while self._bits >= 8:
+            self._bits -= 8
+            self._buf.append((self._acc >> self._bits) & 0xff)
+
+        self._acc &= (1 << self._bits) - 1
+
+    def getvalue(self):
+        """The bytes written so far, the last byte is zero padded."""
+        if self._bits:
+            return bytes(self._buf + bytearray([(self._acc << (8 - self._bits)) & 0xff]))
+
+        return bytes(self._buf)
+
+
+class _BitReader(object):
+    """Read values of arbitrary bit widths from a byte buffer."""
+    __slots__ = ('_buf', '_pos')
+
+    def __init__(self, buf, begin):
+        self._buf = buf
+        self._pos = begin * 8
+
+    def read(self, nbits):
+        """Read nbits as an unsigned int."""
+        value = 0
+
+        while nbits:
+            offset = self._pos & 7
+            take = min(8 - offset, nbits)
+            byte = self._buf[self._pos >> 3]
+
+            value = (value << take) | ((byte >> (8 - offset - take)) & ((1 << take) - 1))
+
+            self._pos += take
+            nbits -= take
+
+        return value
+
+    def read_signed(self, nbits):
+        """Read nbits as a two's complement int."""
+        value = self.read(nbits)
+
+        if value >> (nbits - 1):
+            value -= 1 << nbits
+
+        return value
+
+
+def _encode_ints(values):
+    """Delta-of-delta encode a sequence of ints."""
+    writer = _BitWriter()
+    prev = prev_delta = None
+
+    for value in values:
+        if prev is None:
+            writer.write(value, 64)
+        elif prev_delta is None:
+            prev_delta = value - prev
+            writer.write(prev_delta, 66)
+        else:
+            delta = value - prev
+            dod = delta - prev_delta
+            prev_delta = delta
+
+            if dod == 0:
+                writer.write(0, 1)
+            else:
+                for control, control_bits, value_bits in _BUCKETS:
+                    limit = 1 << (value_bits - 1)
+                    if -limit <= dod < limit:
+                        writer.write(control, control_bits)
+                        writer.write(dod, value_bits)
+                        break
+
+        prev = value
+
+    return writer.getvalue()
+
+
+def _decode_ints(buf, begin, size):
+    """Generator for size ints from a delta-of-delta encoded stream."""
+    if not size:
+        return
+
+    reader = _BitReader(buf, begin)
+
+    value = reader.read_signed(64)
+    yield value
+
+    if size == 1:
+        return
+
+    delta = reader.read_signed(66)
+    value += delta
+    yield value
+
+    for _ in range(size - 2):
+        if reader.read(1):
+            for _, control_bits, value_bits in _BUCKETS[:-1]:
+                if not reader.read(1):
+                    delta += reader.read_signed(value_bits)
+                    break
+            else:
+                delta += reader.read_signed(_BUCKETS[-1][2])
+
+        value += delta
+        yield value
+
+
+def _encode_floats(values):
+    """XOR encode a sequence of floats."""
+    writer = _BitWriter()
+    prev = leading = trailing = None
+
+    for value in values:
+        bits = _BITS.unpack(_FLOAT.pack(value))[0]
+
+        if prev is None:
+            writer.write(bits, 64)
+        else:
+            xor = bits ^ prev
+
+            if xor == 0:
+                writer.write(0, 1)
+            else:
+                lead = min(64 - xor.bit_length(), 31)
+                trail = (xor & -xor).bit_length() - 1
+
+                if leading is not None and lead >= leading and trail >= trailing:
+                    # fits in the previous window of meaningful bits
+                    writer.write(0b10, 2)
+                    writer.write(xor >> trailing, 64 - leading - trailing)
+                else:
+                    leading, trailing = lead, trail
+                    meaningful = 64 - lead - trail
+
+                    writer.write(0b11, 2)
+                    writer.write(lead, 5)
+                    writer.write(meaningful - 1, 6)
+                    writer.write(xor >> trail, meaningful)
+
+        prev = bits
+
+    return writer.getvalue()
+
+
+def _decode_floats(buf, begin, size):
+    """Generator for size floats from an XOR encoded stream."""
+    if not size:
+        return
+
+    reader = _BitReader(buf, begin)
+
+    bits = reader.read(64)
+    yield _FLOAT.unpack(_BITS.pack(bits))[0]
+
+    leading = trailing = 0
+
+    for _ in range(size - 1):
+        if reader.read(1):
+            if reader.read(1):
+                leading = reader.read(5)
+                trailing = 64 - leading - reader.read(6) - 1
+
+            bits ^= reader.read(64 - leading - trailing) << trailing
+
+        yield _FLOAT.unpack(_BITS.pack(bits))[0]
+
+
+def encode(series):
+    """Compress a TimeSeries or Collection.
+
+    Parameters
+    ----------
+    series : TimeSeries or Collection
+        The data to compress, it must contain Event objects. The
+        metadata is included for a TimeSeries.
+
+    Returns
+    -------
+    bytes
+        The compressed data.
+
+    Raises
+    ------
+    PipelineIOException
+        Raised if the data are not Event objects.
+    """
+    # pylint: disable=protected-access
+
+    meta = None
+    coll = series
+
+    if isinstance(series, TimeSeries):
+        meta = series.meta()
+        coll = series.collection()
+
+        if isinstance(meta.get('index'), Index):
+            meta['index'] = meta.get('index').to_string()
+
+    if not isinstance(coll, Collection) or coll.type() not in (Event, None):
+        msg = 'only Events can be compressed, not {0}'.format(coll)
+        raise PipelineIOException(msg)
+
+    # an empty Collection has no event type (or columns), which is kept
+    # so that it comes back the same rather than as Events.
+    typed = coll.type() is not None
+
+    if not isinstance(coll, ColumnarCollection):
+        coll = ColumnarCollection(coll)
+
+    blobs = [_encode_ints(coll.timestamps())]
+    columns = list()
+
+    for name, col in list(coll._columns.items()):
+        if not is_typed_column(col):
+            col_type = 'json'
+            blobs.append(encode_list_column(col))
+        elif isinstance(col, memoryview) and col.format == 'q' or \
+                getattr(col, 'typecode', None) == 'q':
+            col_type = 'q'
+            blobs.append(_encode_ints(col))
+        else:
+            col_type = 'd'
+            blobs.append(_encode_floats(col))
+
+        columns.append(dict(name=name, type=col_type))
+
+    offset = 0
+
+    for info, blob in zip([dict()] + columns, blobs):
+        info['offset'] = offset
+        offset += len(blob)
+
+    header = json.dumps(dict(
+        meta=meta,
+        size=coll.size(),
+        typed=typed,
+        columns=columns,
+    ), cls=ObjectEncoder).encode('utf-8')
+
+    return MAGIC + _LENGTH.pack(len(header)) + header + b''.join(blobs)
+
+
+def decode(data):
+    """Decompress data produced by encode().
+
+    Parameters
+    ----------
+    data : bytes
+        The compressed data.
+
+    Returns
+    -------
+    TimeSeries or ColumnarCollection
+        A TimeSeries if a TimeSeries was compressed, otherwise a collection.
+    """
+    return CompressedSeries(data).decode()
+
+
+class CompressedSeries(Bounded):
+    """
+    A compressed TimeSeries or Collection. This is a Bounded input
+    so it can be used as the source of a Pipeline - the events
+    are decompressed as they are processed, rather than all at once.
+
+    Parameters
+    ----------
+    source : bytes, TimeSeries or Collection
+        Data produced by encode() or a series to compress.
+
+    Raises
+    ------
+    PipelineIOException
+        Raised if source is not valid compressed data.
+    """
+
+    def __init__(self, source):
+        """Create the compressed series."""
+        super(CompressedSeries, self).__init__()
+
+        if isinstance(source, (TimeSeries, Collection)):
+            source = encode(source)
+
+        if not isinstance(source, (bytes, bytearray)) or \
+                bytes(source[:len(MAGIC)]) != MAGIC:
+            raise PipelineIOException('not compressed series data')
+
+        self._data = bytearray(source)
+
+        header_length = _LENGTH.unpack(bytes(self._data[len(MAGIC):_PREAMBLE]))[0]
+        self._offset = _PREAMBLE + header_length
+
+        try:
+            self._header = json.loads(
+                bytes(self._data[_PREAMBLE:self._offset]).decode('utf-8'))
+        except ValueError:
+            raise PipelineIOException('malformed compressed series header')
+
+        self._type = Event
+
+    def to_bytes(self):
+        """The compressed data, suitable for persistence.
+
+        Returns
+        -------
+        bytes
+            The data.
+        """
+        return bytes(self._data)
+
+    def size(self):
+        """Number of events.
+
+        Returns
+        -------
+        int
+            Number of events.
+        """
+        return self._header.get('size')
+
+    def meta(self):
+        """Metadata of the series that was compressed.
+
+        Returns
+        -------
+        dict
+            Metadata, or None if a Collection was compressed.
+        """
+        return self._header.get('meta')
+
+    def columns(self):
+        """Top-level data columns.
+
+        Returns
+        -------
+        list
+            Column names.
+        """
+        return [i.get('name') for i in self._header.get('columns')]
+
+    def _decoders(self):
+        """Generators for the timestamp and each column."""
+        size = self.size()
+        begin = self._offset
+
+        decoders = [_decode_ints(self._data, begin, size)]
+
+        columns = self._header.get('columns')
+
+        for idx, info in enumerate(columns):
+            start = begin + info.get('offset')
+
+            if info.get('type') == 'json':
+                end = begin + columns[idx + 1].get('offset') \
+                    if idx + 1 < len(columns) else len(self._data)
+                decoders.append(iter(decode_list_column(self._data[start:end])))
+            elif info.get('type') == 'q':
+                decoders.append(_decode_ints(self._data, start, size))
+            else:
+                decoders.append(_decode_floats(self._data, start, size))
+
+        return decoders
+
+    def events(self):
+        """Generator that decompresses events one at a time.
+
+        Returns
+        -------
+        iterator
+            Event objects.
+        """
+        names = self.columns()
+
+        for row in zip(*self._decoders()):
+            data = dict()
+
+            for name, value in zip(names, row[1:]):
+                if value is not MISSING:
+                    data[name] = value
+
+            yield Event(pmap(dict(time=row[0], data=pmap(data))))
+
+    def collection(self):
+        """Decompress everything into a collection.
+
+        Returns
+        -------
+        ColumnarCollection
+            The events, or an empty Collection if an empty Collection
+            was compressed.
+        """
+        if not self._header.get('typed', True):
+            return Collection()
+
+        decoders = self._decoders()
+        columns = OrderedDict(
+            (name, list(dec)) for name, dec in zip(self.columns(), decoders[1:]))
+
+        return ColumnarCollection.from_columns(list(decoders[0]), columns)
+
+    def decode(self):
+        """Decompress everything.
+
+        Returns
+        -------
+        TimeSeries or ColumnarCollection
+            A TimeSeries if a TimeSeries was compressed, otherwise
+            a collection.
+        """
+        coll = self.collection()
+
+        if self.meta() is None:
+            return coll
+
+        meta = dict(self.meta())
+        meta['collection'] = coll
+
+        return TimeSeries(meta)
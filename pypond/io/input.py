@@ -10,6 +10,10 @@
 Classes to handle pipeline input.
 """
 
+import threading
+
+from collections import deque
+
 from ..event import Event
 from ..bases import Observable
 from ..exceptions import PipelineIOException
@@ -112,3 +116,171 @@ class Stream(PipelineIn):
         """Raise an exception - can't iterate an unbounded source."""
         msg = 'Iteration across unbounded sources is not suported.'
         raise PipelineIOException(msg)
+
+
+class ThreadedStream(Stream):
+    """
+    A Stream that can be fed from several threads. add_event() only
+    appends the event to a buffer and a single worker thread runs the
+    buffered events through the pipeline in batches - so the processors
+    and the output are only ever used by the one thread, and producers
+    do not wait on the pipeline (or each other's callbacks).
+
+    The worker is started when the stream is created. stop() waits for
+    the buffered events to be processed, flushes the pipeline and
+    stops the worker, start() starts a new one.
+
+    ::
+
+        stream = ThreadedStream()
+
+        Pipeline().from_source(stream) ... .to(EventOut, cback)
+
+        # from any number of threads
+        stream.add_event(event)
+
+        stream.stop()
+
+    Parameters
+    ----------
+    batch_size : int, optional
+        Maximum number of events the worker runs through the pipeline
+        at a time.
+    maxsize : int, optional
+        Maximum number of buffered events, producers wait for room when
+        the buffer is full. 0 (the default) for no limit.
+    """
+
+    def __init__(self, batch_size=1000, maxsize=0):
+        """Create the stream and start the worker."""
+        super(ThreadedStream, self).__init__()
+
+        self._batch_size = batch_size
+        self._maxsize = maxsize
+
+        # producers append under the condition, the worker pops batches
+        # without it since deque pops are atomic.
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._waiting = False
+        self._stopping = False
+        self._error = None
+        self._worker = None
+
+        self.start()
+
+    def start(self):
+        """Start the worker thread if it is not running."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self._running = True
+        self._stopping = False
+
+        self._worker = threading.Thread(target=self._work, name=self._id)
+        self._worker.daemon = True
+        self._worker.start()
+
+    def stop(self):
+        """Process the buffered events, flush the pipeline and stop
+        the worker thread. add_event() raises until start() is called.
+
+        Raises
+        ------
+        PipelineIOException
+            Raised if the pipeline raised an exception in the worker.
+        """
+        with self._cond:
+            self._running = False
+            self._stopping = True
+            self._cond.notify_all()
+
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+            # the worker is gone so it is safe to flush from here.
+            if self._error is None:
+                super(ThreadedStream, self).stop()
+
+        self._raise_error()
+
+    def _raise_error(self):
+        """Raise an exception the pipeline raised in the worker."""
+        if self._error is not None:
+            msg = 'pipeline failed in the stream worker: {0}'.format(self._error)
+            raise PipelineIOException(msg)
+
+    def add_event(self, event):
+        """Type check an event and buffer it for the worker.
+
+        Parameters
+        ----------
+        event : Event
+            Some Event class
+
+        Raises
+        ------
+        PipelineIOException
+            Raised if the stream has been stopped, or the pipeline raised
+            an exception in the worker.
+        """
+        self._check(event)
+
+        # the stopped check and the append are done together so an event
+        # can not be added after stop() has let the worker finish.
+        with self._cond:
+            # the worker notifies when it takes a batch off the buffer,
+            # fails or is stopped.
+            while self._maxsize and len(self._buffer) >= self._maxsize and \
+                    self._error is None and self._running:
+                self._cond.wait()
+
+            self._raise_error()
+
+            if not self._running:
+                raise PipelineIOException('can not add events to a stopped ThreadedStream')
+
+            self._buffer.append(event)
+
+            if self._waiting:
+                self._cond.notify_all()
+
+    def _work(self):
+        """The worker thread - process batches until stopped."""
+        buf = self._buffer
+
+        while True:
+            if not buf:
+                with self._cond:
+                    # producers append under the condition, so the buffer
+                    # is still empty while the worker waits.
+                    if not buf:
+                        if self._stopping:
+                            return
+
+                        self._waiting = True
+                        self._cond.wait()
+                        self._waiting = False
+
+                continue
+
+            batch = list()
+
+            while buf and len(batch) < self._batch_size:
+                batch.append(buf.popleft())
+
+            if self._maxsize:
+                with self._cond:
+                    self._cond.notify_all()
+
+            if self.has_observers():
+                try:
+                    self.emit_events(batch)
+                except Exception as err:  # pylint: disable=broad-except
+                    with self._cond:
+                        self._error = err
+                        buf.clear()
+                        self._cond.notify_all()
+
+                    return
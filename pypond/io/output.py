@@ -10,12 +10,15 @@
 Objects to handle Pipeline output and event collection.
 """
 
+import heapq
+
 from collections import OrderedDict
 
 from ..bases import PypondBase
 from ..collection import Collection
 from ..exceptions import PipelineIOException
 from ..index import Index
+from ..range import TimeRange
 from ..util import unique_id, Options, Capsule
 
 #
@@ -33,6 +36,38 @@ class Collector(PypondBase):
     Collections are emitted from this class to the supplied onTrigger
     callback.
 
+    With emit_on 'changed' only the collection(s) that an event was
+    added to are emitted, rather than all of them as with 'eachEvent'.
+
+    If options.allowed_lateness (a duration string) is set, fixed windows
+    emitted on 'discard' are closed by a watermark - the latest timestamp
+    seen less the allowed lateness - rather than when the next window
+    opens. A window stays open, and takes events that arrive out of order,
+    until the watermark passes its end. Events for windows that have been
+    closed are dropped and counted (see dropped_events()). Sliding and
+    session windows always use the watermark, with no lateness by default.
+
+    Sliding windows overlap so, rather than adding each event to every
+    window it is part of, events are added to a collection for the
+    slide-sized pane they fall in. When a window is emitted the panes
+    it covers are combined - WindowAccumulators are merged and the
+    events of Collections are concatenated.
+
+    Session windows are kept for each group by key until there is a gap
+    in the events. The open sessions are also kept in a heap ordered by
+    when they will expire, so finding the sessions to discard only looks
+    at the sessions that are due rather than every open session. An event
+    from before the open session of its group is added to the earlier
+    session it falls in, or starts a session of its own - unless the
+    sessions are emitted on 'discard', in which case the earlier
+    sessions have already gone and the event is dropped and counted.
+
+    By default, events are added to a Collection for each window. If
+    options.collection_factory is supplied, that will be called to
+    create the object for each new window instead. It needs to implement
+    add_event() and return the updated object, which is what is
+    handed to the callback.
+
     Parameters
     ----------
     options : Options
@@ -51,6 +86,8 @@ class Collector(PypondBase):
         self._emit_on = options.emit_on
         self._window_type = options.window_type
         self._window_duration = options.window_duration
+        self._window_slide = options.window_slide
+        self._lateness = options.allowed_lateness
         self._utc = True
 
         # If the optional utc option is passed in by one of the processors
@@ -61,16 +98,80 @@ class Collector(PypondBase):
         # callback for trigger
         self._on_trigger = on_trigger
 
+        # creates the object that the events in each window are added to
+        self._collection_factory = Collection
+
+        if options.collection_factory is not None:
+            self._collection_factory = options.collection_factory
+
         # maintained collections
         self._collections = OrderedDict()
 
+        # the collection keys in each window, in the order the windows
+        # were opened, so closing a window only touches its own groups.
+        self._windows = OrderedDict()
+
+        # sliding window state - panes by group by key then pane position
+        # and the lowest window position that has not been emitted.
+        self._panes = OrderedDict()
+        self._next_window = None
+
+        # session window state - the collection key of the open session
+        # for each group by key.
+        self._sessions = dict()
+
+        # watermark state - a heap of (expiry time, window or session key),
+        # the latest timestamp seen and the number of late events dropped.
+        self._expiry = list()
+        self._clock = None
+        self._dropped = 0
+        self._lateness_ms = Index.window_duration(self._lateness) if \
+            self._lateness is not None else 0
+
+        if self._window_type == 'session':
+            self._gap_ms = Index.window_duration(self._window_duration)
+
+        if self._window_type == 'sliding':
+            self._slide_ms = Index.window_duration(self._window_slide)
+            self._panes_per_window = Index.window_duration(self._window_duration) // \
+                self._slide_ms
+
     def flush_collections(self):
         """Emit the remaining collections."""
 
         self._log('Collector.flush_collections')
 
+        if self._window_type == 'sliding':
+            self.emit_collections(self._sliding_windows(self._panes, self._next_window))
+            return
+
         self.emit_collections(self._collections)
 
+    def dropped_events(self):
+        """Number of events that were dropped because they arrived after
+        the windows they belong to were closed.
+
+        Returns
+        -------
+        int
+            Number of dropped events.
+        """
+        return self._dropped
+
+    def _advance(self, event):
+        """Update the clock with an event and return the watermark."""
+        timestamp = event.timestamp_ms()
+
+        if self._clock is None or timestamp > self._clock:
+            self._clock = timestamp
+
+        return self._clock - self._lateness_ms
+
+    def _drop(self, event):
+        """Count a late event."""
+        self._log('Collector.add_event', 'dropping late event: {0}', (event,))
+        self._dropped += 1
+
     def emit_collections(self, collections):
         """Emit all of the collections to the trigger callback that was
         passed in by the Processor
@@ -88,6 +189,11 @@ class Collector(PypondBase):
             for v in list(collections.values()):
                 self._on_trigger(v.collection, v.window_key, v.group_by_key)
 
+    def _emit_changed(self, collection_keys):
+        """Emit just the collections that an event was added to."""
+        self.emit_collections(
+            OrderedDict((k, self._collections[k]) for k in collection_keys))
+
     def add_event(self, event):  # pylint: disable=too-many-branches
         """Add and event to the _collections dict and act accordingly
         depending on how _emit_on is set.
@@ -105,20 +211,26 @@ class Collector(PypondBase):
 
         self._log('Collector.add_event', '{0} utc: {1}', (event, self._utc))
 
+        if self._window_type == 'sliding':
+            self._add_sliding_event(event)
+            return
+
+        if self._window_type == 'session':
+            self._add_session_event(event)
+            return
+
         # window_key
         window_key = None
 
-        ts = event.timestamp()
-
         if self._window_type == 'fixed':
             # if fixed, always utc
-            window_key = Index.get_index_string(self._window_duration, ts)
+            window_key = Index.get_index_string(self._window_duration, event.timestamp_ms())
         elif self._window_type == 'daily':
-            window_key = Index.get_daily_index_string(ts, utc=self._utc)
+            window_key = Index.get_daily_index_string(event.timestamp(), utc=self._utc)
         elif self._window_type == 'monthly':
-            window_key = Index.get_monthly_index_string(ts, utc=self._utc)
+            window_key = Index.get_monthly_index_string(event.timestamp(), utc=self._utc)
         elif self._window_type == 'yearly':
-            window_key = Index.get_yearly_index_string(ts, utc=self._utc)
+            window_key = Index.get_yearly_index_string(event.timestamp(), utc=self._utc)
         else:
             window_key = self._window_type
 
@@ -132,14 +244,20 @@ class Collector(PypondBase):
 
         self._log('Collector.add_event', 'collection_key: {0}', (collection_key))
 
+        if self._lateness is not None and self._window_type == 'fixed' and \
+                self._emit_on == 'discard':
+            self._add_watermarked_event(event, window_key, group_by_key, collection_key)
+            return
+
         discard = False
 
         if collection_key not in self._collections:
             self._collections[collection_key] = Capsule(
                 window_key=window_key,
                 group_by_key=group_by_key,
-                collection=Collection(),
+                collection=self._collection_factory(),
             )
+            self._windows.setdefault(window_key, list()).append(collection_key)
             discard = True
 
         self._collections[collection_key].collection = \
@@ -157,13 +275,17 @@ class Collector(PypondBase):
         # the previous day are copied from self._collections into
         # the discards dict, the discards dict is emitted, and then
         # those values are pop()'ed out of self._collections.
+        #
+        # The collections are found with the self._windows index, which
+        # only ever holds the open windows, rather than scanning every
+        # collection for every group.
 
         discards = OrderedDict()
 
-        if discard is True and self._window_type == 'fixed':
-            for k, v in list(self._collections.items()):
-                if v.window_key != window_key:
-                    discards[k] = v
+        if discard is True and self._window_type == 'fixed' and self._emit_on == 'discard':
+            for k in [i for i in self._windows if i != window_key]:
+                for closed_key in self._windows.pop(k):
+                    discards[closed_key] = self._collections[closed_key]
 
         # emit
 
@@ -175,6 +297,8 @@ class Collector(PypondBase):
 
         if self._emit_on == 'eachEvent':  # keeping mixedCase tokens for consistancy.
             self.emit_collections(self._collections)
+        elif self._emit_on == 'changed':
+            self._emit_changed([collection_key])
         elif self._emit_on == 'discard':
             self.emit_collections(discards)
             for k in list(discards.keys()):
@@ -186,6 +310,341 @@ class Collector(PypondBase):
             msg = 'Unknown emit type supplied to Collector'
             raise PipelineIOException(msg)
 
+    def _add_watermarked_event(self, event, window_key, group_by_key, collection_key):
+        """Add an event to a fixed window that is closed by the watermark,
+        and emit the windows that the watermark has passed."""
+
+        watermark = self._advance(event)
+
+        if window_key not in self._windows:
+            duration = Index.window_duration(self._window_duration)
+            end = (event.timestamp_ms() // duration + 1) * duration
+
+            if end <= watermark:
+                # this window has already been closed
+                self._drop(event)
+                return
+
+            self._windows[window_key] = list()
+            heapq.heappush(self._expiry, (end, window_key))
+
+        if collection_key not in self._collections:
+            self._collections[collection_key] = Capsule(
+                window_key=window_key,
+                group_by_key=group_by_key,
+                collection=self._collection_factory(),
+            )
+            self._windows[window_key].append(collection_key)
+
+        self._collections[collection_key].collection = \
+            self._collections[collection_key].collection.add_event(event)
+
+        discards = OrderedDict()
+
+        while self._expiry and self._expiry[0][0] <= watermark:
+            _, closed = heapq.heappop(self._expiry)
+
+            for closed_key in self._windows.pop(closed):
+                discards[closed_key] = self._collections.pop(closed_key)
+
+        self.emit_collections(discards)
+
+    # sliding windows
+
+    def sliding_window_key(self, pos):
+        """The window key of the sliding window at a position. This is the
+        duration and slide followed by the start of the window in
+        multiples of the slide, ie: 5m@10s-142929.
+
+        Parameters
+        ----------
+        pos : int
+            Start of the window in multiples of the slide.
+
+        Returns
+        -------
+        str
+            The window key.
+        """
+        return '{dur}@{slide}-{pos}'.format(
+            dur=self._window_duration, slide=self._window_slide, pos=pos)
+
+    @staticmethod
+    def sliding_window_range(window_key):
+        """The time range covered by a sliding window.
+
+        Parameters
+        ----------
+        window_key : str
+            A window key from sliding_window_key()
+
+        Returns
+        -------
+        TimeRange
+            The extents of the window.
+        """
+        durations, pos = window_key.split('-', 1)
+        duration, slide = durations.split('@')
+
+        begin = int(pos) * Index.window_duration(slide)
+
+        return TimeRange(begin, begin + Index.window_duration(duration))
+
+    def _combine_panes(self, panes):
+        """Combine the panes of a window into a single collection."""
+        if len(panes) == 1:
+            return panes[0]
+
+        if hasattr(panes[0], 'merge'):
+            combined = self._collection_factory()
+
+            for i in panes:
+                combined.merge(i)
+
+            return combined
+
+        return Collection([e for i in panes for e in i.events()])
+
+    def _sliding_windows(self, panes, first, last=None):
+        """Capsules for the windows that have data, in order of position,
+        from first to last (inclusive) for each of the groups."""
+        windows = dict()
+
+        for group_by_key, group_panes in list(panes.items()):
+            for pane in group_panes:
+                begin = pane - self._panes_per_window + 1
+
+                if first is not None:
+                    begin = max(begin, first)
+
+                end = pane if last is None else min(pane, last)
+
+                for pos in range(begin, end + 1):
+                    windows.setdefault(pos, OrderedDict())[group_by_key] = None
+
+        collections = OrderedDict()
+
+        for pos in sorted(windows.keys()):
+            window_key = self.sliding_window_key(pos)
+
+            for group_by_key in panes:
+                if group_by_key not in windows[pos]:
+                    continue
+
+                group_panes = panes[group_by_key]
+
+                window = [
+                    group_panes[i] for i in range(pos, pos + self._panes_per_window)
+                    if i in group_panes
+                ]
+
+                collection_key = '{wk}::{gbk}'.format(wk=window_key, gbk=group_by_key) if \
+                    group_by_key is not None else window_key
+
+                collections[collection_key] = Capsule(
+                    window_key=window_key,
+                    group_by_key=group_by_key,
+                    collection=self._combine_panes(window),
+                )
+
+        return collections
+
+    def _add_sliding_event(self, event):
+        """Add an event to its pane and emit the sliding windows
+        per _emit_on."""
+
+        watermark = self._advance(event)
+
+        pane = event.timestamp_ms() // self._slide_ms
+        group_by_key = self._group_by(event)
+
+        first = pane - self._panes_per_window + 1
+
+        if self._next_window is None or \
+                (self._emit_on != 'discard' and first < self._next_window):
+            self._next_window = first
+
+        if pane < self._next_window:
+            # every window this event is part of has been emitted.
+            self._drop(event)
+            return
+
+        group_panes = self._panes.setdefault(group_by_key, dict())
+
+        if pane not in group_panes:
+            group_panes[pane] = self._collection_factory()
+
+        group_panes[pane] = group_panes[pane].add_event(event)
+
+        if self._emit_on == 'eachEvent':
+            self.emit_collections(self._sliding_windows(self._panes, self._next_window))
+        elif self._emit_on == 'changed':
+            # just the windows this event is part of.
+            window_panes = dict(
+                (i, group_panes[i]) for i in range(first, pane + self._panes_per_window)
+                if i in group_panes
+            )
+
+            self.emit_collections(self._sliding_windows(
+                OrderedDict([(group_by_key, window_panes)]), first, pane))
+        elif self._emit_on == 'discard':
+            # windows that end at or before the watermark are complete.
+            last = watermark // self._slide_ms - self._panes_per_window
+
+            if last >= self._next_window:
+                self.emit_collections(self._sliding_windows(self._panes, self._next_window, last))
+
+                self._next_window = last + 1
+
+                for group_panes in list(self._panes.values()):
+                    for i in [i for i in group_panes if i < self._next_window]:
+                        del group_panes[i]
+        elif self._emit_on == 'flush':
+            pass
+        else:
+            msg = 'Unknown emit type supplied to Collector'
+            raise PipelineIOException(msg)
+
+    # session windows
+
+    def _expire_sessions(self, watermark):
+        """Remove and return the sessions that have seen a gap."""
+        discards = OrderedDict()
+
+        while self._expiry and self._expiry[0][0] <= watermark:
+            _, collection_key = heapq.heappop(self._expiry)
+
+            session = self._collections.get(collection_key)
+
+            if session is None:
+                continue
+
+            if session.last + self._gap_ms > watermark:
+                # more events have been added since this entry, check
+                # again when it is due.
+                heapq.heappush(self._expiry, (session.last + self._gap_ms, collection_key))
+                continue
+
+            discards[collection_key] = self._collections.pop(collection_key)
+
+            if self._sessions.get(session.group_by_key) == collection_key:
+                del self._sessions[session.group_by_key]
+
+        return discards
+
+    def _add_session_event(self, event):
+        """Add an event to the open session for its group, or a new one,
+        and emit the sessions per _emit_on."""
+
+        watermark = self._advance(event)
+
+        timestamp = event.timestamp_ms()
+        group_by_key = self._group_by(event)
+
+        discards = OrderedDict()
+
+        if self._emit_on == 'discard':
+            discards = self._expire_sessions(watermark)
+
+        collection_key = self._sessions.get(group_by_key)
+        session = self._collections.get(collection_key)
+
+        if session is not None and timestamp <= session.begin - self._gap_ms:
+            # from before the current session
+            if self._emit_on == 'discard':
+                # the earlier sessions have already been emitted
+                self._drop(event)
+                self.emit_collections(discards)
+                return
+
+            self._add_past_session_event(event, group_by_key)
+            return
+
+        if session is not None and timestamp >= session.last + self._gap_ms:
+            # the open session has ended
+            session = None
+
+        if session is None and self._emit_on == 'discard' and \
+                timestamp + self._gap_ms <= watermark:
+            # a session that would already have been closed
+            self._drop(event)
+            self.emit_collections(discards)
+            return
+
+        if session is None:
+            window_key = 'session-{0}'.format(timestamp)
+
+            collection_key = '{wk}::{gbk}'.format(wk=window_key, gbk=group_by_key) if \
+                group_by_key is not None else window_key
+
+            session = Capsule(
+                window_key=window_key,
+                group_by_key=group_by_key,
+                collection=self._collection_factory(),
+                begin=timestamp,
+                last=timestamp,
+            )
+
+            self._collections[collection_key] = session
+            self._sessions[group_by_key] = collection_key
+
+            heapq.heappush(self._expiry, (timestamp + self._gap_ms, collection_key))
+
+        session.collection = session.collection.add_event(event)
+        session.begin = min(session.begin, timestamp)
+        session.last = max(session.last, timestamp)
+
+        self._emit_session(self._sessions[group_by_key], discards)
+
+    def _add_past_session_event(self, event, group_by_key):
+        """Add an event from before the open session of its group to the
+        earlier session it falls in, or a new session of its own. Only
+        used when sessions are not discarded, so they are all still held."""
+        timestamp = event.timestamp_ms()
+
+        for key, session in list(self._collections.items()):
+            if session.group_by_key == group_by_key and \
+                    session.begin - self._gap_ms < timestamp < session.last + self._gap_ms:
+                collection_key = key
+                break
+        else:
+            window_key = 'session-{0}'.format(timestamp)
+
+            collection_key = '{wk}::{gbk}'.format(wk=window_key, gbk=group_by_key) if \
+                group_by_key is not None else window_key
+
+            session = Capsule(
+                window_key=window_key,
+                group_by_key=group_by_key,
+                collection=self._collection_factory(),
+                begin=timestamp,
+                last=timestamp,
+            )
+
+            # not the open session of the group, so not in _sessions
+            self._collections[collection_key] = session
+
+        session.collection = session.collection.add_event(event)
+        session.begin = min(session.begin, timestamp)
+        session.last = max(session.last, timestamp)
+
+        self._emit_session(collection_key, OrderedDict())
+
+    def _emit_session(self, collection_key, discards):
+        """Emit the sessions per _emit_on after an event was added to
+        the session collection_key."""
+        if self._emit_on == 'eachEvent':
+            self.emit_collections(self._collections)
+        elif self._emit_on == 'changed':
+            self._emit_changed([collection_key])
+        elif self._emit_on == 'discard':
+            self.emit_collections(discards)
+        elif self._emit_on == 'flush':
+            pass
+        else:
+            msg = 'Unknown emit type supplied to Collector'
+            raise PipelineIOException(msg)
+
 #
 # Output classes
 #
@@ -297,6 +756,8 @@ class CollectionOut(PipelineOut):
             Options(
                 window_type=pipeline.get_window_type(),
                 window_duration=pipeline.get_window_duration(),
+                window_slide=pipeline.get_window_slide(),
+                allowed_lateness=pipeline.get_allowed_lateness(),
                 group_by=pipeline.get_group_by(),
                 emit_on=pipeline.get_emit_on(),
             ),
@@ -349,6 +810,17 @@ class CollectionOut(PipelineOut):
         """
         self._callback = callback
 
+    def dropped_events(self):
+        """Number of events that arrived too late to be collected,
+        see Pipeline.allowed_lateness()
+
+        Returns
+        -------
+        int
+            Number of dropped events.
+        """
+        return self._collector.dropped_events()
+
     def flush(self):
         """Flush the collector and mark the results_done = True in the
         pipeline if there is no longer an observer.
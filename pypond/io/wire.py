@@ -0,0 +1,434 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Incremental reading and writing of the TimeSeries wire format.
+
+Both the regular JSON wire format::
+
+    {"name": "traffic", "columns": ["time", "value"], "points": [[...], ...]}
+
+and a newline delimited (NDJSON) variant where the first line holds the
+metadata and columns and every following line is a single point::
+
+    {"name": "traffic", "columns": ["time", "value"]}
+    [1400425947000, 52]
+    [1400425948000, 18]
+
+are supported. Neither the reader or the writer hold more than a chunk
+of points in memory at a time.
+"""
+
+import json
+
+from ..bases import PypondBase
+from ..event import Event
+from ..exceptions import PipelineIOException
+from ..index import Index
+from ..indexed_event import IndexedEvent
+from ..series import TimeSeries
+from ..timerange_event import TimeRangeEvent
+from ..util import ObjectEncoder
+
+_WHITESPACE = ' \t\n\r'
+
+
+class WireReader(PypondBase):
+    """
+    Read the wire format from a file-like object a chunk at a time.
+
+    The file is parsed incrementally so only the points in the current
+    chunk are held in memory. The columns need to come before the points
+    in the file (as they do in files made by WireWriter) otherwise the
+    points are held until the columns are found.
+
+    ::
+
+        with open('traffic.json') as fh:
+            reader = WireReader(fh)
+            for event in reader.events():
+                do_stuff(event)
+
+    Parameters
+    ----------
+    fileobj : file
+        A file-like object (text mode) with a read() method.
+    ndjson : bool, optional
+        The file is in the newline delimited format.
+    chunk_size : int, optional
+        Number of points in each chunk produced by chunks()
+    read_size : int, optional
+        Number of characters to read from the file at a time.
+    """
+
+    def __init__(self, fileobj, ndjson=False, chunk_size=10000, read_size=65536):
+        """Create the reader."""
+        super(WireReader, self).__init__()
+
+        self._file = fileobj
+        self._ndjson = ndjson
+        self._chunk_size = chunk_size
+        self._read_size = read_size
+
+        self._meta = dict()
+        self._columns = None
+
+        # parser state
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def meta(self):
+        """The metadata (name, etc) of the series that has been read so far.
+
+        Returns
+        -------
+        dict
+            Metadata.
+        """
+        return self._meta
+
+    def columns(self):
+        """The columns of the series if they have been read yet.
+
+        Returns
+        -------
+        list
+            The columns, the first is the event type.
+        """
+        return self._columns
+
+    # parsing
+
+    def _fill(self):
+        """Read more from the file, returns False at the end of the file."""
+        data = self._file.read(self._read_size)
+
+        if not data:
+            self._eof = True
+            return False
+
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+
+        return True
+
+    def _peek(self):
+        """Skip whitespace and return the next character."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+
+            if self._pos < len(self._buf) or not self._fill():
+                break
+
+        return self._buf[self._pos] if self._pos < len(self._buf) else ''
+
+    def _expect(self, char):
+        """Consume the next character, which should be char."""
+        found = self._peek()
+
+        if found != char:
+            msg = 'malformed wire format, expected {0} got {1}'.format(
+                char, found or 'end of file')
+            raise PipelineIOException(msg)
+
+        self._pos += 1
+
+    def _value(self):
+        """Decode the next complete JSON value."""
+        self._peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # a value at the very end of the buffer (ie: a number)
+                # might be continued in the next read.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._eof:
+                    raise PipelineIOException('malformed or truncated wire format')
+
+            self._fill()
+
+    def _json_points(self):
+        """Generator for the points in the regular JSON format."""
+        self._expect('{')
+
+        if self._peek() == '}':
+            return
+
+        while True:
+            key = self._value()
+            self._expect(':')
+
+            if key == 'points':
+                self._expect('[')
+
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+
+                        if self._peek() == ',':
+                            self._pos += 1
+                        else:
+                            self._expect(']')
+                            break
+
+            elif key == 'columns':
+                self._columns = self._value()
+            else:
+                self._meta[key] = self._value()
+
+            if self._peek() == ',':
+                self._pos += 1
+            else:
+                self._expect('}')
+                break
+
+    def _ndjson_points(self):
+        """Generator for the points in the newline delimited format."""
+        for line in self._file:
+            line = line.strip()
+
+            if not line:
+                continue
+
+            try:
+                value = json.loads(line)
+            except ValueError:
+                raise PipelineIOException('malformed line: {0}'.format(line))
+
+            if isinstance(value, dict):
+                self._columns = value.pop('columns', self._columns)
+                self._meta.update(value)
+            else:
+                yield value
+
+    def points(self):
+        """Generator for the raw points as they are read.
+
+        Returns
+        -------
+        iterator
+            Lists of values in column order.
+        """
+        return self._ndjson_points() if self._ndjson else self._json_points()
+
+    def chunks(self):
+        """Generator for collections of up to chunk_size events.
+
+        Returns
+        -------
+        iterator
+            Collection objects.
+
+        Raises
+        ------
+        PipelineIOException
+            Raised if there are points, but no columns.
+        """
+        points = list()
+
+        for i in self.points():
+            points.append(i)
+
+            if len(points) >= self._chunk_size and self._columns is not None:
+                yield TimeSeries.collection_from_wire(self._columns, points)
+                points = list()
+
+        if points:
+            if self._columns is None:
+                raise PipelineIOException('wire format has points but no columns')
+
+            yield TimeSeries.collection_from_wire(self._columns, points)
+
+    def events(self):
+        """Generator for the events as they are read.
+
+        Returns
+        -------
+        iterator
+            Event objects.
+        """
+        for chunk in self.chunks():
+            for i in chunk.events():
+                yield i
+
+    def to_stream(self, stream):
+        """Feed the events to a Stream as they are read.
+
+        Parameters
+        ----------
+        stream : Stream
+            Input stream of a pipeline.
+        """
+        for i in self.events():
+            stream.add_event(i)
+
+    def to_series(self):
+        """Read everything and make a TimeSeries - note that this
+        holds all of the points in memory at once.
+
+        Returns
+        -------
+        TimeSeries
+            The series.
+        """
+        points = list(self.points())
+
+        wire = dict(self._meta)
+        wire['columns'] = self._columns or ['time']
+        wire['points'] = points
+
+        return TimeSeries(wire)
+
+
+class WireWriter(PypondBase):
+    """
+    Write the wire format to a file-like object one event at a time.
+
+    Can write a whole TimeSeries with write_series(), or the add_event()
+    method can be used as the callback for pipeline output::
+
+        with open('out.json', 'w') as fh:
+            with WireWriter(fh, name='rollup') as writer:
+                Pipeline() ... .to(EventOut, writer.add_event)
+
+    If columns are not given, they are taken from the data of the first
+    event. Events need to all be of the same type and values in columns
+    not in the column list are dropped.
+
+    Parameters
+    ----------
+    fileobj : file
+        A file-like object (text mode) with a write() method.
+    columns : list, optional
+        Data columns to write (not including time/index/timerange)
+    ndjson : bool, optional
+        Write the newline delimited format.
+    **meta
+        Metadata (name, etc) to write with the series.
+    """
+
+    _type_columns = {
+        Event: 'time',
+        TimeRangeEvent: 'timerange',
+        IndexedEvent: 'index',
+    }
+
+    def __init__(self, fileobj, columns=None, ndjson=False, **meta):
+        """Create the writer."""
+        super(WireWriter, self).__init__()
+
+        self._file = fileobj
+        self._columns = list(columns) if columns is not None else None
+        self._ndjson = ndjson
+        self._meta = meta
+
+        self._header = None
+        self._count = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_header(self, type_column):
+        """Write out the metadata and columns."""
+        self._header = [type_column] + (self._columns or list())
+
+        meta = dict(self._meta)
+        meta['columns'] = self._header
+
+        if isinstance(meta.get('index'), Index):
+            meta['index'] = meta.get('index').to_string()
+
+        if self._ndjson:
+            self._file.write(json.dumps(meta, cls=ObjectEncoder) + '\n')
+        else:
+            self._file.write('{')
+
+            for k, v in list(meta.items()):
+                self._file.write('{0}: {1}, '.format(
+                    json.dumps(k), json.dumps(v, cls=ObjectEncoder)))
+
+            self._file.write('"points": [')
+
+    def add_event(self, event):
+        """Write an event as a point.
+
+        Parameters
+        ----------
+        event : Event
+            An Event, IndexedEvent or TimeRangeEvent.
+
+        Raises
+        ------
+        PipelineIOException
+            Raised if the writer has been closed or the event
+            is the wrong type.
+        """
+        if self._closed:
+            raise PipelineIOException('can not write to a closed WireWriter')
+
+        type_column = self._type_columns.get(event.type())
+
+        if self._header is None:
+            if self._columns is None:
+                self._columns = list(event.data().keys())
+            self._write_header(type_column)
+        elif type_column != self._header[0]:
+            raise PipelineIOException('Homogeneous events expected')
+
+        point = json.dumps(event.to_point(self._header[1:]), cls=ObjectEncoder)
+
+        if self._ndjson:
+            self._file.write(point + '\n')
+        else:
+            self._file.write(('\n' if not self._count else ',\n') + point)
+
+        self._count += 1
+
+    def write_series(self, series):
+        """Write the metadata and events of a TimeSeries.
+
+        Parameters
+        ----------
+        series : TimeSeries
+            The series.
+        """
+        meta = series.meta()
+        meta.update(self._meta)
+        self._meta = meta
+
+        if self._columns is None:
+            self._columns = series.columns()
+
+        for i in series.events():
+            self.add_event(i)
+
+    def close(self):
+        """Finish writing the series. This does not close fileobj."""
+        if self._closed:
+            return
+
+        if self._header is None:
+            self._write_header('time')
+
+        if not self._ndjson:
+            self._file.write('\n]}\n')
+
+        self._closed = True
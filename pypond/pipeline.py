@@ -15,11 +15,17 @@ Implementation of the Pond Pipeline classes.
 http://software.es.net/pond/#/pipeline
 """
 
+import multiprocessing
+
+from collections import OrderedDict
+from itertools import islice
+
 from pyrsistent import pmap
 
 from .bases import PypondBase
 from .event import Event
 from .exceptions import PipelineException, PipelineWarning
+from .index import Index
 from .indexed_event import IndexedEvent
 from .io.input import Bounded, Stream
 from .io.output import CollectionOut, EventOut
@@ -30,6 +36,7 @@ from .processor import (
     Converter,
     Filler,
     Filter,
+    Fused,
     Mapper,
     Offset,
     Processor,
@@ -42,6 +49,53 @@ from .timerange_event import TimeRangeEvent
 from .util import is_pmap, Options, is_function, Capsule
 
 
+def _process_chain(pline):
+    """The processors leading to the end of a pipeline.
+
+    Parameters
+    ----------
+    pline : Pipeline
+        The pipeline.
+
+    Returns
+    -------
+    list
+        The processors from the last back to the first, followed by the
+        input. Empty if the pipeline has no processors.
+    """
+    if pline.last() is None:
+        return list()
+
+    return pline.last().chain()
+
+
+def _branch_points(process_chains):
+    """Processors where process chains that share their upstream part
+    go separate ways - ie: the processors feeding more than one
+    downstream processor or output.
+
+    Parameters
+    ----------
+    process_chains : list
+        Lists of processors as returned by _process_chain()
+
+    Returns
+    -------
+    set
+        The id() of each branch point.
+    """
+    downstream = dict()
+
+    for idx, chain in enumerate(process_chains):
+        after = ('out', idx)
+
+        for i in chain:
+            downstream.setdefault(id(i), set()).add(after)
+            after = id(i)
+
+    return set(k for k, v in list(downstream.items()) if len(v) > 1)
+
+
 class Runner(PypondBase):  # pylint: disable=too-few-public-methods
     """
     A runner is used to extract the chain of processing operations
@@ -74,6 +128,15 @@ class Runner(PypondBase):  # pylint: disable=too-few-public-methods
           a time series has a TimeSeries.merge() static method for
           this purpose.
 
+    Runs of consecutive processors that do not hold state between
+    events (map, filter, select, etc) are fused into a single stage
+    of the execution chain, see Fused.
+
+    Events are fed into the execution chain chunk_size at a time.
+    Processors that do not hold state between events (map, filter,
+    select, etc) handle a whole chunk in one call, the others
+    handle the events one at a time.
+
     Parameters
     ----------
     pipeline : Pipeline
@@ -82,7 +145,9 @@ class Runner(PypondBase):  # pylint: disable=too-few-public-methods
         The output driving this runner
     """
 
-    def __init__(self, pline, output):
+    chunk_size = 1000
+
+    def __init__(self, pline, output, shared=None, branches=None):
         """Create a new batch runner"""
         super(Runner, self).__init__()
 
@@ -93,6 +158,11 @@ class Runner(PypondBase):  # pylint: disable=too-few-public-methods
         self._input = None
         self._execution_chain = list()
 
+        # the clones of processors shared with other runners
+        # (see Pipeline.to_many())
+        self._shared = shared
+        self._branches = branches or set()
+
         # We use the pipeline's chain() function to walk the
         # DAG back up the tree to the "in" to:
         # 1) assemble a list of process nodes that feed into
@@ -102,11 +172,10 @@ class Runner(PypondBase):  # pylint: disable=too-few-public-methods
         # NOTE: we do not currently support merging, so this is
         # a linear chain.
 
-        process_chain = list()
+        self._process_chain = _process_chain(self._pipeline)
 
-        if self._pipeline.last() is not None:
-            process_chain = self._pipeline.last().chain()
-            self._input = process_chain[0].pipeline().input()
+        if self._process_chain:
+            self._input = self._process_chain[0].pipeline().input()
         else:
             self._input = self._pipeline.input()
 
@@ -116,17 +185,106 @@ class Runner(PypondBase):  # pylint: disable=too-few-public-methods
         # processing pipeline. We run this execution chain later by
         # evoking start().
 
-        self._execution_chain = [self._output]
+        self._execution_chain = self._build_chain(self._output)
+
+    def _fused_chain(self):
+        """The process chain with each run of stateless processors
+        fused into a single processor, as (key, processor) tuples where
+        the key identifies the processor(s) from the pipeline. A run is
+        not fused across a branch point so the upstream part can
+        be shared."""
+        fused_chain = list()
+        run = list()
+
+        def end_run():
+            """add the current run to the chain."""
+            if len(run) > 1:
+                # the chain runs from the output back to the input
+                fused_chain.append((tuple(id(i) for i in run), Fused(run[::-1])))
+            else:
+                fused_chain.extend(((id(i),), i) for i in run)
+
+            del run[:]
 
-        prev = self._output
+        for i in self._process_chain:
+            if not isinstance(i, Processor) or i.fused_step() is None or \
+                    id(i) in self._branches:
+                end_run()
 
-        for i in process_chain:
+            if isinstance(i, Processor) and i.fused_step() is not None:
+                run.append(i)
+            else:
+                fused_chain.append(((id(i),), i))
+
+        end_run()
+
+        return fused_chain
+
+    def _build_chain(self, output):
+        """Clone the processors and link them together, ending in output.
+        Processors that have already been cloned for another runner
+        sharing this one's upstream are reused."""
+        execution_chain = [output]
+
+        prev = output
+
+        for key, i in self._fused_chain():
             if isinstance(i, Processor):
-                processor = i.clone()
+                processor = self._shared.get(key) if self._shared is not None else None
+                linked = processor is not None
+
+                if processor is None:
+                    processor = i.clone()
+
+                    if self._shared is not None:
+                        self._shared[key] = processor
+
                 if prev is not None:
                     processor.add_observer(prev)
-                    self._execution_chain.append(processor)
-                    prev = processor
+                    # upstream of a shared processor is already linked.
+                    prev = None if linked else processor
+
+                execution_chain.append(processor)
+
+        return execution_chain
+
+    def _count_dropped(self, execution_chain):
+        """Have the pipeline report the late events dropped by the
+        aggregators and output of an execution chain."""
+        # pylint: disable=protected-access
+        self._pipeline._dropped = [
+            i.dropped_events for i in execution_chain if hasattr(i, 'dropped_events')
+        ]
+
+    def head(self):
+        """The first processor of the execution chain (or the output if
+        there are no processors).
+
+        Returns
+        -------
+        Processor or PipelineOut
+            Where the events from the input go.
+        """
+        return self._execution_chain[-1]
+
+    def _feed(self, heads):
+        """Add each event from the input to the heads."""
+        # the stateless processors handle a chunk of events at a
+        # time, which saves a call per event at each step of the chain.
+        events = iter(self._input.events())
+        chunk = list(islice(events, self.chunk_size))
+
+        while chunk:
+            for head in heads:
+                add_events = getattr(head, 'add_events', None)
+
+                if add_events is not None:
+                    add_events(chunk)
+                else:
+                    for i in chunk:
+                        head.add_event(i)
+
+            chunk = list(islice(events, self.chunk_size))
 
     def start(self, force=False):
         """Start the runner
@@ -143,9 +301,11 @@ class Runner(PypondBase):  # pylint: disable=too-few-public-methods
         # To process the source through the execution chain we add
         # each event from the input to the head.
 
+        self._count_dropped(self._execution_chain)
+
         head = self._execution_chain.pop()
-        for i in self._input.events():
-            head.add_event(i)
+
+        self._feed([head])
 
         # The runner indicates that it is finished with the bounded
         # data by sending a flush() call down the chain. If force is
@@ -156,6 +316,209 @@ class Runner(PypondBase):  # pylint: disable=too-few-public-methods
             head.flush()
 
 
+# the runner, partitions and flush flag of a ParallelRunner - set before
+# the worker processes are forked so they do not need to be pickled.
+_PARALLEL = None
+
+
+def _run_bucket(bucket):
+    """Process a bucket of partitions in a worker process."""
+    runner, partitions, force = _PARALLEL
+    # pylint: disable=protected-access
+    return runner._run_partitions([(i, partitions[i]) for i in bucket], force)
+
+
+class ParallelRunner(Runner):  # pylint: disable=too-few-public-methods
+    """
+    A runner that processes the groups of a group_by() pipeline over a
+    bounded source in parallel.
+
+    The events of the source are partitioned by the group_by key and each
+    partition is run through its own clone of the execution chain in a pool
+    of worker processes. The output of the partitions is then handed to the
+    output ordered by the source event that triggered it, then by the order
+    in which the groups were first seen. That is the serial order for per
+    event processing (ie: take()), but output that is emitted together
+    (at a flush, or when a window is discarded) can be in a different
+    order across groups. The results are the same.
+
+    The group_by key is applied to the source events, so every processor
+    in the pipeline needs to be after the group_by() (and not change the
+    fields the key is made from). Windowed output (an aggregate() or a
+    CollectionOut) also needs to be emitted on 'discard', 'flush' or
+    'changed' - with 'eachEvent' every event re-emits the collections of
+    every group, which a partition can not know about. align(), fill()
+    and rate() carry the previous event over from one group to the next,
+    so they can not be partitioned either. If any of that is not the case,
+    or the platform can not fork processes, a PipelineWarning is issued
+    and the pipeline is run serially.
+
+    Parameters
+    ----------
+    pipeline : Pipeline
+        The pipeline to run.
+    output : PipelineOut
+        The output driving this runner
+    workers : int, optional
+        Number of worker processes, defaults to the number of CPUs.
+    """
+
+    def __init__(self, pline, output, workers=None):
+        """Create a new parallel batch runner"""
+        super(ParallelRunner, self).__init__(pline, output)
+
+        self._workers = workers or multiprocessing.cpu_count()
+        self._size = 0
+
+    def _group_by(self):
+        """The group_by function shared by all of the processors, or None."""
+        group_by = set(
+            i.pipeline().get_group_by() for i in self._process_chain
+            if isinstance(i, Processor)
+        )
+
+        group_by.add(self._pipeline.get_group_by())
+
+        if len(group_by) != 1 or default_callback in group_by:
+            return None
+
+        return group_by.pop()
+
+    def _ungrouped(self):
+        """Is there a processor that keeps state across all of its
+        events regardless of the group_by (ie: the previous event)."""
+        return any(isinstance(i, (Align, Filler, Rate)) for i in self._process_chain)
+
+    def _emits_each_event(self):
+        """Is there a collector (in an aggregator or the output) that
+        emits all of its collections on each event."""
+        pipelines = [
+            i.pipeline() for i in self._process_chain if isinstance(i, Aggregator)
+        ]
+
+        if isinstance(self._output, CollectionOut):
+            pipelines.append(self._pipeline)
+
+        return any(i.get_emit_on() == 'eachEvent' for i in pipelines)
+
+    def _run_partitions(self, partitions, force):
+        """Run each partition through a new execution chain and record
+        the output along with the position of the source event that
+        triggered it, and the number of late events dropped."""
+        results = list()
+        dropped = 0
+
+        for rank, events in partitions:
+            trigger = [None]
+
+            def record(*args):
+                """the output callback."""
+                results.append((trigger[0], rank, len(results), args))  # pylint: disable=cell-var-from-loop
+
+            # pylint: disable=protected-access
+            output = type(self._output)(self._pipeline, record, self._output._options)
+
+            chain = self._build_chain(output)
+            head = chain.pop()
+
+            for pos, event in events:
+                trigger[0] = pos
+                head.add_event(event)
+
+            if force is True:
+                trigger[0] = self._size
+                head.flush()
+
+            dropped += sum(i.dropped_events() for i in chain + [head]
+                           if hasattr(i, 'dropped_events'))
+
+        return results, dropped
+
+    def start(self, force=False):
+        """Start the runner
+
+        Args:
+            force (bool, optional): force Flush at the end of the batch source
+            to cause any buffers to emit.
+        """
+        global _PARALLEL  # pylint: disable=global-statement
+
+        self._log('ParallelRunner.start', 'starting')
+
+        group_by = self._group_by()
+
+        if group_by is None:
+            self._warn(
+                'parallel execution needs every processor to be after the group_by()'
+                ' - running serially', PipelineWarning)
+            return super(ParallelRunner, self).start(force)
+
+        if self._ungrouped():
+            self._warn(
+                'parallel execution can not partition align(), fill() or rate()'
+                ' by the group_by() - running serially', PipelineWarning)
+            return super(ParallelRunner, self).start(force)
+
+        if self._emits_each_event():
+            self._warn(
+                "parallel execution of windows needs emit_on('discard'), 'flush'"
+                " or 'changed' - running serially", PipelineWarning)
+            return super(ParallelRunner, self).start(force)
+
+        try:
+            context = multiprocessing.get_context('fork')
+        except (AttributeError, ValueError):
+            # no get_context() before python 3.4
+            self._warn(
+                'parallel execution needs to be able to fork - running serially',
+                PipelineWarning)
+            return super(ParallelRunner, self).start(force)
+
+        self._pipeline.clear_results()
+
+        partitions = OrderedDict()
+
+        for pos, event in enumerate(self._input.events()):
+            partitions.setdefault(group_by(event), list()).append((pos, event))
+            self._size = pos + 1
+
+        partitions = list(partitions.values())
+
+        workers = min(self._workers, len(partitions))
+
+        if workers < 2:
+            results, dropped = self._run_partitions(list(enumerate(partitions)), force)
+        else:
+            buckets = [list(range(i, len(partitions), workers)) for i in range(workers)]
+
+            _PARALLEL = (self, partitions, force)
+
+            try:
+                pool = context.Pool(workers)
+                try:
+                    results = list()
+                    dropped = 0
+                    for i, count in pool.map(_run_bucket, buckets):
+                        results.extend(i)
+                        dropped += count
+                finally:
+                    pool.terminate()
+            finally:
+                _PARALLEL = None
+
+        self._pipeline._dropped = [lambda: dropped]  # pylint: disable=protected-access
+
+        # hand the output over in order.
+        emit = self._output._collector_callback if isinstance(self._output, CollectionOut) \
+            else self._output.add_event  # pylint: disable=protected-access
+
+        for _, _, _, args in sorted(results, key=lambda x: x[:3]):
+            emit(*args)
+
+        if force is True:
+            self._output.flush()
+
+
 def default_callback(*args):  # pylint: disable=unused-argument
     """Default no-op callback for group_by in the Pipeline constructor."""
     return None
@@ -205,6 +568,9 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
                     group_by=default_callback,
                     window_type='global',
                     window_duration=None,
+                    window_slide=None,
+                    allowed_lateness=None,
+                    workers=None,
                     emit_on='eachEvent',
                     utc=True,
                 )
@@ -213,6 +579,9 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
         self._results = list()
         self._results_done = False
 
+        # the counts of late events dropped by the last to()
+        self._dropped = list()
+
     # Accessors to the current Pipeline state
 
     def input(self):
@@ -269,6 +638,48 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
         """
         return self._d.get('window_duration')
 
+    def get_window_slide(self):
+        """Get how far a sliding window advances.
+
+        Returns
+        -------
+        str
+            A formatted duration, None if not a sliding window.
+        """
+        return self._d.get('window_slide')
+
+    def get_allowed_lateness(self):
+        """Get how late events can be before they are dropped.
+
+        Returns
+        -------
+        str
+            A formatted duration, or None.
+        """
+        return self._d.get('allowed_lateness')
+
+    def dropped_events(self):
+        """Number of events that arrived too late to be aggregated (see
+        allowed_lateness()) - in the last batch run of the pipeline, or
+        since to() was called for a streaming pipeline.
+
+        Returns
+        -------
+        int
+            Number of dropped events.
+        """
+        return sum(i() for i in self._dropped)
+
+    def get_workers(self):
+        """Get the number of worker processes for a parallel batch run.
+
+        Returns
+        -------
+        int
+            Number of processes, or None to run serially.
+        """
+        return self._d.get('workers')
+
     def get_group_by(self):
         """Get the group by callback.
 
@@ -411,6 +822,8 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
         types are:
 
         * fixed (e.g. every 5m)
+        * sliding (e.g. the last 5m, every 10s)
+        * session (e.g. until there is a 5m gap between events)
         * calendar based windows (e.g. every month)
 
         Windows are a type of grouping. Typically you'd define a window
@@ -421,9 +834,30 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
         There are several ways to define a window. The general format is
         an options object containing a `type` field and a `duration` field.
 
-        Currently the only accepted type is `fixed`, but others are planned.
-        For duration, this is a duration string, for example "30s" or "1d".
-        Supported are: seconds (s), minutes (m), hours (h) and days (d).
+        The accepted types are `fixed`, `sliding` and `session`. For duration, this is
+        a duration string, for example "30s" or "1d". Supported are:
+        seconds (s), minutes (m), hours (h) and days (d).
+
+        A sliding window also needs a `slide` duration, which is how far
+        the window advances each time. The duration must be a multiple
+        of the slide::
+
+            Capsule(type='sliding', duration='5m', slide='10s')
+
+        Sliding windows overlap, so each event is part of duration / slide
+        windows. The Collector keeps a partial collection (or set of
+        accumulators) for each slide-sized pane and combines the panes
+        of a window when it is emitted. Aggregations over sliding
+        windows emit TimeRangeEvents covering the window.
+
+        A session window has a `gap` duration rather than a duration.
+        A session (for each group_by key) lasts until there is a gap
+        of at least that long between events::
+
+            Capsule(type='session', gap='5m')
+
+        Aggregations over session windows emit TimeRangeEvents covering
+        the events in the session.
 
         The argument here is either a string or an object with string
         attrs type and duration. The arg can be either a window or a duration.
@@ -488,7 +922,28 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
             w_type = 'global'
             duration = None
 
-        new_d = self._d.update(dict(window_type=w_type, window_duration=duration, utc=utc))
+        slide = None
+
+        if w_type == 'session':
+            duration = window_or_duration.gap
+
+            if not Index.window_duration(duration or ''):
+                msg = 'session window needs a gap duration, got: {0}'.format(duration)
+                raise PipelineException(msg)
+
+        if w_type == 'sliding':
+            slide = window_or_duration.slide
+
+            duration_ms = Index.window_duration(duration or '')
+            slide_ms = Index.window_duration(slide or '')
+
+            if not duration_ms or not slide_ms or duration_ms % slide_ms:
+                msg = 'sliding window duration must be a multiple of the slide, '
+                msg += 'got duration: {0} slide: {1}'.format(duration, slide)
+                raise PipelineException(msg)
+
+        new_d = self._d.update(
+            dict(window_type=w_type, window_duration=duration, window_slide=slide, utc=utc))
 
         self._log(
             'Pipeline.window_by',
@@ -595,15 +1050,21 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
 
         * "eachEvent" - when a new event comes in, all currently maintained
           collections will emit their result.
+        * "changed" - when a new event comes in, only the collection(s) that
+          the event was added to will emit their result. Every emitted
+          collection comes with its window and group by keys, so keeping
+          the latest result for each pair gives the same current view as
+          "eachEvent" without re-emitting the collections that did not
+          change.
         * "discard" - when a collection is to be discarded, first it will
           emit. But only then.
         * "flush" - when a flush signal is received.
 
         The difference will depend on the output you want, how often
         you want to get updated, and if you need to get a partial state.
-        There's currently no support for late data or watermarks. If an
-        event passes comes in after a collection window, that collection
-        is considered finished.
+        By default, if an event comes in after a fixed collection window,
+        that collection is considered finished. See allowed_lateness()
+        for windows that are closed by a watermark instead.
 
 
         Parameters
@@ -619,6 +1080,84 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
         new_d = self._d.set('emit_on', trigger)
         return Pipeline(new_d)
 
+    def allowed_lateness(self, lateness):
+        """
+        Sets how far out of order events can arrive when windows are
+        emitted with emit_on('discard'). Returns a new Pipeline.
+
+        The Collector tracks a watermark - the latest timestamp it has seen
+        less the allowed lateness - and a window is kept open, taking
+        events that arrive late, until the watermark passes its end. So
+        only the windows within the allowed lateness are held in memory.
+        Events for windows that have already been closed are dropped
+        and counted, see dropped_events().
+
+        This applies to fixed, sliding and session windows. Sliding and
+        session windows always use a watermark, with no lateness if this
+        is not set.
+
+        Parameters
+        ----------
+        lateness : str
+            A duration string, for example "5s", or None to close fixed
+            windows when the next window opens.
+
+        Returns
+        -------
+        Pipeline
+            The Pipeline
+
+        Raises
+        ------
+        PipelineException
+            Raised if lateness is not a duration.
+        """
+        if lateness is not None and Index.window_duration(lateness) is None:
+            msg = 'allowed lateness must be a duration string, got: {0}'.format(lateness)
+            raise PipelineException(msg)
+
+        new_d = self._d.set('allowed_lateness', lateness)
+        return Pipeline(new_d)
+
+    def parallel(self, workers=None):
+        """
+        Run a batch pipeline that uses group_by() in parallel. Returns a
+        new Pipeline.
+
+        The events of the source are partitioned by the group_by key and
+        the partitions are processed by a pool of worker processes - see
+        ParallelRunner. The results are the same as for a serial run::
+
+            (
+                Pipeline()
+                .from_source(timeseries)
+                .group_by('interface')
+                .window_by('5m')
+                .emit_on('discard')
+                .aggregate({'in_avg': {'in': Functions.avg()}})
+                .parallel(8)
+                .to_keyed_collections()
+            )
+
+        Windows need to be emitted on 'discard', 'flush' or 'changed',
+        with the default 'eachEvent' the pipeline is run serially.
+
+        This has no effect on a streaming pipeline.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes, defaults to the number of CPUs.
+            Use 1 to run serially.
+
+        Returns
+        -------
+        Pipeline
+            The Pipeline
+        """
+        new_d = self._d.set('workers', workers or multiprocessing.cpu_count())
+        return Pipeline(new_d)
+
     # I/O
 
     def from_source(self, src):
@@ -744,7 +1283,8 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
         out = Out(self, observer, options)
 
         if self.mode() == 'batch':
-            runner = Runner(self, out)
+            runner = ParallelRunner(self, out, self.get_workers()) \
+                if self.get_workers() and self.get_workers() > 1 else Runner(self, out)
             runner.start(True)
             if self._results_done and observer is None:
                 return self._results
@@ -760,8 +1300,116 @@ class Pipeline(PypondBase):  # pylint: disable=too-many-public-methods
             else:
                 self.input().add_observer(out)
 
+            self._dropped = [
+                i.dropped_events for i in _process_chain(self) + [out]
+                if hasattr(i, 'dropped_events')
+            ]
+
         return self
 
+    @staticmethod
+    def to_many(outputs):
+        """
+        Sets up the destination sinks for several pipelines at once -
+        typically pipelines that branch off the same base pipeline.
+
+        In batch mode, pipelines with the same source are run together:
+        the source is read once and the processors the pipelines have in
+        common are only run once, feeding each of the branches. For example
+        a 5 minute and an hourly rollup of the same rate calculation::
+
+            rates = Pipeline().from_source(timeseries).rate('in')
+
+            Pipeline.to_many([
+                (rates.window_by('5m').aggregate(rollup), EventOut, five_minute_cback),
+                (rates.window_by('1h').aggregate(rollup), EventOut, hourly_cback),
+            ])
+
+        Pipelines with a Stream source already share their processors,
+        so they are connected with to().
+
+        The pipelines are run serially, parallel() has no effect here
+        (a PipelineWarning is issued for pipelines that use it).
+
+        Parameters
+        ----------
+        outputs : list
+            (pipeline, out, observer) or (pipeline, out, observer, options)
+            tuples, the same args as to()
+
+        Returns
+        -------
+        list
+            For each output, the results (as returned by to()) if no
+            observer was given, otherwise None.
+
+        Raises
+        ------
+        PipelineException
+            Raised if a pipeline has no input.
+        """
+        # pylint: disable=protected-access
+
+        runners = list()
+        results = [None] * len(outputs)
+        batch = list()
+        originals = list()
+
+        for idx, output in enumerate(outputs):
+            pline, out, observer = output[:3]
+            options = output[3] if len(output) > 3 else Options()
+
+            if pline.input() is None:
+                msg = 'Tried to eval pipeline without a In. Missing from() in chain?'
+                raise PipelineException(msg)
+
+            if pline.mode() == 'batch':
+                if pline.get_workers() and pline.get_workers() > 1:
+                    pline._warn(
+                        'parallel() is not supported by to_many() - running serially',
+                        PipelineWarning)
+
+                # a copy of the pipeline (with the same processors) so each
+                # output collects its own results.
+                originals.append(pline)
+                pline = Pipeline(pline)
+                batch.append((idx, pline, out(pline, observer, options), observer))
+            else:
+                pline.to(out, observer, options)
+
+        shared = dict()
+        branches = _branch_points([_process_chain(i[1]) for i in batch])
+
+        for (_, pline, out, _), original in zip(batch, originals):
+            runner = Runner(pline, out, shared, branches)
+            runner._count_dropped(runner._execution_chain)
+            original._dropped = pline._dropped
+            runners.append(runner)
+
+        # the runners reading each source
+        sources = OrderedDict()
+
+        for runner in runners:
+            sources.setdefault(id(runner._input), list()).append(runner)
+
+        for _, pline, _, _ in batch:
+            pline.clear_results()
+
+        for group in list(sources.values()):
+            heads = list(OrderedDict((id(i.head()), i.head()) for i in group).values())
+
+            # read the source once, then flush each branch once.
+            group[0]._feed(heads)
+
+            for head in heads:
+                head.flush()
+
+        for idx, pline, _, observer in batch:
+            if pline._results_done and observer is None:
+                results[idx] = pline._results
+
+        return results
+
     def count(self, observer, force=True):
         """
         Outputs the count of events.
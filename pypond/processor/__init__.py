@@ -19,6 +19,7 @@ from .collapser import Collapser
 from .converter import Converter
 from .filler import Filler
 from .filter import Filter
+from .fused import Fused
 from .mapper import Mapper
 from .offset import Offset
 from .rate import Rate
@@ -11,6 +11,7 @@ Processor that adds events to collector given windowing and grouping options.
 """
 
 from .base import Processor
+from ..accumulator import is_incremental, WindowAccumulator
 from ..exceptions import ProcessorException
 from ..indexed_event import IndexedEvent
 from ..io.output import Collector
@@ -25,6 +26,16 @@ class Aggregator(Processor):
     emitted from the Collector it is aggregated into a new event
     and emitted from this Processor.
 
+    If all of the aggregation functions have incremental versions
+    (see pypond.accumulator) the Collector is set up to feed each
+    event to a set of accumulators rather than keeping the events
+    in a Collection, so updating a window and emitting the result are
+    O(1) rather than O(n) in the number of events in the window.
+
+    Sliding windows emit a TimeRangeEvent covering the window and session
+    windows emit a TimeRangeEvent covering the events in the session,
+    rather than an IndexedEvent.
+
     Parameters
     ----------
     arg1 : Aggregator or Pipeline
@@ -43,6 +54,8 @@ class Aggregator(Processor):
         self._fields = None
         self._window_type = None
         self._window_duration = None
+        self._window_slide = None
+        self._allowed_lateness = None
         self._group_by = None
         self._emit_on = None
         self._utc = None
@@ -53,6 +66,8 @@ class Aggregator(Processor):
             self._fields = arg1._fields
             self._window_type = arg1._window_type
             self._window_duration = arg1._window_duration
+            self._window_slide = arg1._window_slide
+            self._allowed_lateness = arg1._allowed_lateness
             self._group_by = arg1._group_by
             self._emit_on = arg1._emit_on
             self._utc = arg1._utc
@@ -64,6 +79,8 @@ class Aggregator(Processor):
 
             self._window_type = pipeline.get_window_type()
             self._window_duration = pipeline.get_window_duration()
+            self._window_slide = pipeline.get_window_slide()
+            self._allowed_lateness = pipeline.get_allowed_lateness()
             self._group_by = pipeline.get_group_by()
             self._emit_on = pipeline.get_emit_on()
             self._utc = pipeline.get_utc()
@@ -100,17 +117,43 @@ class Aggregator(Processor):
             msg = 'Unknown arg to Aggregator: {0}'.format(arg1)
             raise ProcessorException(msg)
 
+        collection_factory = None
+
+        if self._incremental():
+            collection_factory = self._window_accumulator
+
         self._collector = Collector(
             Options(
                 window_type=self._window_type,
                 window_duration=self._window_duration,
+                window_slide=self._window_slide,
+                allowed_lateness=self._allowed_lateness,
                 group_by=self._group_by,
                 emit_on=self._emit_on,
                 utc=self._utc,
+                collection_factory=collection_factory,
             ),
             self._collector_callback
         )
 
+    def _incremental(self):
+        """Check if all of the aggregation functions can be
+        calculated incrementally."""
+        for field_map in list(self._fields.values()):
+            if len(field_map) != 1:
+                # let the callback raise the error
+                return False
+
+            for func in list(field_map.values()):
+                if not is_incremental(func):
+                    return False
+
+        return True
+
+    def _window_accumulator(self):
+        """Factory passed to the Collector."""
+        return WindowAccumulator(self._fields)
+
     def _collector_callback(self, collection, window_key, group_by_key='all'):
         """
         This is the callback passed to the collector, normally done
@@ -154,8 +197,11 @@ class Aggregator(Processor):
             'new_d: {0}', (new_d,)
         )
 
-        if window_key == 'global':
+        if window_key == 'global' or self._window_type == 'session':
             event = TimeRangeEvent(collection.range(), new_d)
+        elif self._window_type == 'sliding':
+            # sliding windows do not line up with an Index
+            event = TimeRangeEvent(Collector.sliding_window_range(window_key), new_d)
         else:
             # Pipeline.window_by() will force utc=True if
             # a fixed window size is being used. Otherwise,
@@ -169,6 +215,17 @@ class Aggregator(Processor):
 
         self.emit(event)
 
+    def dropped_events(self):
+        """Number of events that arrived too late to be aggregated,
+        see Pipeline.allowed_lateness()
+
+        Returns
+        -------
+        int
+            Number of dropped events.
+        """
+        return self._collector.dropped_events()
+
     def clone(self):
         """clone it."""
         return Aggregator(self)
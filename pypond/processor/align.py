@@ -18,7 +18,7 @@ from operator import truediv
 import six
 
 from .base import Processor
-from ..event import Event
+from ..event import Event, field_accessor
 from ..exceptions import ProcessorException, ProcessorWarning
 from ..index import Index
 from ..indexed_event import IndexedEvent
@@ -83,6 +83,12 @@ class Align(Processor):
         elif self._field_spec is None:
             self._field_spec = ['value']
 
+        # split the field specs and compile accessors up front rather
+        # than for every event.
+        self._fields = [
+            (i, self._field_path_to_array(i), field_accessor(i)) for i in self._field_spec
+        ]
+
         # check input
         if self._method not in ('linear', 'hold',):
             msg = 'Unknown method {0}'.format(self._method)
@@ -109,12 +115,12 @@ class Align(Processor):
         return an empty list.
         """
 
-        if Index.get_index_string(self._window, self._previous.timestamp()) != \
-                Index.get_index_string(self._window, event.timestamp()):
+        if Index.get_index_string(self._window, self._previous.timestamp_ms()) != \
+                Index.get_index_string(self._window, event.timestamp_ms()):
             # generate a list of indexes to lay new points on. skip the first
             # one because the previous point is in an "old" window, interpolate
             # the point at the beginning of the rest of the ones in the list.
-            trange = TimeRange(self._previous.timestamp(), event.timestamp())
+            trange = TimeRange(self._previous.timestamp_ms(), event.timestamp_ms())
             return Index.get_index_string_list(self._window, trange)[1:]
         else:
             return list()
@@ -135,8 +141,8 @@ class Align(Processor):
         """
         Test to see if an event is perfectly aligned. Used on first event.
         """
-        bound = Index.get_index_string(self._window, event.timestamp())
-        return bool(self._get_boundary_ms(bound) == ms_from_dt(event.timestamp()))
+        bound = Index.get_index_string(self._window, event.timestamp_ms())
+        return bool(self._get_boundary_ms(bound) == event.timestamp_ms())
 
     def _interpolate_hold(self, boundary, set_none=False):
         """
@@ -150,12 +156,10 @@ class Align(Processor):
 
         boundary_ts = self._get_boundary_ms(boundary)
 
-        for i in self._field_spec:
-
-            field_path = self._field_path_to_array(i)
+        for _, field_path, get in self._fields:
 
             if set_none is False:
-                nested_set(new_data, field_path, self._previous.get(field_path))
+                nested_set(new_data, field_path, get(self._previous))
             else:
                 nested_set(new_data, field_path, None)
 
@@ -169,22 +173,20 @@ class Align(Processor):
 
         new_data = dict()
 
-        previous_ts = ms_from_dt(self._previous.timestamp())
+        previous_ts = self._previous.timestamp_ms()
         boundary_ts = self._get_boundary_ms(boundary)
-        current_ts = ms_from_dt(event.timestamp())
+        current_ts = event.timestamp_ms()
 
         # this ratio will be the same for all values being processed
         boundary_frac = truediv((boundary_ts - previous_ts), (current_ts - previous_ts))
 
-        for i in self._field_spec:
-
-            field_path = self._field_path_to_array(i)
+        for i, field_path, get in self._fields:
 
             # generate the delta between the values and
             # bulletproof against non-numeric/bad path
 
-            previous_val = self._previous.get(field_path)
-            current_val = event.get(i)
+            previous_val = get(self._previous)
+            current_val = get(event)
 
             if not isinstance(previous_val, numbers.Number) or \
                     not isinstance(current_val, numbers.Number):
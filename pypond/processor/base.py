@@ -24,7 +24,7 @@ def add_prev_to_chain(n, chain):  # pylint: disable=invalid-name
         chain.append(n.prev().input())
         return chain
     else:
-        add_prev_to_chain(n.prev(), chain)
+        return add_prev_to_chain(n.prev(), chain)
 
 
 class Processor(Observable):
@@ -64,4 +64,32 @@ class Processor(Observable):
         else:
             return add_prev_to_chain(self.prev(), chain)
 
+    def add_events(self, events):
+        """Process a batch of events. Processors that do not hold
+        any state between events override this to handle the whole batch
+        at once, otherwise the events are handled one at a time.
+
+        Parameters
+        ----------
+        events : list
+            Event, IndexedEvent or TimeRangeEvent objects.
+        """
+        for i in events:
+            self.add_event(i)
+
+    def fused_step(self):  # pylint: disable=no-self-use
+        """The step to run when this processor is fused with its
+        neighbours into a single stage (see Fused). Only processors that do
+        not hold any state between events can be fused.
+
+        Returns
+        -------
+        tuple or None
+            (kind, function) where kind is 'event' (the function returns
+            a new event), 'filter' (the function returns False to drop the
+            event) or 'data' (the function takes and returns a Payload).
+            None if this processor can not be fused.
+        """
+        return None
+
     # flush() is inherited from Observable
@@ -11,6 +11,8 @@ Collapse the columns and return a new event
 """
 
 from .base import Processor
+from .fused import Payload
+from ..event import field_accessor
 from ..exceptions import ProcessorException
 from ..util import is_pipeline, Options
 
@@ -72,3 +74,33 @@ class Collapser(Processor):
 
         self._log('Collapser.add_event', 'emitting: {0}', (evn,))
         self.emit(evn)
+
+    def fused_step(self):
+        """collapse columns of the payload."""
+        getters = [field_accessor(i) for i in self._field_spec_list]
+        name = self._name
+        reducer = self._reducer
+        append = self._append
+
+        def collapse(payload):
+            """the collapsed payload."""
+            data = payload if append else Payload()
+            data[name] = reducer([get(payload) for get in getters])
+            return data
+
+        return 'data', collapse
+
+    def add_events(self, events):
+        """
+        Perform the collapse operation on a batch of events and emit them.
+
+        Parameters
+        ----------
+        events : list
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            self.emit_events([
+                i.collapse(self._field_spec_list, self._name, self._reducer, self._append)
+                for i in events
+            ])
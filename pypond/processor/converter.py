@@ -106,13 +106,13 @@ class Converter(Processor):
                 raise ProcessorException(msg)
 
             if self._alignment == 'front':
-                begin = ms_from_dt(event.timestamp())
+                begin = event.timestamp_ms()
                 end = begin + self._duration
             elif self._alignment == 'center':
-                begin = ms_from_dt(event.timestamp()) - int(self._duration) / 2
-                end = ms_from_dt(event.timestamp()) + int(self._duration) / 2
+                begin = event.timestamp_ms() - int(self._duration) / 2
+                end = event.timestamp_ms() + int(self._duration) / 2
             elif self._alignment == 'behind':
-                end = ms_from_dt(event.timestamp())
+                end = event.timestamp_ms()
                 begin = end - self._duration
             else:
                 msg = 'Unknown alignment of converter'
@@ -126,7 +126,7 @@ class Converter(Processor):
             return TimeRangeEvent(rng, event.data())
 
         elif self._convert_to == IndexedEvent:
-            ts = event.timestamp()
+            ts = event.timestamp_ms()
             istr = Index.get_index_string(self._duration_string, ts)
             return IndexedEvent(istr, event.data())
 
@@ -215,20 +215,38 @@ class Converter(Processor):
             Any of the three event variants.
         """
         if self.has_observers():
-            output_event = None
-
-            # pylint: disable=redefined-variable-type
-
-            if isinstance(event, Event):
-                output_event = self.convert_event(event)
-            elif isinstance(event, TimeRangeEvent):
-                output_event = self.convert_time_range_event(event)
-            elif isinstance(event, IndexedEvent):
-                output_event = self.convert_indexed_event(event)
-            else:
-                msg = 'Unknown event type received'
-                raise ProcessorException(msg)
+            output_event = self._convert(event)
 
             self._log('Converter.add_event', 'emitting: {0}', (output_event,))
 
             self.emit(output_event)
+
+    def fused_step(self):
+        """convert the event."""
+        return 'event', self._convert
+
+    def add_events(self, events):
+        """
+        Perform the conversion on a batch of events and emit them.
+
+        Parameters
+        ----------
+        events : list
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            self.emit_events([self._convert(i) for i in events])
+
+    def _convert(self, event):
+        """Convert an event of any type."""
+        # pylint: disable=redefined-variable-type
+
+        if isinstance(event, Event):
+            return self.convert_event(event)
+        elif isinstance(event, TimeRangeEvent):
+            return self.convert_time_range_event(event)
+        elif isinstance(event, IndexedEvent):
+            return self.convert_indexed_event(event)
+
+        msg = 'Unknown event type received'
+        raise ProcessorException(msg)
@@ -19,11 +19,11 @@ from pyrsistent import thaw
 import six
 
 from .base import Processor
-from ..exceptions import ProcessorException, ProcessorWarning
+from ..event import field_accessor
+from ..exceptions import EventException, ProcessorException, ProcessorWarning
 from ..util import (
     is_pipeline,
     is_valid,
-    ms_from_dt,
     nested_get,
     nested_set,
     Options,
@@ -108,6 +108,10 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
             msg += ' - see the sanitize documentation for usage details.'
             raise ProcessorException(msg)
 
+        self._fields = [
+            (self._field_path_to_array(i), field_accessor(i)) for i in self._field_spec
+        ]
+
     def clone(self):
         """clone it."""
         return Filler(self)
@@ -117,9 +121,7 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
         Process and fill the values at the paths as apropos when the
         fill method is either pad or zero.
         """
-        for path in self._field_spec:
-
-            field_path = self._field_path_to_array(path)
+        for field_path, get in self._fields:
 
             # initialize a counter for this column
             if tuple(field_path) not in self._key_count:
@@ -147,11 +149,9 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
 
                 elif self._method == 'pad':  # set to previous value
                     if self._previous_event is not None:
-                        if is_valid(self._previous_event.get(field_path)):
-                            nested_set(
-                                data, field_path,
-                                self._previous_event.get(field_path)
-                            )
+                        previous = get(self._previous_event)
+                        if is_valid(previous):
+                            nested_set(data, field_path, previous)
                             # note that this column has been padded
                             # on success
                             self._key_count[tuple(field_path)] += 1
@@ -174,9 +174,17 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
 
         valid = True
 
-        field_path = self._field_path_to_array(self._field_spec[0])
+        field_path, get = self._fields[0]
+
+        try:
+            val = get(event)
+        except EventException:
+            val = 'bad_path'
 
-        val = nested_get(thaw(event.data()), field_path)
+        if val is None:
+            # a missing key and a None value look the same to the
+            # accessor, take the slow path to tell them apart.
+            val = nested_get(thaw(event.data()), field_path)
 
         # this is pointing at a path that does not exist, issue a warning
         # can call the event valid so it will be emitted. can't fill what
@@ -328,7 +336,7 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
         # new array of interpolated events for each field path
         new_events = list()
 
-        field_path = self._field_path_to_array(self._field_spec[0])
+        field_path, get = self._fields[0]
 
         # setup done, loop through the events.
         for event_enum in enumerate(base_events):
@@ -340,9 +348,9 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
 
             # if a non-numeric value is encountered, stop processing
             # this field spec and hand back the original unfilled events.
-            if is_valid(event_enum[1].get(field_path)) and \
-                    not isinstance(event_enum[1].get(field_path),
-                                   numbers.Number):
+            val = get(event_enum[1])
+
+            if is_valid(val) and not isinstance(val, numbers.Number):
                 self._warn(
                     'linear requires numeric values - skipping this field_spec',
                     ProcessorWarning
@@ -350,7 +358,7 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
                 return base_events
 
             # found a bad value so start calculating.
-            if not is_valid(event_enum[1].get(field_path)):
+            if not is_valid(val):
 
                 previous_value = None
                 previous_ts = None
@@ -361,10 +369,10 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
                 # that's where previously interpolated values will be.
                 # if found, get the timestamp as well.
 
-                previous_value = new_events[event_enum[0] - 1].get(field_path)
+                previous_value = get(new_events[event_enum[0] - 1])
 
                 if previous_value:
-                    previous_ts = ms_from_dt(new_events[event_enum[0] - 1].timestamp())
+                    previous_ts = new_events[event_enum[0] - 1].timestamp_ms()
 
                 # see about finding the next valid value and its timestamp
                 # in the original list.
@@ -373,10 +381,10 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
 
                 while next_value is None and next_idx < len(base_events):
 
-                    val = base_events[next_idx].get(field_path)
+                    val = get(base_events[next_idx])
 
                     if is_valid(val):
-                        next_ts = ms_from_dt(base_events[next_idx].timestamp())
+                        next_ts = base_events[next_idx].timestamp_ms()
                         next_value = val  # terminates the loop
 
                     next_idx += 1
@@ -389,7 +397,7 @@ class Filler(Processor):  # pylint: disable=too-many-instance-attributes
                 if previous_value is not None and next_value is not None:
                     # pry the data from current event
                     new_data = thaw(event_enum[1].data())
-                    current_ts = ms_from_dt(event_enum[1].timestamp())
+                    current_ts = event_enum[1].timestamp_ms()
 
                     if previous_ts == next_ts:
                         # average the two values
@@ -66,3 +66,24 @@ class Filter(Processor):
             if self._op(event):
                 self._log('Filter.add_event', 'emitting: {0}', (event,))
                 self.emit(event)
+
+    def fused_step(self):
+        """filter the event."""
+        return 'filter', self._op
+
+    def add_events(self, events):
+        """
+        Perform the filter operation on a batch of events and emit
+        the ones that pass.
+
+        Parameters
+        ----------
+        events : list
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            op = self._op
+            passed = [i for i in events if op(i)]
+
+            if passed:
+                self.emit_events(passed)
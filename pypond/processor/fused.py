@@ -0,0 +1,186 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Processor made by fusing a run of stateless processors together.
+"""
+
+import six
+
+from .base import Processor
+from ..event import field_accessor
+from ..exceptions import ProcessorException
+from ..util import Options
+
+
+class Payload(dict):
+    """
+    The data of an event as a mutable dict while it is passed between
+    fused steps. The values are the (immutable) values of the event data
+    so the field accessors work on it just like on an event.
+    """
+    __slots__ = ()
+
+    _field = dict.get
+
+
+def select_payload(payload, field_spec):
+    """The payload equivalent of Event.selector()
+
+    Parameters
+    ----------
+    payload : Payload
+        The data.
+    field_spec : str, list, tuple, None
+        Column or columns to select.
+
+    Returns
+    -------
+    Payload
+        The selected data, or payload if the field_spec is not valid.
+    """
+    if isinstance(field_spec, str):
+        field_spec = [field_spec]
+    elif field_spec is None:
+        return Payload(value=field_accessor(None)(payload))
+    elif not isinstance(field_spec, (list, tuple)):
+        return payload
+
+    return Payload(
+        (i, field_accessor(i)(payload)) for i in field_spec if isinstance(i, str)
+    )
+
+
+class Fused(Processor):
+    """
+    A run of consecutive stateless processors (map, filter, select,
+    collapse, offset, convert) fused into a single stage of the
+    execution chain.
+
+    Each of the processors provides a step (see Processor.fused_step())
+    which either works on the event, or on the data of the event. Runs of
+    data steps (select, collapse and offset) are applied to a mutable
+    Payload and an event is only made when an event step (a map or filter
+    function) needs one, or at the end. So a chain of several steps calls
+    set_data() once rather than once per step.
+
+    Parameters
+    ----------
+    arg1 : Fused or list
+        Copy constructor or the processors to fuse, in order.
+    """
+
+    def __init__(self, arg1):
+        """create the fused processor"""
+
+        super(Fused, self).__init__(arg1, Options())
+
+        self._log('Fused.init', 'uid: {0}'.format(self._id))
+
+        if isinstance(arg1, Fused):
+            # pylint: disable=protected-access
+            self._pipeline = arg1._pipeline
+            self._steps = arg1._steps
+        elif isinstance(arg1, list) and arg1:
+            self._pipeline = arg1[0].pipeline()
+            self._steps = [i.fused_step() for i in arg1]
+        else:
+            msg = 'Unknown arg to Fused: {0}'.format(arg1)
+            raise ProcessorException(msg)
+
+        if None in self._steps:
+            msg = 'only stateless processors can be fused: {0}'.format(arg1)
+            raise ProcessorException(msg)
+
+        self._stages = self._combine_steps()
+
+    def clone(self):
+        """clone it."""
+        return Fused(self)
+
+    @staticmethod
+    def _data_stage(funcs):
+        """A function applying a run of data steps to an event."""
+
+        def stage(event):
+            """run the data steps and make a single new event."""
+            payload = Payload(six.iteritems(event.data()))
+
+            for func in funcs:
+                payload = func(payload)
+
+            return event.set_data(dict(payload))
+
+        return stage
+
+    def _combine_steps(self):
+        """The steps with each run of data steps combined into a single
+        function, as (is_filter, function) tuples."""
+        stages = list()
+        data = list()
+
+        for kind, func in self._steps + [(None, None)]:
+            if kind == 'data':
+                data.append(func)
+                continue
+
+            if data:
+                stages.append((False, self._data_stage(data)))
+                data = list()
+
+            if kind is not None:
+                stages.append((kind == 'filter', func))
+
+        return stages
+
+    def _apply(self, event):
+        """Run an event through the stages, returns None if it was
+        filtered out."""
+        for is_filter, func in self._stages:
+            if is_filter:
+                if not func(event):
+                    return None
+            else:
+                event = func(event)
+
+        return event
+
+    def add_event(self, event):
+        """
+        Run the event through the fused steps and emit.
+
+        Parameters
+        ----------
+        event : Event, IndexedEvent, TimerangeEvent
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            output_event = self._apply(event)
+
+            if output_event is not None:
+                self._log('Fused.add_event', 'emitting: {0}', (output_event,))
+                self.emit(output_event)
+
+    def add_events(self, events):
+        """
+        Run a batch of events through the fused steps and emit them.
+
+        Parameters
+        ----------
+        events : list
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            for is_filter, func in self._stages:
+                if is_filter:
+                    events = [i for i in events if func(i)]
+                else:
+                    events = [func(i) for i in events]
+
+            if events:
+                self.emit_events(events)
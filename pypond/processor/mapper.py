@@ -66,3 +66,20 @@ class Mapper(Processor):
             evn = self._op(event)
             self._log('Mapper.add_event', 'emitting: {0}', (evn,))
             self.emit(evn)
+
+    def fused_step(self):
+        """map the event."""
+        return 'event', self._op
+
+    def add_events(self, events):
+        """
+        Perform the map operation on a batch of events and emit them.
+
+        Parameters
+        ----------
+        events : list
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            op = self._op
+            self.emit_events([op(i) for i in events])
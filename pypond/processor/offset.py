@@ -15,6 +15,7 @@ Primarily for testing.
 from .base import Processor
 from ..event import Event
 from ..exceptions import ProcessorException
+from .fused import Payload, select_payload
 from ..util import is_pipeline, Options
 
 
@@ -79,15 +80,42 @@ class Offset(Processor):
         self._log('Offset.add_event', '{0}', (event,))
 
         if self.has_observers():
-            selected = Event.selector(event, self._field_spec)
-            data = dict()
-
-            for k, v in list(selected.data().items()):
-                offset_value = v + self._by
-                data[k] = offset_value
-
-            output_event = event.set_data(data)
+            output_event = self._offset(event)
 
             self._log('Offset.add_event', 'emitting: {0}', (output_event,))
 
             self.emit(output_event)
+
+    def add_events(self, events):
+        """
+        Output a batch of events offset by a certain value.
+
+        Parameters
+        ----------
+        events : list
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            self.emit_events([self._offset(i) for i in events])
+
+    def fused_step(self):
+        """offset the selected columns of the payload."""
+        field_spec = self._field_spec
+        by = self._by  # pylint: disable=invalid-name
+
+        def offset(payload):
+            """the offset payload."""
+            return Payload(
+                (k, v + by) for k, v in list(select_payload(payload, field_spec).items()))
+
+        return 'data', offset
+
+    def _offset(self, event):
+        """The offset event."""
+        selected = Event.selector(event, self._field_spec)
+        data = dict()
+
+        for k, v in list(selected.data().items()):
+            data[k] = v + self._by
+
+        return event.set_data(data)
@@ -19,10 +19,11 @@ from operator import truediv
 import six
 
 from .base import Processor
+from ..event import field_accessor
 from ..exceptions import ProcessorException, ProcessorWarning
 from ..indexed_event import IndexedEvent
 from ..timerange_event import TimeRangeEvent
-from ..util import is_pipeline, Options, ms_from_dt, nested_set
+from ..util import is_pipeline, Options, nested_set
 
 
 class Rate(Processor):
@@ -73,6 +74,15 @@ class Rate(Processor):
         elif self._field_spec is None:
             self._field_spec = ['value']
 
+        # work out the output paths and compile accessors up front
+        # rather than for every event.
+        self._fields = list()
+
+        for i in self._field_spec:
+            rate_path = copy.copy(self._field_path_to_array(i))
+            rate_path[-1] += '_rate'
+            self._fields.append((rate_path, field_accessor(i)))
+
     def clone(self):
         """Clone this Rate processor.
 
@@ -91,19 +101,15 @@ class Rate(Processor):
 
         new_data = dict()
 
-        previous_ts = ms_from_dt(self._previous.timestamp())
-        current_ts = ms_from_dt(event.timestamp())
+        previous_ts = self._previous.timestamp_ms()
+        current_ts = event.timestamp_ms()
 
         ts_delta = truediv(current_ts - previous_ts, 1000)  # do it in seconds
 
-        for i in self._field_spec:
-
-            field_path = self._field_path_to_array(i)
-            rate_path = copy.copy(field_path)
-            rate_path[-1] += '_rate'
+        for rate_path, get in self._fields:
 
-            previous_val = self._previous.get(field_path)
-            current_val = event.get(i)
+            previous_val = get(self._previous)
+            current_val = get(event)
 
             if not isinstance(previous_val, numbers.Number) or \
                     not isinstance(current_val, numbers.Number):
@@ -13,6 +13,7 @@ Processor to return events with only selected columns
 from .base import Processor
 from ..event import Event
 from ..exceptions import ProcessorException
+from .fused import select_payload
 from ..util import is_pipeline, Options
 
 
@@ -61,3 +62,26 @@ class Selector(Processor):
             evn = Event.selector(event, self._field_spec)
             self._log('Selector.add_event', 'emitting: {0}', (evn,))
             self.emit(evn)
+
+    def fused_step(self):
+        """select columns of the payload."""
+        field_spec = self._field_spec
+
+        def select(payload):
+            """the selected payload."""
+            return select_payload(payload, field_spec)
+
+        return 'data', select
+
+    def add_events(self, events):
+        """
+        Perform the select operation on a batch of events and emit them.
+
+        Parameters
+        ----------
+        events : list
+            Any of the three event variants.
+        """
+        if self.has_observers():
+            field_spec = self._field_spec
+            self.emit_events([Event.selector(i, field_spec) for i in events])
@@ -75,11 +75,11 @@ class Taker(Processor):
         """
         if self.has_observers():
 
-            ts = event.timestamp()
             window_key = None
 
             if self._window_type == 'fixed':
-                window_key = Index.get_index_string(self._window_duration, ts)
+                window_key = Index.get_index_string(
+                    self._window_duration, event.timestamp_ms())
             else:
                 window_key = self._window_type
 
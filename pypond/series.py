@@ -13,19 +13,31 @@ http://software.es.net/pond/#/timeseries
 """
 
 import copy
+import io
 import json
+import multiprocessing
+import warnings
 
-from pyrsistent import pmap, thaw
+from collections import OrderedDict
+
+from pyrsistent import pmap, pvector, thaw
+
+import six
 
 from .bases import PypondBase
 from .collection import Collection
+from .columnar import ColumnarCollection, MISSING
 from .event import Event
-from .exceptions import TimeSeriesException
+from .exceptions import TimeSeriesException, TimeSeriesWarning
 from .index import Index
 from .indexed_event import IndexedEvent
 from .timerange_event import TimeRangeEvent
 from .util import ObjectEncoder, ms_from_dt, is_function
 
+# the rollup done by the worker processes of TimeSeries.rollup_many() - set
+# by the pool initializer since aggregation functions can not be pickled.
+_ROLLUP = None
+
 
 class TimeSeries(PypondBase):  # pylint: disable=too-many-public-methods
     """
@@ -131,22 +143,10 @@ class TimeSeries(PypondBase):  # pylint: disable=too-many-public-methods
             elif 'columns' in instance_or_wire and 'points' in instance_or_wire:
                 # coming from the wire format
 
-                event_type = instance_or_wire.get('columns')[0]
-                event_fields = instance_or_wire.get('columns')[1:]
-
-                events = list()
-
-                for i in instance_or_wire.get('points'):
-                    time = i[0]
-                    event_values = i[1:]
-                    data = dict(list(zip(event_fields, event_values)))
-                    try:
-                        events.append(self.event_type_map[event_type](time, data))
-                    except KeyError:
-                        msg = 'invalid event type {et}'.format(et=event_type)
-                        raise TimeSeriesException(msg)
-
-                self._collection = Collection(events)
+                self._collection = self.collection_from_wire(
+                    instance_or_wire.get('columns'),
+                    instance_or_wire.get('points'),
+                )
 
                 meta = copy.copy(instance_or_wire)
                 meta.pop('columns')
@@ -166,6 +166,71 @@ class TimeSeries(PypondBase):  # pylint: disable=too-many-public-methods
             msg = 'Events supplied to TimeSeries constructor must be chronological'
             raise TimeSeriesException(msg)
 
+    @classmethod
+    def collection_from_wire(cls, columns, points):
+        """
+        Build a collection from the columns and points of the wire format.
+
+        If the points are timestamp based (with integer epoch ms times)
+        the points are transposed straight in to a ColumnarCollection
+        without creating any events.
+        Otherwise the events are created and added to a Collection
+        without re-checking the type of each one.
+
+        Parameters
+        ----------
+        columns : list
+            The columns, the first is the event type.
+        points : list
+            List of points, each a list of values in column order.
+
+        Returns
+        -------
+        Collection
+            A Collection or ColumnarCollection
+
+        Raises
+        ------
+        TimeSeriesException
+            Raised on an unknown event type.
+        """
+        event_type = columns[0]
+        event_fields = columns[1:]
+
+        try:
+            event_class = cls.event_type_map[event_type]
+        except KeyError:
+            msg = 'invalid event type {et}'.format(et=event_type)
+            raise TimeSeriesException(msg)
+
+        if event_class is Event and points:
+
+            if not all(len(i) == len(columns) for i in points):
+                # short points are missing the trailing columns
+                padding = [MISSING] * len(columns)
+                points = [(list(i) + padding)[:len(columns)] for i in points]
+
+            values = list(zip(*points))
+
+            # pylint: disable=unidiomatic-typecheck
+            if all(type(i) in six.integer_types for i in values[0]):
+                return ColumnarCollection.from_columns(
+                    values[0],
+                    OrderedDict(list(zip(event_fields, values[1:]))),
+                )
+
+        events = list()
+
+        for i in points:
+            events.append(event_class(i[0], dict(list(zip(event_fields, i[1:])))))
+
+        # all the same type since they were just made.
+        coll = Collection()
+        coll._event_list = pvector(events)  # pylint: disable=protected-access
+        coll._type = event_class if events else None  # pylint: disable=protected-access
+
+        return coll
+
     @staticmethod
     def build_metadata(meta):
         """
@@ -441,6 +506,9 @@ class TimeSeries(PypondBase):  # pylint: disable=too-many-public-methods
         """Crop the TimeSeries to the specified TimeRange and return
         a new TimeSeries
 
+        The bounds are located with bisect() and the new TimeSeries
+        is a view onto the events of this one - see Collection.slice().
+
         Parameters
         ----------
         timerange : TimeRange
@@ -488,7 +556,7 @@ class TimeSeries(PypondBase):  # pylint: disable=too-many-public-methods
         iterator
             Generator for loops.
         """
-        return iter(self._collection.event_list())
+        return self._collection.events()
 
     # Access metadata about the series
 
@@ -1456,6 +1524,128 @@ class TimeSeries(PypondBase):  # pylint: disable=too-many-public-methods
 
         return self.set_collection(colls.get('all'))
 
+    def rollup(self, interval, aggregation, to_events=False, utc=True):
+        """
+        Builds a new TimeSeries by dividing events into windows, either
+        fixed windows (ie: '1h', '5m') like fixed_window_rollup() or
+        calendar windows ('hourly', 'daily', 'monthly' or 'yearly') like
+        the other rollup methods.
+
+        Parameters
+        ----------
+        interval : str
+            A window size or calendar interval.
+        aggregation : dict
+            The aggregation specification e.g. {'max_temp': {'temperature': Functions.max()}}
+        to_events : bool, optional
+            Do conversion to Event objects
+        utc : bool, optional
+            Render calendar windows in UTC rather than local time.
+
+        Returns
+        -------
+        TimeSeries
+            The resulting rolled up TimeSeries.
+        """
+        if interval == 'hourly':
+            return self.hourly_rollup(aggregation, to_events)
+
+        if interval in ('daily', 'monthly', 'yearly'):
+            return self._rollup(interval, aggregation, to_events, utc=utc)
+
+        return self.fixed_window_rollup(interval, aggregation, to_events)
+
+    @staticmethod
+    def rollup_many(series_list, interval, aggregation, to_events=False, utc=True,
+                    workers=None, chunk_size=100, progress=None):
+        """
+        Roll up a lot of independent series in parallel, see rollup().
+
+        The series are sent to a pool of worker processes in chunks, in a
+        compact serialized form (the pypond.io.binary format for series of
+        Events, the wire format otherwise) and the rolled up series are sent
+        back the same way. A series that can not be rolled up does not stop
+        the batch - the error is reported and its result is None::
+
+            results, errors = TimeSeries.rollup_many(
+                series_list, '1h', {'in_avg': {'in': Functions.avg()}}, workers=8)
+
+            for i, err in errors.items():
+                log.warning('%s failed: %s', series_list[i].name(), err)
+
+        Parameters
+        ----------
+        series_list : list
+            TimeSeries to roll up.
+        interval : str
+            A window size or calendar interval.
+        aggregation : dict
+            The aggregation specification e.g. {'max_temp': {'temperature': Functions.max()}}
+        to_events : bool, optional
+            Do conversion to Event objects
+        utc : bool, optional
+            Render calendar windows in UTC rather than local time.
+        workers : int, optional
+            Number of worker processes, defaults to the number of CPUs.
+            Use 1 to roll up in this process.
+        chunk_size : int, optional
+            Number of series sent to a worker at a time.
+        progress : function, optional
+            Called with the number of series done so far and the total
+            as each chunk completes.
+
+        Returns
+        -------
+        tuple
+            A list of rolled up series, in the same order as series_list,
+            and a dict of TimeSeriesException for the positions of any
+            series that failed.
+        """
+        workers = workers or multiprocessing.cpu_count()
+        chunks = [series_list[i:i + chunk_size] for i in range(0, len(series_list), chunk_size)]
+
+        context = None
+
+        if workers > 1 and len(chunks) > 1:
+            try:
+                context = multiprocessing.get_context('fork')
+            except (AttributeError, ValueError):
+                # no get_context() before python 3.4
+                warnings.warn(
+                    'rollup_many() needs to be able to fork - running serially',
+                    TimeSeriesWarning, stacklevel=2)
+
+        results = list()
+        errors = dict()
+
+        rollup = (interval, aggregation, to_events, utc)
+
+        if context is None:
+            pool = None
+            done = (_rollup_chunk([(True, ii) for ii in i], rollup, encoded=False)
+                    for i in chunks)
+        else:
+            # the forked workers inherit the initargs without pickling them.
+            pool = context.Pool(min(workers, len(chunks)), _rollup_init, (rollup,))
+            done = pool.imap(_rollup_worker, ([_encode_input(ii) for ii in i] for i in chunks))
+
+        try:
+            for chunk in done:
+                for ok, data in chunk:
+                    if not ok:
+                        errors[len(results)] = TimeSeriesException(data)
+                        results.append(None)
+                    else:
+                        results.append(data if context is None else _decode_series(data))
+
+                if progress is not None:
+                    progress(len(results), len(series_list))
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        return results, errors
+
     def collect_by_fixed_window(self, window_size):
         """Summary
 
@@ -1626,3 +1816,73 @@ class TimeSeries(PypondBase):  # pylint: disable=too-many-public-methods
             New time series with summed values.
         """
         return TimeSeries.timeseries_list_reduce(data, series_list, Event.sum, field_spec)
+
+
+def _encode_series(series):
+    """Serialize a series to send to or from a worker process."""
+    from .io import binary  # pylint: disable=cyclic-import
+
+    if series.collection().type() in (Event, None):
+        buf = io.BytesIO()
+        binary.dump(series, buf)
+        return buf.getvalue()
+
+    return json.dumps(series.to_json(), cls=ObjectEncoder).encode('utf-8')
+
+
+def _encode_input(series):
+    """Serialize a series to send to a worker process, as an (ok, payload)
+    pair - the payload is the error message if it can not be serialized."""
+    try:
+        return True, _encode_series(series)
+    except Exception as err:  # pylint: disable=broad-except
+        return False, _error_message(err)
+
+
+def _error_message(err):
+    """The error returned for a series that could not be rolled up."""
+    return '{0}: {1}'.format(type(err).__name__, err)
+
+
+def _decode_series(data):
+    """Deserialize a series made by _encode_series()"""
+    from .io import binary  # pylint: disable=cyclic-import
+
+    if data[:len(binary.MAGIC)] == binary.MAGIC:
+        return binary.loads(data)
+
+    return TimeSeries(json.loads(data.decode('utf-8')))
+
+
+def _rollup_init(rollup):
+    """Pool initializer for the worker processes of TimeSeries.rollup_many()"""
+    global _ROLLUP  # pylint: disable=global-statement
+    _ROLLUP = rollup
+
+
+def _rollup_worker(chunk):
+    """Roll up a chunk of encoded series in a worker process."""
+    return _rollup_chunk(chunk, _ROLLUP)
+
+
+def _rollup_chunk(chunk, rollup, encoded=True):
+    """Roll up a chunk of (ok, series) pairs for TimeSeries.rollup_many(),
+    returning an (ok, series) pair for each - or (False, error message)."""
+    interval, aggregation, to_events, utc = rollup
+
+    results = list()
+
+    for ok, i in chunk:
+        if not ok:
+            # the series could not be sent to the worker
+            results.append((False, i))
+            continue
+
+        try:
+            series = _decode_series(i) if encoded else i
+            rollup_series = series.rollup(interval, aggregation, to_events, utc)
+            results.append((True, _encode_series(rollup_series) if encoded else rollup_series))
+        except Exception as err:  # pylint: disable=broad-except
+            results.append((False, _error_message(err)))
+
+    return results
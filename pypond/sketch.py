@@ -0,0 +1,232 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Streaming quantile sketch for approximate percentiles.
+"""
+
+import random
+
+from math import ceil
+
+from .bases import PypondBase
+
+
+class QuantileSketch(PypondBase):
+    """
+    A KLL quantile sketch (Karnin, Lang and Liberty, "Optimal Quantile
+    Approximation in Streams", 2016).
+
+    Values are added to a hierarchy of compactors. When a compactor
+    is full it is sorted and every other value is promoted to the next
+    compactor up (where each value represents twice as many
+    of the original values) and the rest are thrown away. The sketch
+    holds at most about 3 * k values no matter how many are added,
+    and the rank error of a quantile is roughly proportional to 1 / k
+    (about 1% with the default k of 200).
+
+    Until the first compaction (fewer than about k values) the sketch
+    holds all of the values and the quantiles are exact.
+
+    Sketches built with the same k can be combined with merge(),
+    so sketches of different windows or groups can be rolled up.
+
+    Parameters
+    ----------
+    k : int, optional
+        Accuracy parameter, larger is more accurate but uses more memory.
+    seed : int, optional
+        Seed for the random choices made during compaction so the results
+        can be reproduced.
+    """
+
+    # ratio of the capacity of a compactor to the one above it.
+    _C = 2.0 / 3.0
+
+    def __init__(self, k=200, seed=None):
+        """Create an empty sketch."""
+        super(QuantileSketch, self).__init__()
+
+        self._k = max(int(k), 2)
+        self._random = random.Random(seed)
+        self._compactors = list()
+        self._size = 0
+        self._max_size = 0
+        self._count = 0
+
+        self._grow()
+
+    def _capacity(self, height):
+        """Capacity of the compactor at a given height."""
+        depth = len(self._compactors) - height - 1
+        return int(ceil(self._k * self._C ** depth)) + 1
+
+    def _grow(self):
+        """Add a compactor to the top of the hierarchy."""
+        self._compactors.append(list())
+        self._max_size = sum(self._capacity(i) for i in range(len(self._compactors)))
+
+    def _compact(self, height):
+        """Sort a compactor and promote every other value to the next."""
+        if height + 1 >= len(self._compactors):
+            self._grow()
+
+        items = self._compactors[height]
+        items.sort()
+
+        # an odd value out stays put.
+        keep = [items.pop()] if len(items) % 2 else []
+
+        self._compactors[height + 1].extend(items[self._random.randint(0, 1)::2])
+        self._compactors[height] = keep
+
+    def _compress(self):
+        """Compact until the sketch is back under its size limit."""
+        while self._size >= self._max_size:
+            for height in range(len(self._compactors)):
+                if len(self._compactors[height]) >= self._capacity(height):
+                    self._compact(height)
+                    break
+
+            self._size = sum(len(i) for i in self._compactors)
+
+    def add(self, value):
+        """Add a value to the sketch.
+
+        Parameters
+        ----------
+        value : number
+            The value.
+        """
+        self._compactors[0].append(value)
+        self._size += 1
+        self._count += 1
+
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other):
+        """Add the contents of another sketch to this one.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            Another sketch, it is not modified.
+
+        Returns
+        -------
+        QuantileSketch
+            This sketch.
+        """
+        # pylint: disable=protected-access
+
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+
+        for height, items in enumerate(other._compactors):
+            self._compactors[height].extend(items)
+
+        self._count += other._count
+        self._size = sum(len(i) for i in self._compactors)
+
+        if self._size >= self._max_size:
+            self._compress()
+
+        return self
+
+    def count(self):
+        """Number of values that have been added to the sketch.
+
+        Returns
+        -------
+        int
+            The count.
+        """
+        return self._count
+
+    def exact(self):
+        """Whether the sketch still holds all of the values.
+
+        Returns
+        -------
+        bool
+            True if no values have been discarded.
+        """
+        return all(not i for i in self._compactors[1:])
+
+    def quantile(self, quantile):
+        """Approximate value at a given quantile.
+
+        Parameters
+        ----------
+        quantile : float
+            Between 0.0 and 1.0.
+
+        Returns
+        -------
+        number
+            A value that was added to the sketch or None if it is empty.
+        """
+        if not self._count:
+            return None
+
+        weighted = sorted(
+            (item, 2 ** height)
+            for height, items in enumerate(self._compactors)
+            for item in items
+        )
+
+        total = sum(i[1] for i in weighted)
+        target = quantile * total
+        cumulative = 0
+
+        for item, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return item
+
+        return weighted[-1][0]
+
+    def percentile(self, perc, method='linear'):
+        """Approximate percentile of the values. While the sketch still
+        holds all of the values, this is the same as Functions.percentile()
+        and method is used to interpolate between values, otherwise the
+        nearest value held by the sketch is returned.
+
+        Parameters
+        ----------
+        perc : number
+            Percentile between 0 and 100.
+        method : str, optional
+            See Functions.percentile()
+
+        Returns
+        -------
+        number
+            The percentile or None if the sketch is empty.
+        """
+        from .functions import _percentile  # avoid circular import
+
+        if not self._count:
+            return None
+
+        if self.exact():
+            return _percentile(self.values(), perc, method)
+
+        return self.quantile(perc / 100.0)
+
+    def values(self):
+        """The sorted values held by the sketch, only meaningful
+        if exact() is True.
+
+        Returns
+        -------
+        list
+            Sorted values.
+        """
+        return sorted(i for items in self._compactors for i in items)
@@ -40,6 +40,10 @@ setup(
         'sphinxcontrib-napoleon==0.5.1',
         'recommonmark==0.4.0',
     ],
+    extras_require={
+        # optional, used to speed up aggregation of large windows
+        'numpy': ['numpy'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
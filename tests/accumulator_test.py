@@ -0,0 +1,290 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Tests for the incremental accumulators.
+"""
+
+import random
+import unittest
+
+from pypond.accumulator import is_incremental, WindowAccumulator
+from pypond.collection import Collection
+from pypond.event import Event
+from pypond.exceptions import CollectionException, FunctionException
+from pypond.functions import Functions, Filters
+from pypond.processor import Aggregator
+from pypond.series import TimeSeries
+from pypond.sketch import QuantileSketch
+from pypond.util import Options
+
+VALUES = [3, 1, 4, None, 1, 5, float('nan'), 9, 2, 6]
+
+INCREMENTAL = (
+    Functions.sum, Functions.avg, Functions.count, Functions.max,
+    Functions.min, Functions.first, Functions.last, Functions.keep,
+    Functions.stddev, Functions.difference,
+)
+
+FILTERS = (
+    Filters.ignore_missing, Filters.zero_missing, Filters.propagate_missing,
+)
+
+
+def accumulate(func, values):
+    """feed values into the accumulator for func."""
+    acc = func.accumulator()
+    for i in values:
+        acc.add(i)
+    return acc
+
+
+class TestAccumulators(unittest.TestCase):
+    """
+    Compare the accumulators to the batch functions.
+    """
+
+    def assert_result(self, expected, got):
+        """compare, allowing for floating point differences."""
+        if isinstance(expected, float):
+            self.assertAlmostEqual(expected, got)
+        else:
+            self.assertEqual(expected, got)
+
+    def test_filters(self):
+        """all the functions with all the filters."""
+
+        for factory in INCREMENTAL:
+            for flt in FILTERS:
+                func = factory(flt)
+                self.assertTrue(is_incremental(func))
+                self.assert_result(func(VALUES), accumulate(func, VALUES).result())
+
+            func = factory(Filters.none_if_empty)
+            self.assertEqual(accumulate(func, []).result(), None)
+            self.assert_result(func([1, 2, 3]), accumulate(func, [1, 2, 3]).result())
+
+    def test_keep_missing(self):
+        """the default filter with valid values, then without."""
+
+        values = [v for v in VALUES if v is not None and v == v]
+
+        for factory in INCREMENTAL:
+            func = factory()
+            self.assert_result(func(values), accumulate(func, values).result())
+
+        self.assertEqual(accumulate(Functions.count(), VALUES).result(), len(VALUES))
+        self.assertEqual(accumulate(Functions.last(), VALUES).result(), 6)
+
+        with self.assertRaises(TypeError):
+            accumulate(Functions.sum(), VALUES)
+
+        # empty
+        for factory in (Functions.sum, Functions.avg, Functions.count,
+                        Functions.first, Functions.last, Functions.stddev):
+            self.assertEqual(factory()([]), accumulate(factory(), []).result())
+
+        with self.assertRaises(ValueError):
+            accumulate(Functions.max(), []).result()
+
+        # keep
+        self.assertEqual(accumulate(Functions.keep(), ['a', None, 'a']).result(), 'a')
+        self.assertEqual(accumulate(Functions.keep(), ['a', 'b', 'a']).result(), None)
+
+    def test_merge(self):
+        """merging partial accumulators is the same as one accumulator."""
+
+        values = [v for v in VALUES if v is not None and v == v]
+
+        for factory in INCREMENTAL:
+            func = factory()
+
+            for split in range(len(values) + 1):
+                merged = accumulate(func, values[:split]).merge(
+                    accumulate(func, values[split:]))
+
+                self.assert_result(func(values), merged.result())
+
+    def test_non_incremental(self):
+        """functions that need all the values, or custom filters."""
+
+        def my_filter(values):  # pylint: disable=missing-docstring
+            return values
+
+        self.assertFalse(is_incremental(Functions.percentile(50)))
+        self.assertFalse(is_incremental(Functions.median()))
+        self.assertFalse(is_incremental(Functions.sum(my_filter)))
+        self.assertFalse(is_incremental(lambda x: x))
+
+        with self.assertRaises(CollectionException):
+            WindowAccumulator({'med': {'value': Functions.median()}})
+
+    def test_window_accumulator(self):
+        """stand-in for a collection."""
+
+        fields = {
+            'in_avg': {'in': Functions.avg()},
+            'out_max': {('direction', 'out'): Functions.max()},
+        }
+
+        events = [
+            Event(1000 * i, {'in': i, 'direction': {'out': i * 2}}) for i in range(1, 6)
+        ]
+
+        win = WindowAccumulator(fields)
+        coll = Collection()
+
+        for i in events:
+            self.assertTrue(win.add_event(i) is win)
+            coll = coll.add_event(i)
+
+        self.assertEqual(win.size(), 5)
+        self.assertEqual(win.range().to_json(), coll.range().to_json())
+        self.assertEqual(win.aggregate(fields['in_avg']['in'], 'in'), 3.0)
+        self.assertEqual(
+            win.aggregate(fields['out_max'][('direction', 'out')], 'direction.out'), 10)
+
+        with self.assertRaises(CollectionException):
+            win.aggregate(Functions.sum(), 'in')
+
+    def test_aggregator(self):
+        """pipeline results are the same either way."""
+
+        events = [Event(1429673400000 + 60000 * i, {'in': i % 7, 'out': i % 3})
+                  for i in range(60)]
+
+        series = TimeSeries(dict(name='traffic', events=events))
+
+        incremental = dict(
+            in_avg={'in': Functions.avg()},
+            out_max={'out': Functions.max()},
+            in_dev={'in': Functions.stddev()},
+        )
+
+        # adding the percentile forces all of them to be done in batch
+        batch = dict(incremental, in_perc={'in': Functions.percentile(90)})
+
+        def rollup(fields):  # pylint: disable=missing-docstring
+            return series.fixed_window_rollup('10m', fields).collection()
+
+        inc = rollup(incremental)
+        bat = rollup(batch)
+
+        self.assertEqual(inc.size(), bat.size())
+
+        for i, ii in zip(inc.events(), bat.events()):
+            self.assertEqual(i.index_as_string(), ii.index_as_string())
+            self.assertEqual(i.get('in_avg'), ii.get('in_avg'))
+            self.assertEqual(i.get('out_max'), ii.get('out_max'))
+            self.assertAlmostEqual(i.get('in_dev'), ii.get('in_dev'))
+
+        # and that the accumulators were actually used.
+        # pylint: disable=protected-access
+        self.assertTrue(
+            Aggregator(series.pipeline(), Options(fields=incremental))._incremental())
+        self.assertFalse(
+            Aggregator(series.pipeline(), Options(fields=batch))._incremental())
+
+class TestQuantileSketch(unittest.TestCase):
+    """
+    Tests for the streaming quantile sketch.
+    """
+
+    def setUp(self):
+        rand = random.Random(42)
+        self._values = [rand.gauss(100, 20) for _ in range(20000)]
+        self._sorted = sorted(self._values)
+
+    def assert_rank(self, value, quantile, tolerance=0.02):
+        """check the rank of value is close to quantile"""
+        rank = len([i for i in self._sorted if i <= value]) / float(len(self._sorted))
+        self.assertTrue(abs(rank - quantile) < tolerance, (rank, quantile))
+
+    def test_bounded(self):
+        """memory is bounded and the rank error is small."""
+
+        # pylint: disable=protected-access
+
+        sketch = QuantileSketch(k=200, seed=1)
+
+        for i in self._values:
+            sketch.add(i)
+
+        self.assertEqual(sketch.count(), 20000)
+        self.assertFalse(sketch.exact())
+        self.assertTrue(sketch._size < 3 * 200 + 50)
+
+        for quantile in (0.01, 0.5, 0.95, 0.99):
+            self.assert_rank(sketch.quantile(quantile), quantile)
+
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+
+    def test_merge(self):
+        """merged sketches are as good as one big one."""
+
+        sketches = [QuantileSketch(seed=i) for i in range(4)]
+
+        for i, value in enumerate(self._values):
+            sketches[i % 4].add(value)
+
+        merged = QuantileSketch(seed=5)
+
+        for i in sketches:
+            merged.merge(i)
+
+        self.assertEqual(merged.count(), 20000)
+
+        for quantile in (0.5, 0.95, 0.99):
+            self.assert_rank(merged.percentile(quantile * 100), quantile)
+
+    def test_functions(self):
+        """as aggregation functions."""
+
+        small = self._values[:100]
+
+        # exact until the sketch has to compact.
+        for perc in (0, 25, 50, 95, 100):
+            self.assertEqual(
+                Functions.approx_percentile(perc)(small), Functions.percentile(perc)(small))
+
+        self.assertEqual(Functions.approx_median()(small), Functions.median()(small))
+        self.assertEqual(
+            Functions.approx_percentile(90, flt=Filters.ignore_missing)([None, 1, 2, 3]),
+            Functions.percentile(90, flt=Filters.ignore_missing)([None, 1, 2, 3]))
+
+        self.assert_rank(Functions.approx_percentile(95)(self._values), 0.95)
+
+        with self.assertRaises(FunctionException):
+            Functions.approx_percentile(101)
+
+        func = Functions.approx_percentile(99, k=100)
+        self.assertTrue(is_incremental(func))
+        self.assert_rank(accumulate(func, self._values).result(), 0.99)
+
+        # the sketches are seeded so the results are reproducible
+        self.assertEqual(
+            len(set(Functions.approx_percentile(95)(self._values) for _ in range(5))), 1)
+        self.assertEqual(accumulate(func, self._values).result(), func(self._values))
+        self.assertEqual(
+            Functions.approx_median(seed=3)(self._values),
+            Functions.approx_median(seed=3)(self._values))
+
+        # in a rollup
+        events = [Event(1429673400000 + 1000 * i, {'value': v})
+                  for i, v in enumerate(self._values[:3600])]
+        series = TimeSeries(dict(name='latency', events=events))
+
+        rollup = series.fixed_window_rollup(
+            '1h', dict(p95={'value': Functions.approx_percentile(95)}))
+
+        self.assertEqual(rollup.size(), 2)
+        self.assertTrue(rollup.at(0).get('p95') > 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Tests for the column oriented Collection.
+"""
+
+import array
+import datetime
+import unittest
+
+from collections import OrderedDict
+
+from pypond.collection import Collection
+from pypond.columnar import ColumnarCollection, MISSING
+from pypond.event import Event
+from pypond.exceptions import CollectionException
+from pypond.functions import Functions
+from pypond.index import Index
+from pypond.indexed_event import IndexedEvent
+from pypond.series import TimeSeries
+from pypond.util import dt_from_ms
+
+EVENT_LIST = [
+    Event(1429673400000, {'in': 1, 'out': 2.5}),
+    Event(1429673460000, {'in': 3, 'out': 4.5}),
+    Event(1429673520000, {'in': 5, 'out': 6.5, 'status': 'ok'}),
+]
+
+
+class TestColumnarCollection(unittest.TestCase):
+    """
+    Tests for the ColumnarCollection class.
+    """
+
+    def setUp(self):
+        self._col = ColumnarCollection(EVENT_LIST)
+
+    def test_storage(self):
+        """make sure things are stored in the appropriate columns."""
+
+        # pylint: disable=protected-access
+
+        self.assertEqual(self._col.size(), 3)
+        self.assertEqual(set(self._col.columns()), set(['in', 'out', 'status']))
+        self.assertTrue(isinstance(self._col.timestamps(), array.array))
+        self.assertEqual(self._col._columns['in'].typecode, 'q')
+        self.assertEqual(self._col._columns['out'].typecode, 'd')
+        self.assertEqual(self._col._columns['status'], [MISSING, MISSING, 'ok'])
+
+        self.assertEqual(self._col.column('status'), [None, None, 'ok'])
+        self.assertEqual(self._col.column('bogus'), [None, None, None])
+
+    def test_round_trip(self):
+        """events out should be the same as events in."""
+
+        for i, ii in zip(self._col.events(), EVENT_LIST):
+            self.assertTrue(Event.same(i, ii))
+
+        self.assertTrue(Event.same(self._col.at(-1), EVENT_LIST[-1]))
+        self.assertFalse('status' in self._col.at(0).data())
+
+        self.assertTrue(Collection.same(self._col, Collection(EVENT_LIST)))
+        self.assertTrue(Collection.same(Collection(self._col), Collection(EVENT_LIST)))
+
+        with self.assertRaises(CollectionException):
+            self._col.at(10)
+
+    def test_accessors(self):
+        """bisect, range, slice and friends."""
+
+        rng = self._col.range()
+        self.assertEqual(rng.begin(), dt_from_ms(1429673400000))
+        self.assertEqual(rng.end(), dt_from_ms(1429673520000))
+
+        self.assertTrue(self._col.is_chronological())
+        self.assertEqual(self._col.bisect(dt_from_ms(1429673470000)), 1)
+        self.assertEqual(self._col.at_time(dt_from_ms(1429673520000)).get('in'), 5)
+
+        sliced = self._col.slice(1, 3)
+        self.assertTrue(isinstance(sliced, ColumnarCollection))
+        self.assertEqual(sliced.size(), 2)
+        self.assertEqual(sliced.at_first().get('in'), 3)
+
+        added = self._col.add_event(Event(1429673580000, {'in': 7, 'other': True}))
+        self.assertEqual(added.size(), 4)
+        self.assertEqual(self._col.size(), 3)
+        self.assertEqual(added.at_last().get('other'), True)
+        self.assertEqual(added.at_first().get('other'), None)
+        self.assertEqual(added.column('out'), [2.5, 4.5, 6.5, None])
+
+        # pylint: disable=protected-access
+
+        # typed columns stay typed while the values fit
+        added = self._col.add_event(Event(1429673580000, {'in': 7, 'out': 8.5}))
+        self.assertEqual(added._columns['in'].typecode, 'q')
+        self.assertEqual(added._columns['out'].typecode, 'd')
+        self.assertEqual(added.column('in'), [1, 3, 5, 7])
+        self.assertEqual(self._col.column('in'), [1, 3, 5])
+
+        added = added.add_event(Event(1429673640000, {'in': 9.5}))
+        self.assertTrue(isinstance(added._columns['in'], list))
+        self.assertEqual(added.column('in'), [1, 3, 5, 7, 9.5])
+
+        added = ColumnarCollection().add_event(Event(1429673400000, {'in': 1, 'out': 2.5}))
+        self.assertEqual(added._columns['in'].typecode, 'q')
+        self.assertEqual(added._columns['out'].typecode, 'd')
+
+        unsorted = ColumnarCollection(list(reversed(EVENT_LIST)))
+        self.assertFalse(unsorted.is_chronological())
+        self.assertTrue(unsorted.sort_by_time().is_chronological())
+        self.assertEqual(unsorted.sort('in').column('in'), [1, 3, 5])
+
+    def test_aggregate(self):
+        """aggregation should be the same as the regular collection."""
+
+        coll = Collection(EVENT_LIST)
+
+        for func in (Functions.sum(), Functions.avg(), Functions.max(), Functions.min()):
+            self.assertEqual(self._col.aggregate(func, 'in'), coll.aggregate(func, 'in'))
+            self.assertEqual(self._col.aggregate(func, 'out'), coll.aggregate(func, 'out'))
+
+        self.assertEqual(self._col.count(), 3)
+        self.assertEqual(self._col.aggregate(Functions.keep(), 'status'), None)
+
+        self.assertEqual(ColumnarCollection().aggregate(Functions.sum(), 'in'), None)
+
+    def test_from_columns(self):
+        """create directly from columns."""
+
+        now = 1429673400000
+
+        col = ColumnarCollection.from_columns(
+            [now, now + 1000],
+            OrderedDict([('value', [1, 2]), ('deep', [{'a': 1}, MISSING])])
+        )
+
+        self.assertEqual(col.at(0).get('deep.a'), 1)
+        self.assertFalse('deep' in col.at(1).data())
+        self.assertEqual(col.sum(), 3)
+
+        with self.assertRaises(CollectionException):
+            ColumnarCollection.from_columns([now], {'value': [1, 2]})
+
+    def test_series(self):
+        """can be used as the collection of a TimeSeries."""
+
+        series = TimeSeries(dict(name='columnar', collection=self._col))
+        self.assertEqual(series.size(), 3)
+        self.assertEqual(series.sum('in'), 9)
+
+        crop = series.crop(series.range().set_begin(dt_from_ms(1429673460000)))
+        self.assertEqual(crop.size(), 1)
+        self.assertEqual(crop.at(0).get('in'), 3)
+
+    def test_bad_args(self):
+        """invalid events and args."""
+
+        with self.assertRaises(CollectionException):
+            ColumnarCollection([IndexedEvent(Index('1d-12355'), {'value': 1})])
+
+        with self.assertRaises(CollectionException):
+            ColumnarCollection('bogus')
+
+        with self.assertRaises(CollectionException):
+            self._col.add_event(IndexedEvent(Index('1d-12355'), {'value': 1}))
+
+        with self.assertRaises(CollectionException):
+            self._col.bisect(datetime.datetime.now())
+
+        with self.assertRaises(CollectionException):
+            ColumnarCollection.from_columns([1, 2, 3], {'in': [1, 2]})
+
+        with self.assertRaises(CollectionException):
+            self._col.at(100)
+
+        with self.assertRaises(CollectionException):
+            self._col.set_events('bogus')
+
+        with self.assertRaises(CollectionException):
+            self._col.aggregate('bogus', 'in')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,7 +18,10 @@ import unittest
 # prefer freeze over the data type specific functions
 from pyrsistent import freeze, thaw
 
-from pypond.event import Event
+from pypond.collection import Collection
+from pypond.columnar import ColumnarCollection
+from pypond.compact_event import CompactEvent, EventSchema
+from pypond.event import Event, field_accessor
 from pypond.exceptions import EventException
 from pypond.functions import Functions, Filters
 from pypond.index import Index
@@ -127,6 +130,27 @@ class TestRegularEventCreation(BaseTestEvent):
         with self.assertRaises(EventException):
             Event(str(self.msec), self.data)
 
+    def test_epoch_ms_storage(self):
+        """time is held as epoch ms and the datetime made on demand."""
+        # pylint: disable=protected-access
+
+        event = self._create_event(self.aware_ts, self.data)
+        msec = ms_from_dt(self.aware_ts)
+
+        self.assertEqual(event._d.get('time'), msec)
+        self.assertEqual(event.timestamp_ms(), msec)
+        self.assertEqual(event.key(), msec)
+        self.assertEqual(event.timestamp(), self.aware_ts)
+        self.assertTrue(Event.same(event, self._create_event(msec, self.data)))
+
+        # a pre-built payload with a datetime is converted.
+        event = Event(freeze(dict(time=self.aware_ts, data=self.data)))
+        self.assertEqual(event._d.get('time'), msec)
+
+        # other event types fall back to the datetime
+        self.assertEqual(
+            TimeRangeEvent((self.msec, self.msec + 1000), 1).timestamp_ms(), self.msec)
+
 
 class TestRegularEventAccess(BaseTestEvent):
     """
@@ -206,6 +230,23 @@ class TestRegularEventAccess(BaseTestEvent):
         with self.assertRaises(EventException):
             evt.get(['a', 'b'])
 
+    def test_field_accessor(self):
+        """compiled accessors are the same as get() and are cached."""
+        evt = self._create_event(self.aware_ts, DEEP_EVENT_DATA)
+
+        for path in ('NorthRoute.in', ['SouthRoute', 'out'], ('NorthRoute', 'out')):
+            self.assertEqual(field_accessor(path)(evt), evt.get(path))
+
+        self.assertEqual(field_accessor('NorthRoute.in')(evt), 123)
+
+        self.assertTrue(field_accessor('NorthRoute.in') is field_accessor('NorthRoute.in'))
+        self.assertTrue(field_accessor(['a']) is field_accessor(['a']))
+        self.assertEqual(field_accessor()(Event(self.msec, 5)), 5)
+        self.assertEqual(field_accessor('b')(CompactEvent(self.msec, {'a': 1, 'b': 2})), 2)
+
+        with self.assertRaises(EventException):
+            field_accessor('NorthRoute.in.deeper')(evt)
+
 
 class TestEventStaticMethods(BaseTestEvent):
     """
@@ -644,5 +685,70 @@ class TestTimeRangeEvent(BaseTestEvent):
         self.assertEqual(new_range.data(), dict(value=new_value))
         self.assertEqual(new_range.to_point()[1], new_value)
 
+
+class TestCompactEvent(BaseTestEvent):
+    """
+    Tests for the compact flat Event.
+    """
+
+    def test_same_as_event(self):
+        """behaves like the equivalent Event."""
+
+        compact = CompactEvent(self.msec, self.data)
+
+        self.assertTrue(isinstance(compact, Event))
+        self.assertEqual(compact.type(), Event)
+        self.assertEqual(compact.data(), self.canned_event.data())
+        self.assertEqual(compact.get('b'), 6)
+        self.assertEqual(compact.get('nope'), None)
+        self.assertEqual(compact.timestamp(), self.canned_event.timestamp())
+        self.assertEqual(compact.key(), self.msec)
+        self.assertEqual(compact.to_json(), self.canned_event.to_json())
+        self.assertEqual(compact.to_point(['c', 'a']), self.canned_event.to_point(['c', 'a']))
+        self.assertEqual(compact.stringify(), self.canned_event.stringify())
+
+        self.assertTrue(compact == self.canned_event)
+        self.assertTrue(self.canned_event == compact)
+        self.assertTrue(Event.same(compact, self.canned_event))
+        self.assertTrue(Event(compact) == self.canned_event)
+
+        self.assertEqual(CompactEvent(self.msec, 3).get(), 3)
+        self.assertEqual(CompactEvent(self.canned_event).to_json(), compact.to_json())
+
+        with self.assertRaises(EventException):
+            compact.get('a.b')
+
+        with self.assertRaises(EventException):
+            CompactEvent(self.msec, DEEP_EVENT_DATA)
+
+        # setting data that is not flat gives a regular event
+        self.assertTrue(isinstance(compact.set_data({'x': 1}), CompactEvent))
+        deep = compact.set_data(DEEP_EVENT_DATA)
+        self.assertFalse(isinstance(deep, CompactEvent))
+        self._test_deep_get(deep)
+
+        collapsed = compact.collapse(['a', 'c'], 'a_c', Functions.sum(), append=True)
+        self.assertEqual(collapsed.get('a_c'), 12)
+
+    def test_shared_schema(self):
+        """events with the same columns share a schema."""
+
+        schema = EventSchema.get(['in', 'out'])
+
+        events = [CompactEvent.from_values(self.msec + i, (i, i * 2), schema) for i in range(10)]
+        events.append(CompactEvent(self.msec + 10, {'in': 10, 'out': 20}))
+
+        self.assertTrue(all(i.schema() is schema for i in events))
+        self.assertEqual(schema.columns(), ('in', 'out'))
+        self.assertEqual(schema.position('out'), 1)
+
+        coll = Collection(events)
+        self.assertEqual(coll.aggregate(Functions.sum(), 'out'), 110)
+
+        # numeric columnar collections hand out compact events
+        columnar = ColumnarCollection(events)
+        self.assertTrue(isinstance(columnar.at(3), CompactEvent))
+        self.assertTrue(columnar.at(3) == events[3])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,510 @@
+#  Copyright (c) 2016, The Regents of the University of California,
+#  through Lawrence Berkeley National Laboratory (subject to receipt
+#  of any required approvals from the U.S. Dept. of Energy).
+#  All rights reserved.
+#
+#  This source code is licensed under the BSD-style license found in the
+#  LICENSE file in the root directory of this source tree.
+
+"""
+Tests for reading and writing series data.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from collections import OrderedDict
+
+from six import StringIO
+
+from pypond.collection import Collection
+from pypond.columnar import ColumnarCollection
+from pypond.event import Event
+from pypond.exceptions import PipelineIOException
+from pypond.functions import Functions
+from pypond.io import binary, gorilla
+from pypond.io.aio import AsyncCollectionOut, AsyncEventOut, AsyncStream
+from pypond.io.input import Stream
+from pypond.io.output import EventOut
+from pypond.io.wire import WireReader, WireWriter
+from pypond.pipeline import Pipeline
+from pypond.range import TimeRange
+from pypond.series import TimeSeries
+from pypond.util import dt_from_ms
+
+DATA = dict(
+    name="traffic",
+    columns=["time", "value", "status"],
+    points=[
+        [1400425947000, 52, "ok"],
+        [1400425948000, 18, "ok"],
+        [1400425949000, 26, "fail"],
+        [1400425950000, 93, "offline"]
+    ]
+)
+
+INDEXED = dict(
+    name="indexed",
+    index="1d-625",
+    columns=["index", "value"],
+    points=[
+        ["1d-16000", 1],
+        ["1d-16001", {"deep": 2.5}],
+    ]
+)
+
+
+class TestWire(unittest.TestCase):
+    """
+    Tests for the incremental wire format reader and writer.
+    """
+
+    def _round_trip(self, series, ndjson, read_size=65536, chunk_size=10000):
+        """write it out and read it back."""
+        out = StringIO()
+
+        with WireWriter(out, ndjson=ndjson) as writer:
+            writer.write_series(series)
+
+        reader = WireReader(
+            StringIO(out.getvalue()), ndjson=ndjson, read_size=read_size, chunk_size=chunk_size)
+
+        return out.getvalue(), reader
+
+    def test_round_trip(self):
+        """write and read both formats."""
+
+        for wire in (DATA, INDEXED):
+            series = TimeSeries(wire)
+
+            for ndjson in (False, True):
+                for read_size in (1, 7, 65536):
+                    text, reader = self._round_trip(series, ndjson, read_size, chunk_size=3)
+
+                    if not ndjson:
+                        self.assertEqual(json.loads(text), series.to_json())
+
+                    events = list(reader.events())
+                    self.assertEqual(len(events), series.size())
+
+                    for i, ii in zip(events, series.events()):
+                        self.assertEqual(i.to_json(), ii.to_json())
+
+                    self.assertEqual(reader.meta().get('name'), series.name())
+                    self.assertEqual(reader.columns()[0], wire['columns'][0])
+
+        # a series from points holds CompactEvents
+        points = TimeSeries(dict(
+            name='points', columns=['time', 'in', 'out'], points=[[1000, 1, 2], [2000, 3, 4]]))
+
+        for ndjson in (False, True):
+            _, reader = self._round_trip(points, ndjson)
+            self.assertEqual(reader.to_series().to_json(), points.to_json())
+
+        text, reader = self._round_trip(TimeSeries(DATA), True)
+        self.assertEqual(len(text.strip().split('\n')), 5)
+        self.assertEqual(reader.to_series().to_json(), TimeSeries(DATA).to_json())
+
+    def test_chunks(self):
+        """reading in chunks."""
+
+        events = [Event(1000 * i, {'value': i}) for i in range(25)]
+        series = TimeSeries(dict(name='chunks', events=events))
+
+        _, reader = self._round_trip(series, False, chunk_size=10)
+
+        sizes = [i.size() for i in reader.chunks()]
+        self.assertEqual(sizes, [10, 10, 5])
+
+        # into a stream
+        _, reader = self._round_trip(series, True)
+
+        results = list()
+        stream = Stream()
+
+        (
+            Pipeline()
+            .from_source(stream)
+            .window_by('10s')
+            .emit_on('discard')
+            .aggregate({'value': {'value': Functions.sum()}})
+            .to(EventOut, results.append)
+        )
+
+        reader.to_stream(stream)
+
+        self.assertEqual([i.get() for i in results], [45, 145])
+
+    def test_pipeline_output(self):
+        """the writer as a pipeline callback."""
+
+        out = StringIO()
+        series = TimeSeries(DATA)
+
+        with WireWriter(out, columns=['value'], name='doubled') as writer:
+            (
+                Pipeline()
+                .from_source(series)
+                .map(lambda e: e.set_data({'value': e.get() * 2}))
+                .to(EventOut, writer.add_event)
+            )
+
+        written = json.loads(out.getvalue())
+        self.assertEqual(written.get('name'), 'doubled')
+        self.assertEqual(written.get('columns'), ['time', 'value'])
+        self.assertEqual([i[1] for i in written.get('points')], [104, 36, 52, 186])
+
+        with self.assertRaises(PipelineIOException):
+            writer.add_event(Event(1000, 1))
+
+        # nothing written
+        out = StringIO()
+        WireWriter(out, name='empty').close()
+        self.assertEqual(TimeSeries(json.loads(out.getvalue())).size(), 0)
+
+    def test_bad_input(self):
+        """malformed files."""
+
+        for text in ('{"points": [[1, 2]', '["points"]', '{"points": [[1, 2]]}', '{"a" 1}'):
+            with self.assertRaises(PipelineIOException):
+                list(WireReader(StringIO(text)).events())
+
+        with self.assertRaises(PipelineIOException):
+            list(WireReader(StringIO('{"columns": ["time"]}\n[1, '), ndjson=True).events())
+
+        # columns after the points
+        reader = WireReader(StringIO('{"points": [[1000, 2]], "columns": ["time", "v"]}'))
+        self.assertEqual(list(reader.events())[0].get('v'), 2)
+
+        self.assertTrue(isinstance(next(WireReader(StringIO(
+            json.dumps(DATA))).chunks()), Collection))
+
+
+class TestBinary(unittest.TestCase):
+    """
+    Tests for the binary on-disk format.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'series.pond')
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def _round_trip(self, series, path=None):
+        """dump and load."""
+        path = path or self._path
+
+        with open(path, 'wb') as fh:
+            binary.dump(series, fh)
+
+        return binary.load(path)
+
+    def test_round_trip(self):
+        """mixed column types and metadata."""
+
+        events = [
+            Event(1400425947000, {'in': 1, 'out': 2.5, 'status': 'ok'}),
+            Event(1400425948000, {'in': 2, 'out': 3.0, 'nested': {'a': 1}}),
+            Event(1400425949000, {'in': 3, 'out': 0.5, 'status': None}),
+        ]
+
+        series = TimeSeries(dict(name='mixed', index='1d-16000', events=events))
+        loaded = self._round_trip(series)
+
+        self.assertEqual(loaded.to_json(), series.to_json())
+        self.assertEqual(loaded.index_as_string(), '1d-16000')
+
+        # numeric columns are views of the mapped file
+        coll = loaded.collection()
+        self.assertTrue(isinstance(coll, ColumnarCollection))
+        self.assertTrue(isinstance(coll.timestamps(), memoryview))
+        self.assertEqual(coll.column('in'), [1, 2, 3])
+        self.assertEqual(coll.column('status'), ['ok', None, None])
+        self.assertFalse('status' in coll.at(1).data())
+        self.assertEqual(coll.at(1).get('nested.a'), 1)
+
+        # and again from the loaded series (to another file, the mapped
+        # file can not be overwritten while it is in use)
+        again = self._round_trip(loaded, os.path.join(self._dir, 'again.pond'))
+        self.assertEqual(again.to_json(), series.to_json())
+
+    def test_wire_and_empty(self):
+        """from the wire format and empty."""
+
+        self.assertEqual(self._round_trip(TimeSeries(DATA)).to_json(), TimeSeries(DATA).to_json())
+        self.assertEqual(self._round_trip(TimeSeries(dict(name='empty', events=[]))).size(), 0)
+
+    def test_mapped_operations(self):
+        """at, bisect, crop and aggregation on the mapped series."""
+
+        events = [Event(1000 * i, {'value': i, 'half': i / 2.0}) for i in range(1000)]
+        loaded = self._round_trip(TimeSeries(dict(name='big', events=events)))
+
+        self.assertEqual(loaded.size(), 1000)
+        self.assertEqual(loaded.at(500).get(), 500)
+        self.assertEqual(loaded.bisect(dt_from_ms(250500)), 250)
+        self.assertEqual(loaded.sum(), sum(range(1000)))
+        self.assertEqual(loaded.max('half'), 499.5)
+
+        cropped = loaded.crop(TimeRange(100000, 200000))
+        self.assertEqual(cropped.size(), 100)
+        self.assertEqual(cropped.at(0).get(), 100)
+        self.assertEqual(loaded.range().to_json(), [0, 999000])
+
+        rollup = loaded.fixed_window_rollup('100s', dict(value={'value': Functions.sum()}))
+        self.assertEqual(rollup.size(), 10)
+
+    def test_bad_input(self):
+        """not binary series."""
+
+        with self.assertRaises(PipelineIOException):
+            binary.loads(b'{"name": "not binary"}')
+
+        with open(self._path, 'wb') as fh:
+            binary.dump(TimeSeries(DATA), fh)
+
+        with open(self._path, 'rb') as fh:
+            data = fh.read()
+
+        with self.assertRaises(PipelineIOException):
+            binary.loads(data[:-16])
+
+        open(self._path, 'wb').close()
+
+        with self.assertRaises(PipelineIOException):
+            binary.load(self._path)
+
+        with self.assertRaises(PipelineIOException):
+            binary.dump(TimeSeries(INDEXED), StringIO())
+
+
+class TestGorilla(unittest.TestCase):
+    """
+    Tests for the Gorilla style compression.
+    """
+
+    def setUp(self):
+        # regular counters and slowly changing gauges
+        self._events = [
+            Event(1429673400000 + 30000 * i, {
+                'count': 1000 + 17 * i,
+                'gauge': 20.0 + (i // 10) * 0.25,
+                'status': 'ok' if i % 50 else 'restart',
+            }) for i in range(500)
+        ]
+
+        self._series = TimeSeries(dict(name='counters', index='1d-16000', events=self._events))
+
+    def test_round_trip(self):
+        """encode and decode series and collections."""
+
+        data = gorilla.encode(self._series)
+        self.assertTrue(len(data) < len(json.dumps(self._series.to_json())) / 4)
+
+        decoded = gorilla.decode(data)
+        self.assertTrue(isinstance(decoded, TimeSeries))
+        self.assertEqual(decoded.to_json(), self._series.to_json())
+
+        decoded = gorilla.decode(gorilla.encode(self._series.collection()))
+        self.assertTrue(isinstance(decoded, ColumnarCollection))
+        self.assertEqual(
+            [i.to_json() for i in decoded.events()], [i.to_json() for i in self._events])
+
+        # awkward values
+        events = [
+            Event(5, {'a': 2 ** 62, 'b': float('inf')}),
+            Event(1000000, {'a': -2 ** 62, 'b': 5e-324}),
+            Event(1000001, {'a': 0, 'b': -0.0}),
+            Event(2 ** 40, {'a': 7, 'b': 1e300, 'c': 'sometimes'}),
+        ]
+
+        decoded = gorilla.decode(gorilla.encode(Collection(events)))
+        self.assertEqual(
+            [i.to_json() for i in decoded.events()], [i.to_json() for i in events])
+
+        self.assertEqual(gorilla.decode(gorilla.encode(Collection([]))).size(), 0)
+
+        # empty series come back the same
+        empty = [
+            TimeSeries(dict(name='empty', columns=['time', 'in'], points=[])),
+            TimeSeries(dict(name='empty', collection=ColumnarCollection.from_columns(
+                [], OrderedDict([('in', []), ('out', [])])))),
+        ]
+
+        for series in empty:
+            decoded = gorilla.decode(gorilla.encode(series))
+            self.assertEqual(decoded.to_json(), series.to_json())
+            self.assertEqual(decoded.columns(), series.columns())
+            self.assertEqual(type(decoded.collection()), type(series.collection()))
+
+        self.assertEqual(decoded.collection().columns(), ['in', 'out'])
+
+    def test_streaming_source(self):
+        """decompress while processing."""
+
+        cold = gorilla.CompressedSeries(self._series)
+
+        self.assertEqual(cold.size(), 500)
+        self.assertEqual(cold.meta().get('name'), 'counters')
+        self.assertEqual(set(cold.columns()), set(['count', 'gauge', 'status']))
+
+        events = cold.events()
+        self.assertEqual(next(events).to_json(), self._events[0].to_json())
+
+        rollup = dict(gauge={'gauge': Functions.avg()}, count={'count': Functions.max()})
+
+        results = (
+            Pipeline()
+            .from_source(cold)
+            .window_by('1h')
+            .emit_on('discard')
+            .aggregate(rollup)
+            .to_event_list()
+        )
+
+        expected = self._series.fixed_window_rollup('1h', rollup)
+
+        self.assertEqual(
+            [i.to_json() for i in results], [i.to_json() for i in expected.events()])
+
+        # from persisted bytes
+        again = gorilla.CompressedSeries(cold.to_bytes())
+        self.assertEqual(again.decode().to_json(), self._series.to_json())
+
+        with self.assertRaises(PipelineIOException):
+            gorilla.CompressedSeries(b'not compressed')
+
+        with self.assertRaises(PipelineIOException):
+            gorilla.encode(TimeSeries(INDEXED))
+
+
+class TestAsyncStream(unittest.TestCase):
+    """
+    Tests for the asyncio stream and outputs.
+    """
+
+    def setUp(self):
+        self._loop = asyncio.new_event_loop()
+        self._events = [Event(1000 * i, {'value': i}) for i in range(20)]
+
+    def tearDown(self):
+        self._loop.close()
+
+    def _run(self, coro):
+        """run a coroutine to completion."""
+        return self._loop.run_until_complete(coro)
+
+    def test_backpressure(self):
+        """a slow coroutine callback blocks the producer."""
+
+        results = list()
+        sizes = list()
+
+        stream = AsyncStream(maxsize=3)
+
+        async def slow(event):
+            """the slow consumer."""
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            results.append(event.get())
+
+        Pipeline().from_source(stream).map(
+            lambda e: e.set_data({'value': e.get() * 2})).to(AsyncEventOut, slow)
+
+        async def produce():
+            """the producer."""
+            task = asyncio.ensure_future(stream.run())
+
+            for i in self._events:
+                await stream.put(i)
+                sizes.append(stream.qsize())
+
+            await stream.close()
+            await task
+
+        self._run(produce())
+
+        self.assertEqual(results, [2 * i for i in range(20)])
+        self.assertEqual(max(sizes), 3)
+        self.assertEqual(stream.dropped(), 0)
+
+        with self.assertRaises(PipelineIOException):
+            stream.add_event(self._events[0])
+
+    def test_overflow(self):
+        """drop oldest and newest events when the queue is full."""
+
+        for overflow, expected in (('drop_oldest', list(range(15, 20))),
+                                   ('drop_newest', list(range(5)))):
+            results = list()
+            stream = AsyncStream(maxsize=5, overflow=overflow)
+
+            Pipeline().from_source(stream).to(AsyncEventOut, results.append)
+
+            # nothing is processed until the stream is run
+            for i in self._events:
+                stream.add_event(i)
+
+            self.assertEqual(stream.dropped(), 15)
+
+            async def consume():
+                """process and close."""
+                task = asyncio.ensure_future(stream.run())
+                await stream.close()
+                await task
+
+            self._run(consume())
+
+            self.assertEqual([i.get() for i in results], expected)
+
+        stream = AsyncStream(maxsize=1)
+        stream.add_event(self._events[0])
+
+        with self.assertRaises(PipelineIOException):
+            stream.add_event(self._events[1])
+
+        with self.assertRaises(PipelineIOException):
+            AsyncStream(overflow='sometimes')
+
+    def test_collection_out(self):
+        """coroutine collection callback and a flush at close."""
+
+        results = dict()
+        stream = AsyncStream()
+
+        async def collect(collection, window_key, group_by):  # pylint: disable=unused-argument
+            """collect the windows."""
+            await asyncio.sleep(0)
+            results[window_key] = collection.size()
+
+        (
+            Pipeline()
+            .from_source(stream)
+            .window_by('5s')
+            .emit_on('discard')
+            .to(AsyncCollectionOut, collect)
+        )
+
+        async def produce():
+            """the producer."""
+            task = asyncio.ensure_future(stream.run())
+
+            for i in self._events[:12]:
+                await stream.put(i)
+
+            await stream.close()
+            await task
+
+        self._run(produce())
+
+        self.assertEqual(results, {'5s-0': 5, '5s-1': 5, '5s-2': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,11 +6,13 @@ Tests for the pipeline.
 # pylint: disable=too-many-lines
 
 import datetime
+import threading
 import unittest
 import warnings
 
 import pytz
 
+from pypond.collection import Collection
 from pypond.event import Event
 from pypond.exceptions import (
     PipelineException,
@@ -20,9 +22,9 @@ from pypond.exceptions import (
 )
 from pypond.functions import Functions
 from pypond.indexed_event import IndexedEvent
-from pypond.io.input import Stream
+from pypond.io.input import Stream, ThreadedStream
 from pypond.io.output import CollectionOut, EventOut
-from pypond.pipeline import Pipeline
+from pypond.pipeline import Pipeline, Runner
 from pypond.processor import (
     Aggregator,
     Collapser,
@@ -382,6 +384,96 @@ class TestFilterAndTake(BaseTestPipeline):
         self.assertEqual(kcol.get('all').at(8).value(), 88)
         self.assertEqual(kcol.get('all').at(9).value(), 94)
 
+    def test_processor_chain(self):
+        """the chain runs from the last processor back to the input."""
+
+        timeseries = TimeSeries(SEPT_2014_DATA)
+
+        for length in range(1, 5):
+            pipeline = Pipeline().from_source(timeseries)
+
+            for _ in range(length):
+                pipeline = pipeline.offset_by(1)
+
+            chain = pipeline.last().chain()
+
+            # a longer chain used to come back as None
+            self.assertEqual(len(chain), length + 1)
+            self.assertTrue(chain[0] is pipeline.last())
+            self.assertTrue(chain[-1] is pipeline.input())
+
+            self.assertEqual(
+                pipeline.to_event_list()[0].value(), timeseries.at(0).value() + length)
+
+    def test_chunked_chain(self):
+        """stateless and stateful processors over chunks of events."""
+
+        timeseries = TimeSeries(SEPT_2014_DATA)
+
+        def run():
+            """a long chain, with a stateful take() in the middle."""
+            return [
+                i.to_json() for i in (
+                    Pipeline()
+                    .from_source(timeseries)
+                    .map(lambda e: e.set_data({'in': e.value(), 'out': e.value() * 2}))
+                    .filter(lambda e: e.get('in') > 65)
+                    .collapse(['in', 'out'], 'total', Functions.sum(), append=True)
+                    .take(25)
+                    .select(['in', 'total'])
+                    .offset_by(1, 'total')
+                    .as_indexed_events(dict(duration='1h'))
+                    .to_event_list()
+                )
+            ]
+
+        chunk_size = Runner.chunk_size
+
+        try:
+            Runner.chunk_size = 1
+            expected = run()
+
+            for size in (7, 1000):
+                Runner.chunk_size = size
+                self.assertEqual(run(), expected)
+        finally:
+            Runner.chunk_size = chunk_size
+
+        self.assertEqual(len(expected), 25)
+        self.assertEqual(expected[0]['data']['total'], 80 + 160 + 1)
+
+    def test_fused_chain(self):
+        """runs of stateless processors are fused into one stage."""
+
+        events = [
+            Event(1000 * i, {'in': i, 'out': 2 * i, 'deep': {'v': 3}}) for i in range(10)
+        ]
+
+        pipeline = (
+            Pipeline()
+            .from_source(TimeSeries(dict(name='fused', events=events)))
+            .collapse(['in', 'out', 'deep.v'], 'total', Functions.sum(), append=True)
+            .select(['in', 'out', 'total'])
+            .offset_by(1, ['in', 'total'])
+            .filter(lambda e: e.get('in') % 2)
+            .map(lambda e: e.set_data({'in': e.get('in'), 'total': e.get('total') * 10}))
+            .collapse(['in', 'total'], 'both', Functions.max())
+            .take(3)
+            .select('both')
+        )
+
+        results = pipeline.to_event_list()
+
+        self.assertEqual([i.get('both') for i in results], [40, 100, 160])
+        self.assertEqual(type(results[0]), Event)
+
+        # two fused stages either side of the take
+        runner = Runner(pipeline, EventOut(pipeline))
+        # pylint: disable=protected-access
+        self.assertEqual(
+            [type(i).__name__ for i in runner._execution_chain[1:]],
+            ['Selector', 'Taker', 'Fused'])
+
     def test_take_and_group_by(self):
         """take events with different group by keys."""
 
@@ -800,6 +892,402 @@ class TestAggregator(BaseTestPipeline):
         self.assertEqual(RESULTS.get('1426298400000').get('in_avg'), 4.5)
         self.assertEqual(RESULTS.get('1426298400000').get('out_avg'), 8)
 
+    def test_sliding_window(self):
+        """aggregate over overlapping windows."""
+
+        events = [Event(1000 * i, {'value': i}) for i in range(60)]
+
+        sliding = Capsule(type='sliding', duration='30s', slide='10s')
+
+        def expected(begin):
+            """sum of the values in the 30s window starting at begin"""
+            return sum(i for i in range(60) if begin <= 1000 * i < begin + 30000)
+
+        # incremental and collection based aggregations
+        for func in (Functions.sum(), lambda values: sum(values)):  # pylint: disable=unnecessary-lambda
+            uin = Stream()
+            results = list()
+
+            (
+                Pipeline()
+                .from_source(uin)
+                .window_by(sliding)
+                .emit_on('discard')
+                .aggregate({'total': {'value': func}})
+                .to(EventOut, results.append)
+            )
+
+            for i in events[:45]:
+                uin.add_event(i)
+
+            # windows up to 10s-40s are complete
+            self.assertEqual(
+                [i.to_json().get('timerange') for i in results],
+                [[-20000, 10000], [-10000, 20000], [0, 30000], [10000, 40000]])
+
+            for i in events[45:]:
+                uin.add_event(i)
+
+            uin.stop()
+
+            self.assertEqual(len(results), 8)
+            self.assertTrue(all(isinstance(i, TimeRangeEvent) for i in results))
+
+            for i in results:
+                self.assertEqual(i.get('total'), expected(i.to_json().get('timerange')[0]))
+
+        # grouped and in batch
+        results = (
+            Pipeline()
+            .from_source(TimeSeries(dict(name='events', events=events)))
+            .window_by(sliding)
+            .group_by(lambda e: e.get() % 2)
+            .emit_on('flush')
+            .aggregate({'total': {'value': Functions.count()}})
+            .to_event_list()
+        )
+
+        self.assertEqual(len(results), 16)
+        self.assertEqual(results[4].to_json().get('timerange'), [0, 30000])
+        self.assertEqual(results[4].get('total'), 15)
+
+        # the duration needs to be a multiple of the slide
+        with self.assertRaises(PipelineException):
+            Pipeline().window_by(Capsule(type='sliding', duration='30s', slide='7s'))
+
+        with self.assertRaises(PipelineException):
+            Pipeline().window_by(Capsule(type='sliding', duration='30s'))
+
+    def test_session_window(self):
+        """aggregate bursts of events for each group."""
+
+        # host a: bursts at 0-4s and 60-62s, host b: 1-3s and 20s
+        events = [Event(1000 * i, {'host': 'a', 'value': i}) for i in (0, 2, 4, 60, 62)]
+        events += [Event(1000 * i, {'host': 'b', 'value': i}) for i in (1, 3, 20)]
+        events.sort(key=lambda e: e.timestamp_ms())
+
+        for func in (Functions.sum(), lambda values: sum(values)):  # pylint: disable=unnecessary-lambda
+            uin = Stream()
+            results = list()
+
+            (
+                Pipeline()
+                .from_source(uin)
+                .window_by(Capsule(type='session', gap='10s'))
+                .group_by('host')
+                .emit_on('discard')
+                .aggregate({'total': {'value': func}})
+                .to(EventOut, results.append)
+            )
+
+            for i in events:
+                uin.add_event(i)
+
+            # the first burst of each host ends at 60s, the last two are open
+            self.assertEqual(
+                [(i.to_json().get('timerange'), i.get('total')) for i in results],
+                [([0, 4000], 6), ([1000, 3000], 4), ([20000, 20000], 20)])
+
+            uin.stop()
+
+            self.assertEqual(len(results), 4)
+            self.assertEqual(results[-1].to_json().get('timerange'), [60000, 62000])
+            self.assertEqual(results[-1].get('total'), 122)
+
+            # and the memory is freed
+            aggregator = uin._observers[0]  # pylint: disable=protected-access
+            self.assertEqual(len(aggregator._collector._collections), 1)  # pylint: disable=protected-access
+
+        # events from before the open session
+        late = [Event(1000 * i, {'value': i}) for i in (60, 62, 0, 2, 30, 5)]
+
+        for emit_on, expected, dropped in (
+                ('flush', [([0, 5000], 7), ([30000, 30000], 30), ([60000, 62000], 122)], 0),
+                ('discard', [([60000, 62000], 122)], 4)):
+            uin = Stream()
+            results = list()
+
+            pipeline = (
+                Pipeline()
+                .from_source(uin)
+                .window_by(Capsule(type='session', gap='10s'))
+                .emit_on(emit_on)
+                .aggregate({'total': {'value': Functions.sum()}})
+            )
+
+            pipeline.to(EventOut, results.append)
+
+            for i in late:
+                uin.add_event(i)
+
+            uin.stop()
+
+            self.assertEqual(
+                sorted((i.to_json().get('timerange'), i.get('total')) for i in results),
+                expected)
+            self.assertEqual(pipeline.dropped_events(), dropped)
+
+        with self.assertRaises(PipelineException):
+            Pipeline().window_by(Capsule(type='session'))
+
+    def test_discard_many_groups(self):
+        """closing a fixed window emits just its groups."""
+
+        uin = Stream()
+        results = list()
+
+        (
+            Pipeline()
+            .from_source(uin)
+            .window_by('1m')
+            .group_by('host')
+            .emit_on('discard')
+            .aggregate({'total': {'value': Functions.sum()}})
+            .to(EventOut, results.append)
+        )
+
+        for minute in range(3):
+            for host in range(100):
+                uin.add_event(Event(60000 * minute + host, {'host': host, 'value': minute}))
+
+        self.assertEqual(len(results), 200)
+        self.assertEqual(set(i.index_as_string() for i in results), set(['1m-0', '1m-1']))
+        self.assertEqual([i.get('total') for i in results[100:]], [1] * 100)
+
+        # only the open window is held on to
+        collector = uin._observers[0]._collector  # pylint: disable=protected-access
+        self.assertEqual(list(collector._windows.keys()), ['1m-2'])  # pylint: disable=protected-access
+        self.assertEqual(len(collector._collections), 100)  # pylint: disable=protected-access
+
+    def test_emit_changed(self):
+        """only emit the collections that change."""
+
+        events = [
+            Event(60000 * (i // 20) + i, {'host': i % 5, 'value': i}) for i in range(60)
+        ]
+
+        def current_view(emit_on, window):
+            """keep the latest collection for each window/group."""
+            view = dict()
+            count = [0]
+
+            def cback(collection, window_key, group_by_key):
+                """callback to pass in."""
+                view[(window_key, group_by_key)] = collection.aggregate(Functions.sum(), 'value')
+                count[0] += 1
+
+            uin = Stream()
+
+            (
+                Pipeline()
+                .from_source(uin)
+                .window_by(window)
+                .group_by('host')
+                .emit_on(emit_on)
+                .to(CollectionOut, cback)
+            )
+
+            for i in events:
+                uin.add_event(i)
+
+            return view, count[0]
+
+        for window in ('1m', Capsule(type='session', gap='30s')):
+            each_view, each_count = current_view('eachEvent', window)
+            changed_view, changed_count = current_view('changed', window)
+
+            self.assertEqual(changed_view, each_view)
+            self.assertEqual(len(changed_view), 15)
+            self.assertEqual(changed_count, 60)
+            self.assertTrue(each_count > changed_count * 5)
+
+    def test_allowed_lateness(self):
+        """windows stay open for out of order events."""
+
+        # every third event is 3s late, then one that is very late
+        times = [1000 * i - (3000 if i % 3 == 0 else 0) for i in range(4, 40)] + [12000]
+        events = [Event(t, {'value': 1}) for t in times]
+
+        def run(lateness, window='10s'):
+            """aggregate the jittered events."""
+            uin = Stream()
+            results = list()
+
+            pipeline = (
+                Pipeline()
+                .from_source(uin)
+                .window_by(window)
+                .emit_on('discard')
+                .allowed_lateness(lateness)
+                .aggregate({'count': {'value': Functions.count()}})
+                .to(EventOut, results.append)
+            )
+
+            for i in events:
+                uin.add_event(i)
+
+            return results, pipeline.dropped_events()
+
+        results, dropped = run('5s')
+
+        # the windows are only emitted once all the late events are in.
+        self.assertEqual(
+            [(i.index_as_string(), i.get('count')) for i in results],
+            [('10s-0', 7), ('10s-1', 10), ('10s-2', 10)])
+        self.assertEqual(dropped, 1)
+
+        # without lateness, late events reopen windows
+        results, dropped = run(None)
+        self.assertTrue(len(results) > 3)
+        self.assertEqual(dropped, 0)
+
+        results, dropped = run('5s', Capsule(type='sliding', duration='20s', slide='10s'))
+        self.assertEqual(
+            [i.get('count') for i in results], [7, 17, 20])
+        self.assertEqual(dropped, 1)
+
+        # batch runs go through clones of the processors
+        batch = (
+            Pipeline()
+            .from_source(Collection(events))
+            .window_by('10s')
+            .emit_on('discard')
+            .allowed_lateness('5s')
+        )
+
+        aggregate = batch.aggregate({'count': {'value': Functions.count()}})
+        results = list()
+        aggregate.to(EventOut, results.append)
+
+        # and the last window is flushed at the end
+        self.assertEqual([i.get('count') for i in results], [7, 10, 10, 9])
+        self.assertEqual(aggregate.dropped_events(), 1)
+
+        self.assertEqual(sorted(batch.to_keyed_collections().keys()), ['10s-0', '10s-1', '10s-2', '10s-3'])
+        self.assertEqual(batch.dropped_events(), 1)
+
+        grouped = (
+            Pipeline()
+            .from_source(Collection([Event(t, {'host': t // 1000 % 2, 'value': 1}) for t in times]))
+            .group_by('host')
+            .window_by('10s')
+            .emit_on('discard')
+            .allowed_lateness('5s')
+            .aggregate({'count': {'value': Functions.count()}})
+        )
+
+        serial = len(grouped.to_event_list())
+        dropped = grouped.dropped_events()
+        self.assertTrue(dropped > 0)
+
+        grouped = grouped.parallel(2)
+        self.assertEqual(len(grouped.to_event_list()), serial)
+        self.assertEqual(grouped.dropped_events(), dropped)
+
+        # and several pipelines run together
+        other = batch.aggregate({'total': {'value': Functions.sum()}})
+
+        results = Pipeline.to_many([
+            (aggregate, EventOut, None),
+            (other, EventOut, None),
+        ])
+
+        self.assertEqual([i.get('count') for i in results[0]], [7, 10, 10, 9])
+        self.assertEqual(aggregate.dropped_events(), 1)
+        self.assertEqual(other.dropped_events(), 1)
+
+        with self.assertRaises(PipelineException):
+            Pipeline().allowed_lateness('soon')
+
+    def test_to_many(self):
+        """branches off a base pipeline share the upstream processing."""
+
+        events = [Event(60000 * i, {'in': i, 'out': 2 * i}) for i in range(180)]
+        series = TimeSeries(dict(name='fan out', events=events))
+
+        calls = list()
+
+        def count(event):
+            """count the calls to the shared map."""
+            calls.append(event)
+            return event
+
+        base = (
+            Pipeline()
+            .from_source(series)
+            .map(count)
+            .collapse(['in', 'out'], 'total', Functions.sum())
+        )
+
+        def rollup(duration):
+            """windowed rollup of the base."""
+            return (
+                base
+                .window_by(duration)
+                .emit_on('discard')
+                .aggregate({'total': {'total': Functions.sum()}})
+            )
+
+        five_minute = list()
+
+        results = Pipeline.to_many([
+            (rollup('5m'), EventOut, five_minute.append),
+            (rollup('1h'), EventOut, None),
+            (base.filter(lambda e: e.get('total') > 500), EventOut, None),
+            (base.take(3), CollectionOut, None, Options()),
+        ])
+
+        # the source was read and mapped once
+        self.assertEqual(len(calls), 180)
+
+        self.assertEqual(results[0], None)
+        self.assertEqual(len(five_minute), 36)
+        self.assertEqual(five_minute[1].get('total'), 3 * sum(range(5, 10)))
+
+        self.assertEqual([i.get('total') for i in results[1]],
+                         [3 * sum(range(60 * i, 60 * i + 60)) for i in range(3)])
+
+        self.assertEqual(len(results[2]), 13)
+        self.assertEqual(results[3].get('all').size(), 3)
+
+        # same results as running the pipelines one at a time
+        del calls[:]
+
+        self.assertEqual(
+            [i.to_json() for i in rollup('1h').to_event_list()],
+            [i.to_json() for i in results[1]])
+
+        self.assertEqual(len(calls), 180)
+
+        # several outputs on the same pipeline get their own results
+        filtered = base.filter(lambda e: e.get('total') > 500)
+
+        results = Pipeline.to_many([
+            (filtered, EventOut, None),
+            (filtered, EventOut, None),
+            (filtered, CollectionOut, None),
+        ])
+
+        self.assertEqual(len(results[0]), 13)
+        self.assertEqual(len(results[1]), 13)
+        self.assertFalse(results[0] is results[1])
+        self.assertEqual(results[2].get('all').size(), 13)
+
+        # parallel() is not supported
+        with warnings.catch_warnings(record=True) as wrn:
+            warnings.simplefilter('always')
+
+            results = Pipeline.to_many([
+                (rollup('1h').parallel(2), EventOut, None),
+                (rollup('5m'), EventOut, None),
+            ])
+
+            self.assertEqual(len(wrn), 1)
+            self.assertTrue(issubclass(wrn[0].category, PipelineWarning))
+
+        self.assertEqual(len(results[0]), 3)
+        self.assertEqual(len(results[1]), 36)
+
     def test_bad_args(self):
         """Trigger exceptions and warnings, etc."""
 
@@ -925,6 +1413,127 @@ class TestAggregator(BaseTestPipeline):
             Mapper(pip)
 
 
+class TestParallelRunner(BaseTestPipeline):
+    """
+    Tests for running group_by pipelines in parallel.
+    """
+
+    def setUp(self):
+        super(TestParallelRunner, self).setUp()
+
+        events = [Event(1000 * i, {'host': 'h{0}'.format(i % 7), 'value': i}) for i in range(600)]
+        self._series = TimeSeries(dict(name='hosts', events=events))
+
+    def test_parallel(self):
+        """the results match the serial runner."""
+
+        aggregate = (
+            Pipeline()
+            .from_source(self._series)
+            .group_by('host')
+            .window_by('1m')
+            .emit_on('discard')
+            .aggregate({'total': {'value': Functions.sum()}, 'n': {'value': Functions.count()}})
+        )
+
+        serial = aggregate.to_event_list()
+        parallel = aggregate.parallel(3).to_event_list()
+
+        self.assertEqual(len(serial), 70)
+        self.assertEqual(
+            sorted((i.index_as_string(), i.get('total')) for i in serial),
+            sorted((i.index_as_string(), i.get('total')) for i in parallel))
+
+        keyed = (
+            Pipeline().from_source(self._series).group_by('host').window_by('1m').emit_on('flush')
+        )
+
+        serial = keyed.to_keyed_collections()
+        parallel = keyed.parallel(4).to_keyed_collections()
+
+        self.assertEqual(len(serial), 70)
+        self.assertEqual(set(serial.keys()), set(parallel.keys()))
+
+        for k in serial:
+            self.assertEqual(serial[k].to_json(), parallel[k].to_json())
+
+        # per event processing keeps the order
+        take = Pipeline().from_source(self._series).group_by('host').take(10)
+
+        self.assertEqual(
+            [i.to_json() for i in take.to_event_list()],
+            [i.to_json() for i in take.parallel(2).to_event_list()])
+
+        # and to a callback
+        results = list()
+        take.parallel(2).to(EventOut, results.append)
+        self.assertEqual(len(results), 70)
+
+    def test_serial_fallback(self):
+        """pipelines that can not be partitioned."""
+
+        # eachEvent re-emits the windows of every group
+        events = [Event(1000 * i, {'host': 'h{0}'.format(i % 4), 'value': i}) for i in range(40)]
+
+        each_event = (
+            Pipeline()
+            .from_source(TimeSeries(dict(name='each', events=events)))
+            .group_by('host')
+            .window_by('10s')
+            .aggregate({'total': {'value': Functions.sum()}})
+        )
+
+        with warnings.catch_warnings(record=True) as wrn:
+            warnings.simplefilter('always')
+
+            serial = each_event.to_event_list()
+            parallel = each_event.parallel(2).to_event_list()
+
+            self.assertEqual(len(wrn), 1)
+            self.assertTrue(issubclass(wrn[0].category, PipelineWarning))
+
+        self.assertEqual(len(serial), 392)
+        self.assertEqual([i.to_json() for i in serial], [i.to_json() for i in parallel])
+
+        with warnings.catch_warnings(record=True) as wrn:
+            warnings.simplefilter('always')
+
+            results = (
+                Pipeline()
+                .from_source(self._series)
+                .take(20)
+                .group_by('host')
+                .take(2)
+                .parallel(2)
+                .to_event_list()
+            )
+
+            self.assertEqual(len(wrn), 1)
+            self.assertTrue(issubclass(wrn[0].category, PipelineWarning))
+
+        self.assertEqual(len(results), 14)
+
+        # rate() uses the previous event of any group
+        rate = (
+            Pipeline()
+            .from_source(TimeSeries(dict(name='rate', events=events)))
+            .group_by('host')
+            .rate('value')
+        )
+
+        with warnings.catch_warnings(record=True) as wrn:
+            warnings.simplefilter('always')
+
+            serial = rate.to_event_list()
+            parallel = rate.parallel(2).to_event_list()
+
+            self.assertEqual(len(wrn), 1)
+            self.assertTrue(issubclass(wrn[0].category, PipelineWarning))
+
+        self.assertEqual(len(serial), 39)
+        self.assertEqual([i.to_json() for i in serial], [i.to_json() for i in parallel])
+
+
 class TestConverter(BaseTestPipeline):
     """
     Tests for the Converter processor
@@ -1437,5 +2046,94 @@ class TestOffsetPipeline(BaseTestPipeline):
 
         self.assertEqual(RESULTS.size(), 3)
 
+    def test_threaded_stream(self):
+        """several producer threads feeding one pipeline."""
+
+        results = list()
+        threads = set()
+
+        def cback(event):
+            """record the event and the thread it was output on."""
+            results.append(event.get())
+            threads.add(threading.current_thread().name)
+
+        source = ThreadedStream(batch_size=16, maxsize=10)
+
+        (
+            Pipeline()
+            .from_source(source)
+            .filter(lambda e: e.get() % 2 == 0)
+            .map(lambda e: e.set_data({'value': e.get() * 10}))
+            .to(EventOut, cback)
+        )
+
+        def produce(offset):
+            """add 250 events."""
+            for i in range(250):
+                source.add_event(Event(offset + i, {'value': offset + i}))
+
+        producers = [
+            threading.Thread(target=produce, args=(1000 * i,)) for i in range(4)
+        ]
+
+        for i in producers:
+            i.start()
+
+        for i in producers:
+            i.join()
+
+        source.stop()
+
+        expected = [10 * i for i in range(4000) if i % 1000 < 250 and i % 2 == 0]
+        self.assertEqual(sorted(results), expected)
+        self.assertEqual(len(threads), 1)
+        self.assertFalse(threading.current_thread().name in threads)
+
+        # stopped
+        with self.assertRaises(PipelineIOException):
+            source.add_event(Event(5000, 1))
+
+        self.assertEqual(len(results), 500)
+
+        # stopped while the producers are adding events - every event
+        # that was added is processed, the rest are refused.
+        del results[:]
+        added = list()
+
+        source = ThreadedStream(batch_size=8, maxsize=5)
+        Pipeline().from_source(source).to(EventOut, cback)
+
+        def race():
+            """add events until the stream is stopped."""
+            try:
+                for i in range(10000):
+                    source.add_event(Event(i, i))
+                    added.append(i)
+            except PipelineIOException:
+                pass
+
+        producers = [threading.Thread(target=race) for _ in range(4)]
+
+        for i in producers:
+            i.start()
+
+        source.stop()
+
+        for i in producers:
+            i.join()
+
+        self.assertEqual(len(results), len(added))
+
+        # an exception in the pipeline is raised by stop()
+        source = ThreadedStream()
+
+        Pipeline().from_source(source).map(lambda e: e.get() / 0).to(EventOut, cback)
+
+        source.add_event(Event(5000, 1))
+
+        with self.assertRaises(PipelineIOException):
+            source.stop()
+
+
 if __name__ == '__main__':
     unittest.main()
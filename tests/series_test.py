@@ -15,10 +15,16 @@ Also including tests for Collection class since they are tightly bound.
 import copy
 import datetime
 import json
+import threading
 import unittest
 import warnings
 
+from pyrsistent import thaw
+
+import pypond.functions
+
 from pypond.collection import Collection
+from pypond.columnar import ColumnarCollection
 from pypond.event import Event
 from pypond.exceptions import (
     CollectionException,
@@ -332,6 +338,46 @@ class TestTimeSeries(SeriesBase):
         new_ts = self._canned_event_series.set_name('new_name')
         self.assertEqual(new_ts.name(), 'new_name')
 
+    def test_wire_decoding(self):
+        """wire format goes straight to columnar storage when possible."""
+
+        wire = TimeSeries(DATA)
+        self.assertTrue(isinstance(wire.collection(), ColumnarCollection))
+
+        events = TimeSeries(dict(
+            name='traffic',
+            events=[Event(i[0], dict(value=i[1], status=i[2])) for i in DATA.get('points')]
+        ))
+
+        self.assertTrue(Collection.same(Collection(wire.collection()), events.collection()))
+        self.assertEqual(wire.to_json(), TimeSeries(wire.to_json()).to_json())
+
+        # short points are missing the trailing columns
+        ragged = TimeSeries(dict(
+            name='ragged',
+            columns=['time', 'in', 'out'],
+            points=[[1000, 1, 2], [2000, 3], [3000, 5, {'deep': 6}]],
+        ))
+
+        self.assertEqual(thaw(ragged.at(1).data()), {'in': 3})
+        self.assertEqual(ragged.at(2).get('out.deep'), 6)
+
+        # other event types
+        indexed = TimeSeries(dict(
+            name='indexed',
+            columns=['index', 'value'],
+            points=[['1d-12355', 1], ['1d-12356', 2]],
+        ))
+        self.assertFalse(isinstance(indexed.collection(), ColumnarCollection))
+        self.assertEqual(indexed.collection().type(), IndexedEvent)
+
+        with self.assertRaises(TimeSeriesException):
+            TimeSeries(dict(name='bad', columns=['bogus', 'value'], points=[[1000, 1]]))
+
+        with self.assertRaises(TimeSeriesException):
+            TimeSeries(dict(name='bad', columns=['time', 'value'],
+                            points=[[2000, 1], [1000, 2]]))
+
     def test_bad_ctor_args(self):
         """bogus conctructor args."""
 
@@ -427,6 +473,30 @@ class TestTimeSeries(SeriesBase):
         self.assertEqual(new_series.at(0).data().get('in'), 18)
         self.assertEqual(new_series.at(2).data().get('in'), 93)
 
+        # the bounds and the order of the events come from the bisect
+        # keys, which are made when the series is, so crop() does not
+        # look at the events again.
+        series = TimeSeries(dict(name='events', events=[Event(i, i) for i in range(1000)]))
+
+        calls = list()
+        timestamp_ms = Event.timestamp_ms
+
+        def counting(event):
+            """count the calls."""
+            calls.append(event)
+            return timestamp_ms(event)
+
+        Event.timestamp_ms = counting
+
+        try:
+            new_series = series.crop(TimeRange(100, 200)).crop(TimeRange(150, 160))
+        finally:
+            Event.timestamp_ms = timestamp_ms
+
+        self.assertEqual(new_series.size(), 10)
+        self.assertEqual(new_series.at(0).get(), 150)
+        self.assertEqual(calls, [])
+
     def test_data_accessors(self):
         """methods to get metadata and such."""
         self.assertEqual(self._canned_wire_series.name(), 'traffic')
@@ -698,6 +768,76 @@ class TestRollups(SeriesBase):
                 yearly_avg.at(0).index().to_string()
             )
 
+    def test_rollup_many(self):
+        """roll up a list of series in worker processes."""
+
+        series_list = [
+            TimeSeries(dict(name='s{0}'.format(i), events=[
+                Event(60000 * ii, {'in': ii + i, 'status': 'ok'}) for ii in range(180)
+            ])) for i in range(12)
+        ]
+
+        # a series that can not be aggregated
+        series_list.append(TimeSeries(dict(name='bad', events=[Event(0, {'in': 'x'})])))
+        # and one that can not be sent to a worker process
+        series_list.append(TimeSeries(dict(
+            name='unsendable', owner=object(), events=[Event(0, {'in': 1})])))
+
+        aggregation = {'in_avg': {'in': Functions.avg()}, 'in_max': {'in': Functions.max()}}
+
+        progress = list()
+
+        results, errors = TimeSeries.rollup_many(
+            series_list, '1h', aggregation, workers=3, chunk_size=5,
+            progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(progress, [(5, 14), (10, 14), (14, 14)])
+        self.assertEqual(len(results), 14)
+        self.assertEqual(sorted(errors.keys()), [12, 13])
+        self.assertTrue(isinstance(errors[12], TimeSeriesException))
+        self.assertTrue(results[12] is None)
+        self.assertTrue(isinstance(errors[13], TimeSeriesException))
+        self.assertTrue(results[13] is None)
+
+        for series, rollup in zip(series_list[:12], results):
+            self.assertEqual(rollup.to_json(), series.hourly_rollup(aggregation).to_json())
+
+        # serially, and to events with calendar windows
+        results, errors = TimeSeries.rollup_many(
+            series_list[:3], 'daily', aggregation, to_events=True, workers=1)
+
+        self.assertEqual(errors, dict())
+        self.assertEqual(
+            results[2].to_json(),
+            series_list[2].daily_rollup(aggregation, to_events=True, utc=True).to_json())
+
+        self.assertEqual(
+            series_list[0].rollup('5m', aggregation).to_json(),
+            series_list[0].fixed_window_rollup('5m', aggregation).to_json())
+
+        # concurrent calls do not share their arguments
+        concurrent = dict()
+
+        def rollup(interval):
+            """roll up in a thread."""
+            concurrent[interval] = TimeSeries.rollup_many(
+                series_list[:12], interval, aggregation, workers=2, chunk_size=4)
+
+        threads = [threading.Thread(target=rollup, args=(i,)) for i in ('1h', '30m')]
+
+        for i in threads:
+            i.start()
+
+        for i in threads:
+            i.join()
+
+        for interval in ('1h', '30m'):
+            results, errors = concurrent[interval]
+            self.assertEqual(errors, dict())
+            self.assertEqual(
+                [i.to_json() for i in results],
+                [i.rollup(interval, aggregation).to_json() for i in series_list[:12]])
+
 
 class TestPercentileAndQuantile(SeriesBase):
     """
@@ -804,6 +944,85 @@ class TestPercentileAndQuantile(SeriesBase):
             series.quantile(15, field_path='temperature')
 
 
+@unittest.skipIf(pypond.functions.numpy is None, 'numpy is not installed')
+class TestNumpyFunctions(unittest.TestCase):
+    """
+    The numpy versions of the functions should give the same results
+    as the pure python versions.
+    """
+
+    def setUp(self):
+        self._min_size = pypond.functions.NUMPY_MIN_SIZE
+
+        self._ints = [(i * 7919) % 101 for i in range(200)]
+        self._floats = [i / 3.0 for i in self._ints]
+        self._missing = list(self._ints)
+
+        for i in range(0, 200, 17):
+            self._missing[i] = None
+        for i in range(5, 200, 23):
+            self._missing[i] = float('nan')
+
+    def tearDown(self):
+        pypond.functions.NUMPY_MIN_SIZE = self._min_size
+
+    def _both(self, func, values):
+        """return the numpy and python results"""
+        pypond.functions.NUMPY_MIN_SIZE = 1
+        with_numpy = func(values)
+        pypond.functions.NUMPY_MIN_SIZE = len(values) + 1
+        without = func(values)
+        return with_numpy, without
+
+    def test_functions(self):
+        """compare numpy to python."""
+
+        factories = (
+            Functions.sum, Functions.avg, Functions.stddev, Functions.median,
+            Functions.difference, lambda flt=Filters.keep_missing: Functions.percentile(
+                95, flt=flt),
+        )
+
+        filters = (Filters.ignore_missing, Filters.zero_missing, Filters.propagate_missing)
+
+        for factory in factories:
+            for values in (self._ints, self._floats):
+                with_numpy, without = self._both(factory(), values)
+                self.assertAlmostEqual(with_numpy, without)
+                self.assertEqual(type(with_numpy), type(without))
+
+            for flt in filters:
+                with_numpy, without = self._both(factory(flt), self._missing)
+                if without is None:
+                    self.assertIsNone(with_numpy)
+                else:
+                    self.assertAlmostEqual(with_numpy, without)
+                    self.assertEqual(type(with_numpy), type(without))
+
+        # these fall back to the python version
+        pypond.functions.NUMPY_MIN_SIZE = 1
+
+        with self.assertRaises(TypeError):
+            Functions.sum()(self._missing)
+
+        with self.assertRaises(TypeError):
+            Functions.sum()(['a', 'b'])
+
+        self.assertEqual(Functions.sum()([True, True]), 2)
+        self.assertEqual(Functions.sum()([2 ** 62, 2 ** 62]), 2 ** 63)
+        self.assertEqual(Functions.median(Filters.ignore_missing)([None, 3, None, 1, 2]), 2)
+
+    def test_collection(self):
+        """through Collection.aggregate()"""
+
+        pypond.functions.NUMPY_MIN_SIZE = 1
+
+        coll = Collection([Event(1000 * i, {'value': v}) for i, v in enumerate(self._ints)])
+
+        self.assertEqual(coll.sum(), sum(self._ints))
+        self.assertEqual(coll.median(), sorted(self._ints)[100] / 2.0 + sorted(self._ints)[99] / 2.0)
+
+
 class TestCollection(SeriesBase):
     """
     Tests for the collection class.
@@ -1016,6 +1235,93 @@ class TestCollection(SeriesBase):
         self.assertEqual(good_order.event_list_as_list(), EVENT_LIST)
         self.assertTrue(good_order.is_chronological())
 
+    def test_bisect(self):
+        """test Collection.bisect() against a linear scan."""
+
+        def linear(coll, dtime, b=0):
+            """the original O(n) bisect."""
+            i = b
+            while i < coll.size():
+                if coll.at(i).timestamp() > dtime:
+                    return max(i - 1, 0)
+                elif coll.at(i).timestamp() == dtime:
+                    return i
+                i += 1
+            return i - 1
+
+        times = [1000, 2000, 2000, 3000, 5000]
+        coll = Collection([Event(i, {'value': ii}) for ii, i in enumerate(times)])
+        rev = Collection(list(reversed(coll.event_list_as_list())))
+
+        for probe in range(0, 7000, 250):
+            for b in range(0, 7):
+                for i in (coll, rev):
+                    self.assertEqual(i.bisect(dt_from_ms(probe), b), linear(i, dt_from_ms(probe), b))
+
+        # ties return the first match
+        self.assertEqual(coll.bisect(dt_from_ms(2000)), 1)
+
+        # sub-ms query times are never exact matches
+        self.assertEqual(coll.bisect(dt_from_ms(2000) + datetime.timedelta(microseconds=500)), 2)
+        self.assertEqual(coll.bisect(dt_from_ms(1000) - datetime.timedelta(microseconds=500)), 0)
+
+        # cache is rebuilt when the events change
+        added = coll.add_event(Event(9000, {'value': 10}))
+        self.assertEqual(coll.bisect(dt_from_ms(10000)), 4)
+        self.assertEqual(added.bisect(dt_from_ms(10000)), 5)
+        self.assertEqual(added.at_time(dt_from_ms(9500)).get(), 10)
+
+        self.assertIsNone(Collection().bisect(dt_from_ms(1000)))
+
+    def test_slice_views(self):
+        """slice() produces views that share the parent events."""
+
+        # pylint: disable=protected-access
+
+        events = [Event(1000 * i, {'value': i}) for i in range(10)]
+        coll = Collection(events)
+
+        sliced = coll.slice(2, 8)
+        self.assertTrue(sliced._events is coll._events)
+        self.assertEqual(sliced.size(), 6)
+        self.assertEqual(sliced.at(0).get(), 2)
+        self.assertEqual(sliced.at(-1).get(), 7)
+        self.assertEqual([i.get() for i in sliced.events()], list(range(2, 8)))
+
+        with self.assertRaises(CollectionException):
+            sliced.at(6)
+
+        # view of a view
+        inner = sliced.slice(1, -1)
+        self.assertEqual([i.get() for i in inner.events()], list(range(3, 7)))
+        self.assertEqual(inner.event_list_as_list(), events[3:7])
+        self.assertEqual(coll.slice(5, 2).size(), 0)
+        self.assertEqual(coll.slice(8, 100).size(), 2)
+
+        # bisect within the view
+        self.assertEqual(sliced.bisect(dt_from_ms(4500)), 2)
+        self.assertEqual(sliced.bisect(dt_from_ms(0)), 0)
+        self.assertEqual(sliced.bisect(dt_from_ms(9000)), 5)
+        self.assertEqual(sliced.at_time(dt_from_ms(5000)).get(), 5)
+
+        # equality
+        self.assertTrue(Collection.equal(sliced, Collection(sliced)))
+        self.assertFalse(Collection.equal(sliced, coll.slice(2, 7)))
+        self.assertTrue(Collection.same(sliced, Collection(events[2:8])))
+
+        # mutation materializes and leaves the parent alone
+        added = sliced.add_event(Event(20000, {'value': 20}))
+        self.assertEqual(added.size(), 7)
+        self.assertEqual(added.at_last().get(), 20)
+        self.assertEqual(coll.size(), 10)
+        self.assertEqual(sliced.aggregate(Functions.sum()), sum(range(2, 8)))
+
+        # crop is a view as well
+        series = TimeSeries(dict(name='views', collection=coll))
+        cropped = series.crop(TimeRange(dt_from_ms(3000), dt_from_ms(6000)))
+        self.assertTrue(cropped.collection()._events is coll._events)
+        self.assertEqual([i.get() for i in cropped.events()], [3, 4, 5])
+
     def test_other_exceptions(self):
         """trigger other exceptions"""
         with self.assertRaises(PipelineIOException):